@@ -1,5 +1,4 @@
 import json
-import requests
 import logging
 from collections import defaultdict
 
@@ -12,7 +11,8 @@ from django.utils import timezone
 
 from .models import TEAM, ALL
 from .options import MESSAGES
-from .tasks import send_mail
+from .slack import SlackClient
+from .tasks import DeliveryError, queue_delivery, send_mail, send_mass_mail
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -68,6 +68,7 @@ neat_related = {
     MESSAGES.SKIPPED_REPORT: 'report',
     MESSAGES.REPORT_FREQUENCY_CHANGED: 'config',
     MESSAGES.REPORT_NOTIFY: 'report',
+    MESSAGES.BATCH_REPORT_NOTIFY: 'reports',
 }
 
 
@@ -210,6 +211,33 @@ class AdapterBase:
         # Returning None will not record this action
         raise NotImplementedError()
 
+    def queue_message(self, destination, payload, logs):
+        # Store the message in the outbox for the workers to send with deliver,
+        # the logs will be updated once the message has been delivered
+        from .models import OutboxMessage
+        outbox = OutboxMessage.objects.create(
+            adapter_type=self.adapter_type,
+            destination=destination,
+            payload=payload,
+        )
+        outbox.logs.set(logs)
+        queue_delivery()
+
+    def deliver(self, destination, payload):
+        # Send a queued message, should return the result of the send
+        # Raise DeliveryError if the send should be retried
+        raise NotImplementedError()
+
+    def deliver_batch(self, destination, items):
+        # Send the queued OutboxMessages for the destination
+        for item in items:
+            try:
+                status = self.deliver(destination, item.payload)
+            except DeliveryError as e:
+                item.failed(e)
+            else:
+                item.delivered(status)
+
 
 class ActivityAdapter(AdapterBase):
     adapter_type = "Activity Feed"
@@ -387,6 +415,7 @@ class ActivityAdapter(AdapterBase):
 class SlackAdapter(AdapterBase):
     adapter_type = "Slack"
     always_send = True
+    coalesce_window = 5  # seconds
     messages = {
         MESSAGES.NEW_SUBMISSION: 'A new submission has been submitted for {source.page.title}: <{link}|{source.title}>',
         MESSAGES.UPDATE_LEAD: 'The lead of <{link}|{source.title}> has been updated from {old_lead} to {source.lead} by {user}',
@@ -429,6 +458,7 @@ class SlackAdapter(AdapterBase):
         super().__init__()
         self.destination = settings.SLACK_DESTINATION_URL
         self.target_room = settings.SLACK_DESTINATION_ROOM
+        self.client = SlackClient()
 
     def slack_links(self, links, sources):
         return ', '.join(
@@ -627,9 +657,26 @@ class SlackAdapter(AdapterBase):
             "room": target_rooms,
             "message": message,
         }
-        response = requests.post(self.destination, json=data)
 
-        return str(response.status_code) + ': ' + response.content.decode()
+        if settings.MESSAGES_OUTBOX_ENABLED:
+            return self.queue_message(self.destination, data, kwargs['logs'])
+
+        try:
+            return self.client.post(self.destination, data)
+        except DeliveryError as e:
+            return str(e)
+
+    def deliver(self, destination, payload):
+        return self.client.post(destination, payload)
+
+    def deliver_batch(self, destination, items):
+        # Messages to the same rooms queued close together are sent as one
+        for group, result in self.client.post_many(destination, items, self.coalesce_window):
+            for item in group:
+                if isinstance(result, DeliveryError):
+                    item.failed(result)
+                else:
+                    item.delivered(result)
 
 
 class EmailAdapter(AdapterBase):
@@ -655,6 +702,7 @@ class EmailAdapter(AdapterBase):
         MESSAGES.SKIPPED_REPORT: 'messages/email/report_skipped.html',
         MESSAGES.REPORT_FREQUENCY_CHANGED: 'messages/email/report_frequency.html',
         MESSAGES.REPORT_NOTIFY: 'messages/email/report_notify.html',
+        MESSAGES.BATCH_REPORT_NOTIFY: 'batch_report_notify',
     }
 
     def get_subject(self, message_type, source):
@@ -715,6 +763,17 @@ class EmailAdapter(AdapterBase):
                 **kwargs
             )
 
+    def batch_report_notify(self, reports, sources, **kwargs):
+        # Each email goes to the applicant of a single project, see batch_recipients
+        project, = sources
+        kwargs.pop('source')
+        return self.render_message(
+            'messages/email/report_notify.html',
+            source=project,
+            report=reports[project.id],
+            **kwargs
+        )
+
     def notify_comment(self, **kwargs):
         comment = kwargs['comment']
         source = kwargs['source']
@@ -790,7 +849,26 @@ class EmailAdapter(AdapterBase):
     def render_message(self, template, **kwargs):
         return render_to_string(template, kwargs, kwargs['request'])
 
-    def send_message(self, message, source, subject, recipient, logs, **kwargs):
+    def process(self, *args, **kwargs):
+        emails = []
+        super().process(*args, emails=emails, **kwargs)
+        return self.send_emails(emails)
+
+    def process_batch(self, *args, **kwargs):
+        emails = []
+        super().process_batch(*args, emails=emails, **kwargs)
+        return self.send_emails(emails)
+
+    def send_emails(self, emails):
+        # Send all the emails from processing a message together so they
+        # can share a connection
+        try:
+            send_mass_mail(emails)
+        except Exception as e:
+            for _, logs in emails:
+                logs.update_status('Error: ' + str(e))
+
+    def send_message(self, message, source, subject, recipient, logs, emails=None, **kwargs):
         try:
             from_email = source.page.specific.from_address
         except AttributeError:  # we're dealing with a project
@@ -799,6 +877,15 @@ class EmailAdapter(AdapterBase):
             from_email = None
             logger.exception(e)
 
+        if emails is not None:
+            emails.append(({
+                'subject': subject,
+                'body': message,
+                'from_email': from_email,
+                'to': [recipient],
+            }, logs))
+            return
+
         try:
             send_mail(
                 subject,
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.10 on 2026-10-18 05:57
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0053_nullable_by_report_notify'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adapter_type', models.CharField(max_length=15)),
+                ('destination', models.CharField(max_length=255)),
+                ('payload', django.contrib.postgres.fields.jsonb.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('logs', models.ManyToManyField(related_name='outbox', to='activity.Message')),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+    ]
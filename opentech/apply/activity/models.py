@@ -1,9 +1,13 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import JSONField
 from django.db import models
 from django.db.models import Case, When, Value
 from django.db.models.functions import Concat
+from django.utils import timezone
 
 from .options import MESSAGES
 
@@ -189,3 +193,50 @@ class Message(models.Model):
                 default=Concat('status', Value('<br />' + status))
             )
             self.save()
+
+
+class OutboxMessageQueryset(models.QuerySet):
+    def pending(self):
+        return self.filter(delivered_at__isnull=True, attempts__lt=self.model.MAX_ATTEMPTS)
+
+    def due(self):
+        return self.pending().filter(next_attempt__lte=timezone.now())
+
+
+class OutboxMessage(models.Model):
+    """
+    Message waiting to be delivered to an external service by the
+    deliver_outbox task, the logs are updated with the result of the send.
+    """
+    MAX_ATTEMPTS = 5
+    RETRY_DELAY = 30  # seconds, doubled with every attempt
+
+    adapter_type = models.CharField(max_length=15)
+    destination = models.CharField(max_length=255)
+    payload = JSONField()
+    logs = models.ManyToManyField(Message, related_name='outbox')
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxMessageQueryset.as_manager()
+
+    class Meta:
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.adapter_type} to {self.destination}'
+
+    def delivered(self, status):
+        self.delivered_at = timezone.now()
+        self.save(update_fields=['delivered_at'])
+        self.logs.all().update_status(status)
+
+    def failed(self, error):
+        self.attempts += 1
+        delay = getattr(error, 'retry_after', None) or self.RETRY_DELAY * 2 ** self.attempts
+        self.next_attempt = timezone.now() + timedelta(seconds=delay)
+        self.save(update_fields=['attempts', 'next_attempt'])
+        if self.attempts >= self.MAX_ATTEMPTS:
+            self.logs.all().update_status(f'Failed after {self.attempts} attempts: {error}')
@@ -0,0 +1,110 @@
+import time
+
+import requests
+from celery import current_task
+from requests.adapters import HTTPAdapter
+
+from .tasks import DeliveryError
+
+
+class RateLimited(DeliveryError):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after(response):
+    try:
+        return max(int(response.headers.get('Retry-After', 1)), 0)
+    except ValueError:
+        return 1
+
+
+def in_worker():
+    # Eager tasks run within the request which queued them
+    return bool(current_task) and not current_task.request.is_eager
+
+
+def coalesce(items, window):
+    """
+    Group items which are for the same rooms and were created within
+    ``window`` seconds of the first item of the group.
+
+    Items are objects with a ``payload`` and ``created_at``.
+    """
+    groups = []
+    open_groups = {}
+    for item in sorted(items, key=lambda item: item.created_at):
+        rooms = tuple(item.payload['room'])
+        group = open_groups.get(rooms)
+        if group and (item.created_at - group[0].created_at).total_seconds() <= window:
+            group.append(item)
+        else:
+            group = [item]
+            open_groups[rooms] = group
+            groups.append(group)
+    return groups
+
+
+class SlackClient:
+    """
+    Post messages to the slack backend over a pool of persistent connections.
+
+    Rate limited requests are retried by the workers after the Retry-After
+    delay when it is no longer than ``max_wait``. Otherwise, or when posting
+    from a request, RateLimited is raised so that the caller can try again
+    later.
+    """
+    timeout = (3.05, 10)
+    pool_size = 10
+    max_wait = 5
+    max_retries = 2
+
+    def __init__(self, timeout=None, pool_size=None, max_wait=None):
+        if timeout is not None:
+            self.timeout = timeout
+        if pool_size is not None:
+            self.pool_size = pool_size
+        if max_wait is not None:
+            self.max_wait = max_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post(self, destination, payload):
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(destination, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                raise DeliveryError(str(e))
+
+            status = str(response.status_code) + ': ' + response.content.decode()
+            if response.status_code != 429:
+                break
+
+            delay = retry_after(response)
+            if delay > self.max_wait or attempt == self.max_retries or not in_worker():
+                raise RateLimited(status, delay)
+            time.sleep(delay)
+
+        if response.status_code >= 500:
+            raise DeliveryError(status)
+
+        return status
+
+    def post_many(self, destination, items, window):
+        """
+        Send the items as one message per coalesced group, returns the groups
+        with the status or DeliveryError for each.
+        """
+        for group in coalesce(items, window):
+            payload = {
+                'room': group[0].payload['room'],
+                'message': '\n'.join(item.payload['message'] for item in group),
+            }
+            try:
+                yield group, self.post(destination, payload)
+            except DeliveryError as e:
+                yield group, e
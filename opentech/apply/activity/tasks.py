@@ -1,12 +1,29 @@
+from datetime import timedelta
+from itertools import groupby
+
 from celery import Celery
+from more_itertools import chunked
 
 from django.conf import settings
-from django.core.mail import EmailMessage
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
 
 app = Celery('tasks')
 
 app.config_from_object(settings, namespace='CELERY', force=True)
 
+OUTBOX_BATCH_SIZE = 100
+# Seconds a worker has to deliver the messages it claimed before they are due again
+CLAIM_TIMEOUT = 5 * 60
+DELIVERY_QUEUED_KEY = 'deliver_outbox_queued'
+EMAIL_BATCH_SIZE = 100
+
+
+class DeliveryError(Exception):
+    """Raised by an adapter when a delivery failed but can be retried"""
+
 
 def send_mail(subject, message, from_address, recipients, logs=None):
     # Convenience method to wrap the tasks and handle the callback
@@ -23,8 +40,42 @@ def send_mail(subject, message, from_address, recipients, logs=None):
 
 @app.task
 def send_mail_task(**kwargs):
+    return deliver_email(EmailMessage(**kwargs))
+
+
+def send_mass_mail(emails):
+    # Send the emails over a single connection for each batch, emails are
+    # (kwargs for EmailMessage, logs) pairs
+    for batch in chunked(emails, EMAIL_BATCH_SIZE):
+        send_mass_mail_task.apply_async(kwargs={
+            'emails': [
+                {**email, 'message_pks': [log.pk for log in logs]}
+                for email, logs in batch
+            ],
+        })
+
+
+@app.task
+def send_mass_mail_task(emails):
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            update_message_status({'status': 'Error: ' + str(e), 'id': None}, email['message_pks'])
+        return
+
+    try:
+        for email in emails:
+            message_pks = email.pop('message_pks')
+            response = deliver_email(EmailMessage(connection=connection, **email))
+            update_message_status(response, message_pks)
+    finally:
+        connection.close()
+
+
+def deliver_email(email):
     response = {'status': '', 'id': None}
-    email = EmailMessage(**kwargs)
     try:
         email.send()
     except Exception as e:
@@ -47,3 +98,40 @@ def update_message_status(response, message_pks):
     messages = Message.objects.filter(pk__in=message_pks)
     messages.update(external_id=response['id'])
     messages.update_status(response['status'])
+
+
+def queue_delivery():
+    # Deliver once the messages are visible to the workers
+    transaction.on_commit(schedule_delivery)
+
+
+def schedule_delivery():
+    # Only one delivery waits in the queue at a time, the messages which are
+    # retried later are picked up by the periodic delivery in CELERY_BEAT_SCHEDULE
+    if cache.add(DELIVERY_QUEUED_KEY, True, CLAIM_TIMEOUT):
+        deliver_outbox.delay()
+
+
+@app.task
+def deliver_outbox():
+    from .messaging import adapters
+    from .models import OutboxMessage
+    adapters_by_type = {adapter.adapter_type: adapter for adapter in adapters}
+    cache.delete(DELIVERY_QUEUED_KEY)
+
+    with transaction.atomic():
+        # Rows locked by another worker are skipped, the claimed messages are
+        # not due again until the claim runs out so each is only sent once
+        due = OutboxMessage.objects.due().select_for_update(skip_locked=True)
+        outbox = list(due[:OUTBOX_BATCH_SIZE])
+        OutboxMessage.objects.filter(id__in=[item.id for item in outbox]).update(
+            next_attempt=timezone.now() + timedelta(seconds=CLAIM_TIMEOUT),
+        )
+
+    # Sent outside of the transaction, no rows stay locked while waiting on the services
+    outbox.sort(key=lambda item: (item.adapter_type, item.destination))
+    for (adapter_type, destination), items in groupby(outbox, key=lambda item: (item.adapter_type, item.destination)):
+        adapters_by_type[adapter_type].deliver_batch(destination, list(items))
+
+    if len(outbox) == OUTBOX_BATCH_SIZE:
+        schedule_delivery()
@@ -8,6 +8,7 @@ import responses
 from django.core import mail
 from django.test import TestCase, override_settings
 from django.contrib.messages import get_messages
+from django.utils import timezone
 
 from opentech.apply.utils.testing import make_request
 from opentech.apply.funds.tests.factories import (
@@ -27,7 +28,7 @@ from opentech.apply.projects.tests.factories import (
     PaymentRequestFactory
 )
 
-from ..models import Activity, Event, Message, TEAM, ALL
+from ..models import Activity, Event, Message, OutboxMessage, TEAM, ALL
 from ..messaging import (
     AdapterBase,
     ActivityAdapter,
@@ -37,6 +38,7 @@ from ..messaging import (
     MESSAGES,
     SlackAdapter,
 )
+from ..tasks import deliver_outbox, schedule_delivery
 from .factories import CommentFactory, EventFactory, MessageFactory
 
 
@@ -444,6 +446,88 @@ class TestSlackAdapter(AdapterMixin, TestCase):
         self.assertEqual(sent_message.status, '400: Bad Request')
 
 
+@override_settings(
+    SLACK_DESTINATION_URL=TestSlackAdapter.target_url,
+    SLACK_DESTINATION_ROOM=TestSlackAdapter.target_room,
+    MESSAGES_OUTBOX_ENABLED=True,
+)
+class TestSlackOutbox(AdapterMixin, TestCase):
+    source_factory = ApplicationSubmissionFactory
+    target_url = TestSlackAdapter.target_url
+
+    def setUp(self):
+        self.adapter = SlackAdapter()
+
+    @responses.activate
+    def test_message_queued_not_sent(self):
+        self.adapter_process(MESSAGES.NEW_SUBMISSION)
+        self.assertEqual(len(responses.calls), 0)
+        outbox = OutboxMessage.objects.get()
+        self.assertEqual(outbox.destination, self.target_url)
+        self.assertEqual(list(outbox.logs.all()), list(Message.objects.all()))
+        self.assertEqual(Message.objects.get().status, '')
+
+    @responses.activate
+    def test_deliver_sends_once(self):
+        responses.add(responses.POST, self.target_url, status=200, body='OK')
+        self.adapter_process(MESSAGES.NEW_SUBMISSION)
+        deliver_outbox()
+        deliver_outbox()
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(Message.objects.get().status, '200: OK')
+        self.assertIsNotNone(OutboxMessage.objects.get().delivered_at)
+
+    @responses.activate
+    def test_deliver_coalesces_messages(self):
+        responses.add(responses.POST, self.target_url, status=200, body='OK')
+        submission = ApplicationSubmissionFactory()
+        self.adapter_process(MESSAGES.NEW_SUBMISSION, source=submission)
+        self.adapter_process(MESSAGES.OPENED_SEALED, source=submission)
+        deliver_outbox()
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(len(json.loads(responses.calls[0].request.body)['message'].split('\n')), 2)
+        self.assertEqual(list(Message.objects.values_list('status', flat=True)), ['200: OK', '200: OK'])
+
+    @responses.activate
+    def test_failed_delivery_retried_later(self):
+        responses.add(responses.POST, self.target_url, status=503, body='Unavailable')
+        self.adapter_process(MESSAGES.NEW_SUBMISSION)
+        deliver_outbox()
+        outbox = OutboxMessage.objects.get()
+        self.assertEqual(outbox.attempts, 1)
+        self.assertIsNone(outbox.delivered_at)
+        self.assertFalse(OutboxMessage.objects.due().exists())
+        self.assertEqual(Message.objects.get().status, '')
+
+    @responses.activate
+    def test_claimed_messages_not_due_while_sending(self):
+        def not_due(request):
+            self.assertFalse(OutboxMessage.objects.due().exists())
+            return (200, {}, 'OK')
+
+        responses.add_callback(responses.POST, self.target_url, callback=not_due)
+        self.adapter_process(MESSAGES.NEW_SUBMISSION)
+        deliver_outbox()
+        self.assertEqual(len(responses.calls), 1)
+
+    @patch('opentech.apply.activity.tasks.deliver_outbox.delay')
+    def test_one_delivery_queued(self, delay):
+        schedule_delivery()
+        schedule_delivery()
+        self.assertEqual(delay.call_count, 1)
+
+    @responses.activate
+    def test_gives_up_after_max_attempts(self):
+        responses.add(responses.POST, self.target_url, status=503, body='Unavailable')
+        self.adapter_process(MESSAGES.NEW_SUBMISSION)
+        for _ in range(OutboxMessage.MAX_ATTEMPTS):
+            OutboxMessage.objects.update(next_attempt=timezone.now())
+            deliver_outbox()
+        self.assertEqual(len(responses.calls), OutboxMessage.MAX_ATTEMPTS)
+        self.assertFalse(OutboxMessage.objects.pending().exists())
+        self.assertIn('Failed after', Message.objects.get().status)
+
+
 @override_settings(SEND_MESSAGES=True)
 class TestEmailAdapter(AdapterMixin, TestCase):
     source_factory = ApplicationSubmissionFactory
@@ -0,0 +1,146 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from ..slack import RateLimited, SlackClient, coalesce
+from ..tasks import DeliveryError
+
+
+class StubSlackHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with server.lock:
+            server.requests.append(json.loads(body))
+            server.connections.add(self.client_address)
+            status, headers = server.responses.pop(0) if server.responses else (200, {})
+
+        content = b'OK'
+        self.send_response(status)
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubSlackServer(ThreadingMixIn, HTTPServer):
+    """
+    Local stand in for the slack backend which records the payloads posted
+    and the connections used, ``responses`` can be queued to be returned
+    instead of 200s.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubSlackHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = set()
+        self.responses = []
+
+    @property
+    def url(self):
+        return 'http://{}:{}/'.format(*self.server_address)
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+def make_item(message, room='#room', seconds=0):
+    return SimpleNamespace(
+        payload={'room': [room], 'message': message},
+        created_at=timezone.now().replace(microsecond=0) + timedelta(seconds=seconds),
+    )
+
+
+class TestSlackClient(SimpleTestCase):
+    def test_connections_reused(self):
+        client = SlackClient()
+        payloads = [{'room': ['#room'], 'message': str(i)} for i in range(20)]
+        with StubSlackServer() as server:
+            for payload in payloads:
+                client.post(server.url, payload)
+
+        self.assertEqual(len(server.requests), 20)
+        # Each connection is from a different client port
+        self.assertEqual(len(server.connections), 1)
+
+    def test_waits_for_retry_after(self):
+        client = SlackClient()
+        with StubSlackServer() as server:
+            server.responses.append((429, {'Retry-After': '1'}))
+            with patch('opentech.apply.activity.slack.in_worker', return_value=True):
+                with patch('opentech.apply.activity.slack.time.sleep') as sleep:
+                    status = client.post(server.url, {'room': ['#room'], 'message': 'hi'})
+
+        sleep.assert_called_once_with(1)
+        self.assertEqual(status, '200: OK')
+        self.assertEqual(len(server.requests), 2)
+
+    def test_retry_after_raised_outside_worker(self):
+        client = SlackClient()
+        with StubSlackServer() as server:
+            server.responses.append((429, {'Retry-After': '1'}))
+            with patch('opentech.apply.activity.slack.time.sleep') as sleep:
+                with self.assertRaises(RateLimited) as context:
+                    client.post(server.url, {'room': ['#room'], 'message': 'hi'})
+
+        sleep.assert_not_called()
+        self.assertEqual(context.exception.retry_after, 1)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_long_retry_after_raised(self):
+        client = SlackClient(max_wait=5)
+        with StubSlackServer() as server:
+            server.responses.append((429, {'Retry-After': '60'}))
+            with self.assertRaises(RateLimited) as context:
+                client.post(server.url, {'room': ['#room'], 'message': 'hi'})
+
+        self.assertEqual(context.exception.retry_after, 60)
+
+    def test_server_error_raised(self):
+        client = SlackClient()
+        with StubSlackServer() as server:
+            server.responses.append((503, {}))
+            with self.assertRaises(DeliveryError):
+                client.post(server.url, {'room': ['#room'], 'message': 'hi'})
+
+    def test_post_many_coalesces(self):
+        client = SlackClient()
+        items = [make_item(str(i)) for i in range(10)] + [make_item('other', room='#other')]
+        with StubSlackServer() as server:
+            results = list(client.post_many(server.url, items, window=5))
+
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[0]['message'], '\n'.join(str(i) for i in range(10)))
+        self.assertEqual([len(group) for group, status in results], [10, 1])
+
+
+class TestCoalesce(SimpleTestCase):
+    def test_separate_rooms(self):
+        items = [make_item('a', room='#one'), make_item('b', room='#two'), make_item('c', room='#one')]
+        groups = coalesce(items, window=5)
+        self.assertEqual([[item.payload['message'] for item in group] for group in groups], [['a', 'c'], ['b']])
+
+    def test_outside_window(self):
+        items = [make_item('a'), make_item('b', seconds=3), make_item('c', seconds=10)]
+        groups = coalesce(items, window=5)
+        self.assertEqual([[item.payload['message'] for item in group] for group in groups], [['a', 'b'], ['c']])
@@ -1,10 +1,22 @@
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
 
-from ..tasks import send_mail
+from ..models import Message
+from ..tasks import EMAIL_BATCH_SIZE, send_mail, send_mass_mail
 
-from .factories import MessageFactory
+from .factories import EventFactory, MessageFactory
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
 
 
 class TestSendEmail(TestCase):
@@ -18,3 +30,51 @@ class TestSendEmail(TestCase):
         }
         send_mail(*kwargs, logs=[MessageFactory()])
         email_mock.assert_called_once_with(**kwargs)
+
+
+@override_settings(EMAIL_BACKEND='opentech.apply.activity.tests.test_tasks.CountingBackend')
+class TestSendMassMail(TestCase):
+    def setUp(self):
+        CountingBackend.opened = 0
+
+    def make_emails(self, count):
+        # All the messages share an event as creating the submission for each is slow
+        event = EventFactory()
+        return [
+            ({
+                'subject': 'subject',
+                'body': 'body',
+                'from_email': 'from@example.com',
+                'to': [f'to{i}@example.com'],
+            }, Message.objects.filter(id=MessageFactory(status='', event=event).id))
+            for i in range(count)
+        ]
+
+    def test_emails_share_connection(self):
+        send_mass_mail(self.make_emails(50))
+        self.assertEqual(len(mail.outbox), 50)
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(set(Message.objects.values_list('status', flat=True)), {'sent'})
+
+    def test_connection_per_batch(self):
+        with patch('opentech.apply.activity.tasks.EMAIL_BATCH_SIZE', 20):
+            send_mass_mail(self.make_emails(50))
+        self.assertEqual(len(mail.outbox), 50)
+        self.assertEqual(CountingBackend.opened, 3)
+
+    def test_failed_email_recorded(self):
+        emails = self.make_emails(2)
+        with patch.object(CountingBackend, 'send_messages', side_effect=[Exception('An error occurred'), 1]):
+            send_mass_mail(emails)
+        self.assertEqual(
+            [logs.get().status for _, logs in emails],
+            ['Error: An error occurred', 'sent'],
+        )
+
+    def test_connection_opened_once_per_batch(self):
+        emails = self.make_emails(EMAIL_BATCH_SIZE)
+        with patch('opentech.apply.activity.tasks.get_connection', wraps=get_connection) as connect:
+            send_mass_mail(emails)
+        connect.assert_called_once_with()
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), len(emails))
@@ -1,6 +1,118 @@
+from collections import OrderedDict
+
+from django.core.paginator import PageNotAnInteger
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from opentech.apply.funds.paginators import KeysetOrdering, decode_cursor, encode_cursor
 
 
 class StandardResultsSetPagination(pagination.PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 1000
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Cursor pagination for the ``keyset_fields`` orderings which doesn't
+    count or OFFSET the results, each page costs the same to load.
+
+    Data is ordered by ``ordering`` unless the queryset is already ordered
+    by the keyset fields, e.g. by ``OrderingFilter``.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    keyset_fields = ('submit_time', 'last_update', 'id')
+    ordering = ('-submit_time',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.ordering)
+
+        self.keyset = KeysetOrdering.from_queryset(queryset, self.keyset_fields)
+        if not self.keyset:
+            self.keyset = KeysetOrdering.from_queryset(queryset.order_by(*self.ordering), self.keyset_fields)
+
+        position = self.decode_cursor(request)
+        reverse = position.get('reverse', False)
+        keyset = self.keyset.reverse() if reverse else self.keyset
+
+        queryset = keyset.order(queryset)
+        if 'values' in position:
+            queryset = keyset.filter_after(queryset, position['values'])
+
+        # Retrieve one more object to check if there is another page
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = 'values' in position
+
+        self.results = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size > 0:
+            return min(page_size, self.max_page_size)
+        return self.page_size
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return {}
+
+        try:
+            position = decode_cursor(cursor)
+        except PageNotAnInteger:
+            raise NotFound('Invalid cursor')
+
+        if position.get('ordering') != self.keyset.key:
+            raise NotFound('Invalid cursor')
+
+        return position
+
+    def encode_cursor(self, obj, reverse=False):
+        cursor = encode_cursor({
+            'ordering': self.keyset.key,
+            'reverse': reverse,
+            'values': self.keyset.values(obj),
+        })
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.results:
+            return None
+        return self.encode_cursor(self.results[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.results:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.results[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
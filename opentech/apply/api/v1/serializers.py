@@ -76,13 +76,26 @@ class ReviewSerializer(serializers.ModelSerializer):
 
 class ReviewSummarySerializer(serializers.Serializer):
     reviews = ReviewSerializer(many=True, read_only=True)
-    count = serializers.ReadOnlyField(source='reviews.count')
-    score = serializers.ReadOnlyField(source='reviews.score')
+    count = serializers.SerializerMethodField()
+    score = serializers.SerializerMethodField()
     recommendation = serializers.SerializerMethodField()
     assigned = serializers.SerializerMethodField()
 
+    def get_summary(self, obj):
+        # The count, score and recommendation come from a single query
+        summaries = self.__dict__.setdefault('_summaries', {})
+        if obj.id not in summaries:
+            summaries[obj.id] = obj.reviews.summary()
+        return summaries[obj.id]
+
+    def get_count(self, obj):
+        return self.get_summary(obj)['count']
+
+    def get_score(self, obj):
+        return self.get_summary(obj)['score']
+
     def get_recommendation(self, obj):
-        recommendation = obj.reviews.recommendation()
+        recommendation = self.get_summary(obj)['recommendation']
         return {
             'value': recommendation,
             'display': dict(RECOMMENDATION_CHOICES).get(recommendation),
@@ -1,7 +1,7 @@
 from django.test import override_settings, TestCase
 
 from opentech.apply.funds.tests.factories import ApplicationSubmissionFactory
-from opentech.apply.review.tests.factories import ReviewFactory
+from opentech.apply.review.tests.factories import ReviewFactory, ReviewOpinionFactory
 
 from ..serializers import ReviewSummarySerializer
 
@@ -26,3 +26,14 @@ class TestReviewSummarySerializer(TestCase):
         self.assertEqual(data['recommendation'], {'value': 0, 'display': 'No'})
         self.assertEqual(len(data['assigned']), 1)
         self.assertEqual(len(data['reviews']), 1)
+
+    def test_summary_in_one_query(self):
+        submission = ApplicationSubmissionFactory()
+        review = ReviewFactory(submission=submission, recommendation_yes=True, score=4)
+        ReviewOpinionFactory(review=review, opinion_disagree=True)
+        ReviewFactory(submission=submission, recommendation_yes=True, score=2)
+        serializer = ReviewSummarySerializer(submission)
+        with self.assertNumQueries(1):
+            self.assertEqual(serializer.get_count(submission), 2)
+            self.assertEqual(serializer.get_score(submission), 3)
+            self.assertEqual(serializer.get_recommendation(submission), {'value': 1, 'display': 'Maybe'})
@@ -3,8 +3,10 @@ from django.urls import reverse_lazy
 
 from opentech.apply.activity.models import Activity, APPLICANT, ALL
 from opentech.apply.activity.tests.factories import CommentFactory
+from opentech.apply.funds.models import ApplicationSubmission
+from opentech.apply.funds.tests.factories import ApplicationSubmissionFactory
 
-from opentech.apply.users.tests.factories import UserFactory
+from opentech.apply.users.tests.factories import StaffFactory, UserFactory
 
 
 @override_settings(ROOT_URLCONF='opentech.apply.urls')
@@ -84,3 +86,42 @@ class TestCommentEdit(TestCase):
         self.assertEqual(response_one.status_code, 200, response_one.json())
         self.assertEqual(response_two.status_code, 404, response_two.json())
         self.assertEqual(Activity.objects.count(), 2)
+
+
+@override_settings(ROOT_URLCONF='opentech.apply.urls')
+class TestSubmissionListPagination(TestCase):
+    def setUp(self):
+        self.client.force_login(StaffFactory())
+        self.submissions = ApplicationSubmissionFactory.create_batch(5)
+
+    def get_ids(self, url, **params):
+        ids = []
+        while url:
+            response = self.client.get(url, data=params, secure=True)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.json())
+            ids.extend(submission['id'] for submission in response.json()['results'])
+            url = response.json()['next']
+            params = {}
+        return ids
+
+    def test_cursor_pages_cover_all_submissions(self):
+        ids = self.get_ids(reverse_lazy('api:v1:submissions:list'), page_size=2)
+        expected = ApplicationSubmission.objects.order_by('-submit_time', 'id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_ordering_by_id(self):
+        ids = self.get_ids(reverse_lazy('api:v1:submissions:list'), page_size=2, ordering='-id')
+        self.assertEqual(ids, sorted((submission.id for submission in self.submissions), reverse=True))
+
+    def test_previous_link(self):
+        url = reverse_lazy('api:v1:submissions:list')
+        first = self.client.get(url, data={'page_size': 2}, secure=True).json()
+        second = self.client.get(first['next'], secure=True).json()
+        previous = self.client.get(second['previous'], secure=True).json()
+        self.assertEqual(previous['results'], first['results'])
+        self.assertIsNone(previous['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse_lazy('api:v1:submissions:list'), data={'cursor': 'nope'}, secure=True)
+        self.assertEqual(response.status_code, 404)
@@ -6,6 +6,7 @@ from django.utils import timezone
 from wagtail.core.models import Page
 
 from rest_framework import generics, mixins, permissions
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework.exceptions import (NotFound, PermissionDenied,
                                        ValidationError)
@@ -21,7 +22,7 @@ from opentech.apply.determinations.views import DeterminationCreateOrUpdateView
 from opentech.apply.review.models import Review
 from opentech.apply.funds.models import FundType, LabType
 
-from .pagination import StandardResultsSetPagination
+from .pagination import KeysetPagination, StandardResultsSetPagination
 from .permissions import IsApplyStaffUser, IsAuthor
 from .serializers import (
     CommentSerializer,
@@ -73,9 +74,10 @@ class SubmissionList(generics.ListAPIView):
     permission_classes = (
         HasAPIKey | permissions.IsAuthenticated, HasAPIKey | IsApplyStaffUser,
     )
-    filter_backends = (filters.DjangoFilterBackend,)
+    filter_backends = (filters.DjangoFilterBackend, OrderingFilter)
     filter_class = SubmissionsFilter
-    pagination_class = StandardResultsSetPagination
+    ordering_fields = KeysetPagination.keyset_fields
+    pagination_class = KeysetPagination
 
 
 class SubmissionDetail(generics.RetrieveAPIView):
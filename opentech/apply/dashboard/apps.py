@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 
 class DashboardConfig(AppConfig):
-    name = 'dashboard'
+    name = 'opentech.apply.dashboard'
+
+    def ready(self):
+        from . import read_model  # NOQA
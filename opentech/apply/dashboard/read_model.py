@@ -0,0 +1,142 @@
+from itertools import chain
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, When
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from opentech.apply.flags.models import Flag
+from opentech.apply.funds.models import ApplicationSubmission, AssignedReviewers, LabBase, RoundBase, RoundsAndLabs
+from opentech.apply.funds.models.submissions import reviewers_assigned, statuses_updated
+from opentech.apply.projects.models import Approval, PaymentRequest, Project
+from opentech.apply.review.models import Review, ReviewOpinion
+from opentech.apply.utils.cache import get_versions, invalidate_on_change, invalidate_on_commit
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 10
+
+SUBMISSIONS = 'submissions'
+PROJECTS = 'projects'
+PAYMENT_REQUESTS = 'payment_requests'
+ROUNDS = 'rounds'
+
+# The models which change the contents of each group of dashboard sections
+INVALIDATED_BY = {
+    SUBMISSIONS: (ApplicationSubmission, AssignedReviewers, Review, ReviewOpinion, Flag),
+    PROJECTS: (Project, Approval),
+    PAYMENT_REQUESTS: (PaymentRequest, Project),
+    ROUNDS: (RoundBase, LabBase, ApplicationSubmission),
+}
+
+
+def version_key(group):
+    return f'dashboard_version_{group}'
+
+
+def in_cached_order(queryset, ids):
+    if not ids:
+        return queryset.none()
+    order = Case(*[When(id=id, then=position) for position, id in enumerate(ids)], output_field=IntegerField())
+    return queryset.filter(id__in=ids).order_by(order)
+
+
+class DashboardReadModel:
+    """
+    The ids and counts for each section of a user's dashboard, cached until a
+    change to one of the models in INVALIDATED_BY for the section.
+
+    Only the ids are cached, the rows themselves are always loaded fresh so
+    the tables never show out of date values.
+    """
+    def __init__(self, user):
+        self.user = user
+        self.versions = get_versions([version_key(group) for group in INVALIDATED_BY])
+
+    def key(self, section, group, per_user=True):
+        version = self.versions[version_key(group)]
+        user = self.user.id if per_user else 'all'
+        return f'dashboard_{section}_{user}_{version}'
+
+    def get(self, section, group, compute, per_user=True):
+        key = self.key(section, group, per_user)
+        data = cache.get(key)
+        if data is None:
+            data = compute()
+            cache.set(key, data, DASHBOARD_CACHE_TIMEOUT)
+        return data
+
+    def ids_and_count(self, queryset, limit=None):
+        ids = list(queryset.values_list('id', flat=True)[:limit])
+        count = len(ids) if limit is None else queryset.count()
+        return {'ids': ids, 'count': count}
+
+    def awaiting_reviews(self, limit):
+        def compute():
+            qs = ApplicationSubmission.objects.in_review_for(self.user).order_by('-submit_time')
+            return self.ids_and_count(qs, limit)
+        return self.get('awaiting_reviews', SUBMISSIONS, compute)
+
+    def reviewed(self, limit):
+        def compute():
+            qs = ApplicationSubmission.objects.reviewed_by(self.user).order_by('-submit_time')
+            return self.ids_and_count(qs, limit)
+        return self.get('reviewed', SUBMISSIONS, compute)
+
+    def flagged(self, limit):
+        def compute():
+            qs = ApplicationSubmission.objects.flagged_by(self.user).order_by('-submit_time')
+            return self.ids_and_count(qs, limit)
+        return self.get('flagged', SUBMISSIONS, compute)
+
+    def active_payment_requests(self):
+        def compute():
+            qs = PaymentRequest.objects.filter(project__lead=self.user).in_progress()
+            return self.ids_and_count(qs)
+        return self.get('payment_requests', PAYMENT_REQUESTS, compute)
+
+    def projects(self, limit):
+        def compute():
+            qs = Project.objects.filter(lead=self.user)
+            return self.ids_and_count(qs, limit)
+        return self.get('projects', PROJECTS, compute)
+
+    def projects_to_approve(self):
+        # The same for every approver
+        def compute():
+            return self.ids_and_count(Project.objects.in_approval())
+        return self.get('projects_to_approve', PROJECTS, compute, per_user=False)
+
+    def rounds(self, limit):
+        # Rounds open and close by date, so the day is part of the key
+        def compute():
+            qs = RoundsAndLabs.objects.with_progress().active().order_by('-end_date').by_lead(self.user)
+            return {
+                'closed': list(qs.closed().values_list('id', flat=True)[:limit]),
+                'open': list(qs.open().values_list('id', flat=True)[:limit]),
+            }
+        return self.get(f'rounds_{timezone.now().date()}', ROUNDS, compute)
+
+
+def invalidated_versions(instance):
+    return [version_key(group) for group, models in INVALIDATED_BY.items() if isinstance(instance, models)]
+
+
+invalidate_on_change(chain.from_iterable(INVALIDATED_BY.values()), invalidated_versions)
+
+
+@receiver(reviewers_assigned)
+def invalidate_dashboard_for_assignments(sender, **kwargs):
+    invalidate_on_commit([version_key(SUBMISSIONS)])
+
+
+@receiver(statuses_updated)
+def invalidate_dashboard_for_statuses(sender, **kwargs):
+    invalidate_on_commit([version_key(SUBMISSIONS), version_key(ROUNDS)])
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_dashboard_for_roles(sender, action, **kwargs):
+    # The reviews a user is waiting on depend on their roles
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        invalidate_on_commit([version_key(SUBMISSIONS)])
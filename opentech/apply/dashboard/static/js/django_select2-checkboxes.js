@@ -14,10 +14,28 @@
         };
         $element.select2MultiCheckboxes(options);
     };
+    // Choices which were not cached when the page was rendered are loaded
+    // after, only the selected choices are included in the page
+    var loadChoices = function ($element) {
+        var selected = $element.val() || [];
+        return $.getJSON($element.data('choices-url')).then(function (data) {
+            data.results.forEach(function (choice) {
+                if (selected.indexOf(String(choice.id)) === -1) {
+                    $element.append(new Option(choice.text, choice.id));
+                }
+            });
+        });
+    };
     $(function () {
         $('.django-select2-checkboxes').each(function (i, element) {
             var $element = $(element);
-            init($element);
+            if ($element.data('choices-url')) {
+                loadChoices($element).always(function () {
+                    init($element);
+                });
+            } else {
+                init($element);
+            }
         });
     });
 }(this.jQuery));
@@ -1,3 +1,8 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from opentech.apply.funds.tests.factories import (
     ApplicationSubmissionFactory,
     ApplicationRevisionFactory,
@@ -150,6 +155,30 @@ class TestStaffDashboard(BaseViewTestCase):
         response = self.get_page()
         self.assertContains(response, "Projects awaiting approval")
 
+    def test_cached_sections_reduce_queries(self):
+        ApplicationSubmissionFactory.create_batch(3, status='external_review', workflow_stages=2, reviewers=[self.user])
+        ProjectFactory.create_batch(2, lead=self.user)
+
+        with CaptureQueriesContext(connection) as cold:
+            self.get_page()
+        with CaptureQueriesContext(connection) as warm:
+            response = self.get_page()
+
+        self.assertLess(len(warm), len(cold))
+        self.assertEquals(response.context['awaiting_reviews']['count'], 3)
+        self.assertEquals(response.context['projects']['count'], 2)
+
+    @patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+    def test_cached_sections_invalidated_by_changes(self, on_commit):
+        submission = ApplicationSubmissionFactory(status='external_review', workflow_stages=2, reviewers=[self.user])
+        response = self.get_page()
+        self.assertEquals(response.context['awaiting_reviews']['count'], 1)
+
+        ReviewFactory(submission=submission, author__reviewer=self.user, author__staff=True)
+        response = self.get_page()
+        self.assertEquals(response.context['awaiting_reviews']['count'], 0)
+        self.assertContains(response, submission.title)
+
 
 class TestReviewerDashboard(BaseViewTestCase):
     user_factory = ReviewerFactory
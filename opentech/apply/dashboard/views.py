@@ -25,110 +25,110 @@ from opentech.apply.projects.tables import (
 )
 from opentech.apply.utils.views import ViewDispatcher
 
+from .read_model import DashboardReadModel, in_cached_order
+
 
 class AdminDashboardView(TemplateView):
     template_name = 'dashboard/dashboard.html'
 
     def get_context_data(self, **kwargs):
         submissions = ApplicationSubmission.objects.all().for_table(self.request.user)
+        read_model = DashboardReadModel(self.request.user)
 
         extra_context = {
-            'active_payment_requests': self.get_my_active_payment_requests(self.request.user),
-            'awaiting_reviews': self.get_my_awaiting_reviews(self.request.user, submissions),
-            'my_reviewed': self.get_my_reviewed(self.request, submissions),
-            'projects': self.get_my_projects(self.request),
-            'projects_to_approve': self.get_my_projects_to_approve(self.request.user),
-            'rounds': self.get_rounds(self.request.user),
-            'my_flagged': self.get_my_flagged(self.request, submissions),
+            'active_payment_requests': self.get_my_active_payment_requests(read_model),
+            'awaiting_reviews': self.get_my_awaiting_reviews(self.request.user, submissions, read_model),
+            'my_reviewed': self.get_my_reviewed(self.request, submissions, read_model),
+            'projects': self.get_my_projects(self.request, read_model),
+            'projects_to_approve': self.get_my_projects_to_approve(self.request.user, read_model),
+            'rounds': self.get_rounds(read_model),
+            'my_flagged': self.get_my_flagged(self.request, submissions, read_model),
         }
         current_context = super().get_context_data(**kwargs)
         return {**current_context, **extra_context}
 
-    def get_my_active_payment_requests(self, user):
-        payment_requests = PaymentRequest.objects.filter(
-            project__lead=user,
-        ).in_progress()
+    def get_my_active_payment_requests(self, read_model):
+        section = read_model.active_payment_requests()
+        payment_requests = in_cached_order(PaymentRequest.objects.all(), section['ids'])
 
         return {
-            'count': payment_requests.count(),
+            'count': section['count'],
             'table': PaymentRequestsDashboardTable(payment_requests),
         }
 
-    def get_my_projects(self, request):
-        projects = Project.objects.filter(lead=request.user).for_table()
+    def get_my_projects(self, request, read_model):
+        limit = 10
+        section = read_model.projects(limit)
 
+        projects = Project.objects.filter(lead=request.user).for_table()
         filterset = ProjectListFilter(data=request.GET or None, request=request, queryset=projects)
 
-        limit = 10
-
         return {
-            'count': projects.count(),
+            'count': section['count'],
             'filterset': filterset,
-            'table': ProjectsDashboardTable(projects[:limit]),
-            'display_more': projects.count() > limit,
+            'table': ProjectsDashboardTable(in_cached_order(projects, section['ids'])),
+            'display_more': section['count'] > limit,
             'url': reverse('apply:projects:all'),
         }
 
-    def get_my_projects_to_approve(self, user):
+    def get_my_projects_to_approve(self, user, read_model):
         if not user.is_approver:
             return {
                 'count': None,
                 'table': None,
             }
 
-        to_approve = Project.objects.in_approval().for_table()
+        section = read_model.projects_to_approve()
+        to_approve = in_cached_order(Project.objects.for_table(), section['ids'])
 
         return {
-            'count': to_approve.count(),
+            'count': section['count'],
             'table': ProjectsDashboardTable(data=to_approve),
         }
 
-    def get_my_awaiting_reviews(self, user, qs):
+    def get_my_awaiting_reviews(self, user, qs, read_model):
         """Staff reviewer's current to-review submissions."""
-        qs = qs.in_review_for(user).order_by('-submit_time')
-        count = qs.count()
-
         limit = 5
+        section = read_model.awaiting_reviews(limit)
+
         return {
             'active_statuses_filter': ''.join(f'&status={status}' for status in review_filter_for_user(user)),
-            'count': count,
-            'display_more': count > limit,
-            'table': SummarySubmissionsTableWithRole(qs[:limit], prefix='my-review-'),
+            'count': section['count'],
+            'display_more': section['count'] > limit,
+            'table': SummarySubmissionsTableWithRole(in_cached_order(qs, section['ids']), prefix='my-review-'),
         }
 
-    def get_my_reviewed(self, request, qs):
+    def get_my_reviewed(self, request, qs, read_model):
         """Staff reviewer's reviewed submissions for 'Previous reviews' block"""
-        qs = qs.reviewed_by(request.user).order_by('-submit_time')
+        limit = 5
+        section = read_model.reviewed(limit)
 
-        filterset = SubmissionFilterAndSearch(data=request.GET or None, request=request, queryset=qs)
+        filterset = SubmissionFilterAndSearch(data=request.GET or None, request=request, queryset=qs.reviewed_by(request.user))
 
-        limit = 5
         return {
             'filterset': filterset,
-            'table': SummarySubmissionsTable(qs[:limit], prefix='my-reviewed-'),
-            'display_more': qs.count() > limit,
+            'table': SummarySubmissionsTable(in_cached_order(qs, section['ids']), prefix='my-reviewed-'),
+            'display_more': section['count'] > limit,
             'url': reverse('funds:submissions:list'),
         }
 
-    def get_rounds(self, user):
+    def get_rounds(self, read_model):
         limit = 6
-        qs = (RoundsAndLabs.objects.with_progress()
-                                   .active()
-                                   .order_by('-end_date')
-                                   .by_lead(user))
+        section = read_model.rounds(limit)
+        qs = RoundsAndLabs.objects.with_progress()
         return {
-            'closed': qs.closed()[:limit],
-            'open': qs.open()[:limit],
+            'closed': in_cached_order(qs, section['closed']),
+            'open': in_cached_order(qs, section['open']),
         }
 
-    def get_my_flagged(self, request, qs):
-        qs = qs.flagged_by(request.user).order_by('-submit_time')
+    def get_my_flagged(self, request, qs, read_model):
+        limit = 5
+        section = read_model.flagged(limit)
         row_attrs = dict({'data-flag-type': 'user'}, **SummarySubmissionsTable._meta.row_attrs)
 
-        limit = 5
         return {
-            'table': SummarySubmissionsTable(qs[:limit], prefix='my-flagged-', attrs={'class': 'all-submissions-table flagged-table'}, row_attrs=row_attrs),
-            'display_more': qs.count() > limit,
+            'table': SummarySubmissionsTable(in_cached_order(qs, section['ids']), prefix='my-flagged-', attrs={'class': 'all-submissions-table flagged-table'}, row_attrs=row_attrs),
+            'display_more': section['count'] > limit,
         }
 
 
@@ -197,7 +197,9 @@ class ReviewerDashboardView(TemplateView):
         return filterset, my_reviewed_qs, my_reviewed_table, display_more_reviewed
 
     def get_my_submissions(self, request, qs):
-        my_submissions = qs.filter(
+        # Not from qs, select_related would add the draft to the joins of the
+        # other tables built from it
+        my_submissions = ApplicationSubmission.objects.filter(
             user=request.user
         ).active().current().select_related('draft_revision')
         my_submissions = [
@@ -230,7 +232,7 @@ class PartnerDashboardView(TemplateView):
         return partner_submissions_qs, partner_submissions_table
 
     def get_my_submissions(self, request, qs):
-        my_submissions = qs.filter(
+        my_submissions = ApplicationSubmission.objects.filter(
             user=request.user
         ).active().current().select_related('draft_revision')
         my_submissions = [
@@ -279,7 +281,7 @@ class CommunityDashboardView(TemplateView):
         return my_reviewed_qs, my_reviewed_table
 
     def get_my_submissions(self, request, qs):
-        my_submissions = qs.filter(
+        my_submissions = ApplicationSubmission.objects.filter(
             user=request.user
         ).active().current().select_related('draft_revision')
         my_submissions = [
@@ -383,6 +383,27 @@ class BatchDeterminationTestCase(BaseViewTestCase):
 
         self.assertRedirects(response, self.url_from_pattern('apply:submissions:list'))
 
+    def test_batch_stopped_if_any_transition_invalid(self):
+        submission = ApplicationSubmissionFactory()
+        closed = ApplicationSubmissionFactory(status='accepted')
+        submissions = [submission, closed]
+
+        url = self.url(None) + '?submissions=' + ','.join([str(submission.id) for submission in submissions]) + '&action=more_info'
+        data = {
+            'submissions': [submission.id for submission in submissions],
+            'data': 'some data',
+            'outcome': NEEDS_MORE_INFO,
+            'message': 'More Info',
+            'author': self.user.id,
+        }
+
+        response = self.client.post(url, data, secure=True)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.refresh(submission).status, submission.status)
+        self.assertFalse(submission.determinations.exists())
+        self.assertFalse(submission.activities.comments().exists())
+
     def test_sets_next_on_redirect(self):
         test_path = '/a/path/?with=query&a=sting'
         request = RequestFactory().get('', PATH_INFO=test_path)
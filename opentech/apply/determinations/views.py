@@ -13,7 +13,7 @@ from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import DetailView, CreateView
 
-from opentech.apply.activity.models import Activity
+from opentech.apply.activity.models import Activity, COMMENT
 from opentech.apply.activity.messaging import messenger, MESSAGES
 from opentech.apply.funds.models import ApplicationSubmission
 from opentech.apply.funds.workflow import DETERMINATION_OUTCOMES
@@ -39,14 +39,19 @@ from .utils import (
 
 
 def get_form_for_stages(submissions):
-    forms = [
-        get_form_for_stage(submission, batch=True)
+    # The form only depends on the workflow and stage of the submission
+    stages = {
+        (submission.workflow_name, submission.stage.name): submission
         for submission in submissions
-    ]
-    if len(set(forms)) != 1:
+    }
+    forms = {
+        get_form_for_stage(submission, batch=True)
+        for submission in stages.values()
+    }
+    if len(forms) != 1:
         raise ValueError('Submissions expect different forms - please contact and admin')
 
-    return forms[0]
+    return forms.pop()
 
 
 def get_form_for_stage(submission, batch=False):
@@ -54,7 +59,7 @@ def get_form_for_stage(submission, batch=False):
         forms = [BatchConceptDeterminationForm, BatchProposalDeterminationForm]
     else:
         forms = [ConceptDeterminationForm, ProposalDeterminationForm]
-    index = submission.workflow.stages.index(submission.stage)
+    index = submission.workflow.stage_index(submission.stage)
     return forms[index]
 
 
@@ -83,7 +88,7 @@ class BatchDeterminationCreateView(CreateView):
                 ids = [int(pk) for pk in submission_ids]
             except ValueError:
                 return None
-            self._submissions = ApplicationSubmission.objects.filter(id__in=ids)
+            self._submissions = ApplicationSubmission.objects.filter(id__in=ids).with_specific_parents()
         return self._submissions
 
     def get_form_kwargs(self):
@@ -111,11 +116,41 @@ class BatchDeterminationCreateView(CreateView):
 
     def form_valid(self, form):
         submissions = self.get_submissions()
-        response = super().form_valid(form)
-        determinations = {
-            determination.submission.id: determination
-            for determination in form.instances
-        }
+        outcome = form.cleaned_data.get('outcome')
+        # Only the undetermined submissions are given a determination
+        undetermined = {determination.submission.id for determination in form.instances}
+
+        with transaction.atomic():
+            response = super().form_valid(form)
+            determinations = {
+                determination.submission.id: determination
+                for determination in form.instances
+            }
+
+            # We keep a record of the message sent to the user in the comment
+            Activity.objects.bulk_create(
+                Activity(
+                    type=COMMENT,
+                    message=determination.stripped_message,
+                    timestamp=timezone.now(),
+                    user=self.request.user,
+                    source=determination.submission,
+                    related_object=determination,
+                )
+                for determination in determinations.values()
+                if determination.outcome == NEEDS_MORE_INFO
+            )
+
+            # Any transition which isn't possible stops the whole batch
+            ApplicationSubmission.perform_batch_transition(
+                {
+                    submission: transition_from_outcome(outcome, submission)
+                    for submission in submissions if submission.id in undetermined
+                },
+                self.request.user,
+                request=self.request,
+                notify=False,
+            )
 
         messenger(
             MESSAGES.BATCH_DETERMINATION_OUTCOME,
@@ -126,27 +161,11 @@ class BatchDeterminationCreateView(CreateView):
         )
 
         for submission in submissions:
-            try:
-                determination = determinations[submission.id]
-            except KeyError:
+            if submission.id not in determinations:
                 messages.warning(
                     self.request,
                     'Unable to determine submission "{title}" as already determined'.format(title=submission.title),
                 )
-            else:
-                transition = transition_from_outcome(form.cleaned_data.get('outcome'), submission)
-
-                if determination.outcome == NEEDS_MORE_INFO:
-                    # We keep a record of the message sent to the user in the comment
-                    Activity.comments.create(
-                        message=determination.stripped_message,
-                        timestamp=timezone.now(),
-                        user=self.request.user,
-                        source=submission,
-                        related_object=determination,
-                    )
-
-                submission.perform_transition(transition, self.request.user, request=self.request, notify=False)
         return response
 
     @classmethod
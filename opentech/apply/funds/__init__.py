@@ -0,0 +1 @@
+default_app_config = 'opentech.apply.funds.apps.FundsConfig'
@@ -1,5 +1,8 @@
 from django.apps import AppConfig
 
 
-class ApplyConfig(AppConfig):
-    name = 'apply'
+class FundsConfig(AppConfig):
+    name = 'opentech.apply.funds'
+
+    def ready(self):
+        from . import filter_choices  # NOQA
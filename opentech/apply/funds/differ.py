@@ -6,6 +6,9 @@ from difflib import SequenceMatcher
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+# Tags and entities are kept whole so that a change never splits them
+TOKEN_REGEX = re.compile(r'<[^>]*>|&#?\w+;|\w+|\s+|[^\w\s]')
+
 
 def wrap_with_span(text, class_name):
     return format_html('<span class="diff diff__{}">{}</span>', class_name, mark_safe(text))
@@ -19,38 +22,81 @@ def wrap_added(text):
     return wrap_with_span(text, 'added')
 
 
-def compare(answer_a, answer_b, should_bleach=True):
-    if should_bleach:
-        cleaner = Cleaner(tags=['h4'], attributes={}, strip=True)
-        answer_a = re.sub('(<li[^>]*>)', r'\1● ', answer_a)
-        answer_b = re.sub('(<li[^>]*>)', r'\1● ', answer_b)
-        answer_a = cleaner.clean(answer_a)
-        answer_b = cleaner.clean(answer_b)
-
-    diff = SequenceMatcher(None, answer_a, answer_b)
-    from_diff = []
-    to_diff = []
+def clean(answer):
+    cleaner = Cleaner(tags=['h4'], attributes={}, strip=True)
+    answer = re.sub('(<li[^>]*>)', r'\1● ', answer)
+    return cleaner.clean(answer)
+
+
+def tokenize(text):
+    return TOKEN_REGEX.findall(text)
+
+
+def common_affix_length(tokens_a, tokens_b):
+    """Number of tokens shared at the start and at the end of both lists"""
+    limit = min(len(tokens_a), len(tokens_b))
+    prefix = 0
+    while prefix < limit and tokens_a[prefix] == tokens_b[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while suffix < limit - prefix and tokens_a[-suffix - 1] == tokens_b[-suffix - 1]:
+        suffix += 1
+
+    return prefix, suffix
+
+
+def diff_tokens(tokens_a, tokens_b):
+    """
+    Returns the from and to lists of html for the token lists.
+
+    Only the part between the common prefix and suffix is passed to the
+    matcher, so a small edit to a long answer stays cheap.
+    """
+    prefix, suffix = common_affix_length(tokens_a, tokens_b)
+    head = ''.join(tokens_a[:prefix])
+    tail = ''.join(tokens_a[len(tokens_a) - suffix:])
+    middle_a = tokens_a[prefix:len(tokens_a) - suffix]
+    middle_b = tokens_b[prefix:len(tokens_b) - suffix]
+
+    from_diff = [head]
+    to_diff = [head]
+    diff = SequenceMatcher(None, middle_a, middle_b, autojunk=False)
     for opcode, a0, a1, b0, b1 in diff.get_opcodes():
+        a_text = ''.join(middle_a[a0:a1])
+        b_text = ''.join(middle_b[b0:b1])
         if opcode == 'equal':
-            from_diff.append(mark_safe(diff.a[a0:a1]))
-            to_diff.append(mark_safe(diff.b[b0:b1]))
+            from_diff.append(a_text)
+            to_diff.append(b_text)
         elif opcode == 'insert':
-            from_diff.append(mark_safe(diff.a[a0:a1]))
-            to_diff.append(wrap_with_span(diff.b[b0:b1], 'added'))
+            to_diff.append(wrap_added(b_text))
         elif opcode == 'delete':
-            from_diff.append(wrap_with_span(diff.a[a0:a1], 'deleted'))
-            to_diff.append(mark_safe(diff.b[b0:b1]))
+            from_diff.append(wrap_deleted(a_text))
         elif opcode == 'replace':
-            from_diff.append(wrap_with_span(diff.a[a0:a1], 'deleted'))
-            to_diff.append(wrap_with_span(diff.b[b0:b1], 'added'))
-
-    from_display = ''.join(from_diff)
-    to_display = ''.join(to_diff)
-    from_display = re.sub('([●○]|[0-9]{1,2}[\)\.])', r'<br>\1', from_display)
-    to_display = re.sub('([●○]|[0-9]{1,2}[\)\.])', r'<br>\1', to_display)
-    from_display = re.sub('(\.\n)', r'\1<br><br>', from_display)
-    to_display = re.sub('(\.\n)', r'\1<br><br>', to_display)
-    from_display = mark_safe(from_display)
-    to_display = mark_safe(to_display)
-
-    return (from_display, to_display)
+            from_diff.append(wrap_deleted(a_text))
+            to_diff.append(wrap_added(b_text))
+
+    from_diff.append(tail)
+    to_diff.append(tail)
+    return from_diff, to_diff
+
+
+def format_display(text):
+    text = re.sub('([●○]|[0-9]{1,2}[\)\.])', r'<br>\1', text)
+    text = re.sub('(\.\n)', r'\1<br><br>', text)
+    return mark_safe(text)
+
+
+def compare(answer_a, answer_b, should_bleach=True):
+    if should_bleach:
+        answer_a = clean(answer_a)
+        answer_b = clean(answer_b)
+
+    if answer_a == answer_b:
+        # Unchanged answers don't need to be diffed
+        display = format_display(answer_a)
+        return (display, display)
+
+    from_diff, to_diff = diff_tokens(tokenize(answer_a), tokenize(answer_b))
+
+    return (format_display(''.join(from_diff)), format_display(''.join(to_diff)))
@@ -0,0 +1,201 @@
+import csv
+import hashlib
+import os
+import zipfile
+from collections import OrderedDict
+
+from django.core.files import File
+from django.utils.text import get_valid_filename
+
+from opentech.apply.utils.pdfs import make_pdf
+from opentech.apply.utils.storage import PrivateStorage
+
+from .blocks import NAMED_BLOCKS
+
+
+def submission_value(submission):
+    try:
+        return submission.value
+    except KeyError:
+        return 0
+
+
+def submission_type(submission):
+    return submission.round or submission.page
+
+
+EXPORT_COLUMNS = OrderedDict([
+    ('id', ('Submission ID', lambda submission: submission.id)),
+    ('title', ('Submission title', lambda submission: submission.title)),
+    ('full_name', ('Submission author', lambda submission: submission.full_name)),
+    ('email', ('Submission e-mail', lambda submission: submission.email)),
+    ('value', ('Submission value', submission_value)),
+    ('duration', ('Submission duration', lambda submission: submission.duration)),
+    ('stage', ('Submission stage', lambda submission: submission.stage)),
+    ('phase', ('Submission phase', lambda submission: submission.phase)),
+    ('screening', ('Submission screening', lambda submission: submission.screening_status)),
+    ('lead', ('Submission lead', lambda submission: submission.lead)),
+    ('date', ('Submission date', lambda submission: submission.submit_time.strftime('%Y-%m-%d'))),
+    ('round', ('Round/Lab/Fellowship', submission_type)),
+])
+
+DEFAULT_COLUMNS = [
+    'title', 'full_name', 'email', 'value', 'duration', 'stage', 'phase', 'screening', 'date', 'round',
+]
+
+
+class Echo:
+    """File like object which returns the value written rather than storing it"""
+    def write(self, value):
+        return value
+
+
+class SubmissionExport:
+    """
+    Write submissions as CSV rows, loading the submissions in chunks so that
+    the whole table is never held in memory.
+
+    Columns can be any of EXPORT_COLUMNS or any named block.
+    """
+    chunk_size = 2000
+
+    def __init__(self, queryset, columns=None, chunk_size=None):
+        self.columns = columns or DEFAULT_COLUMNS
+        unknown = [column for column in self.columns if column not in self.available_columns()]
+        if unknown:
+            raise ValueError('Unknown columns: {}'.format(', '.join(unknown)))
+
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+
+        self.queryset = queryset.select_related(
+            'round', 'page', 'screening_status', 'lead',
+        ).order_by('submit_time', 'id')
+
+    @classmethod
+    def available_columns(cls):
+        return list(EXPORT_COLUMNS) + [name for name in NAMED_BLOCKS if name not in EXPORT_COLUMNS]
+
+    def header(self, column):
+        try:
+            return EXPORT_COLUMNS[column][0]
+        except KeyError:
+            return column.replace('_', ' ').capitalize()
+
+    def value(self, submission, column):
+        try:
+            getter = EXPORT_COLUMNS[column][1]
+        except KeyError:
+            return submission.data(column)
+        return getter(submission)
+
+    def rows(self):
+        yield [self.header(column) for column in self.columns]
+        for submission in self.queryset.iterator(chunk_size=self.chunk_size):
+            yield [self.value(submission, column) for column in self.columns]
+
+    def write(self, output):
+        writer = csv.writer(output, quoting=csv.QUOTE_ALL)
+        for row in self.rows():
+            writer.writerow(row)
+
+    def stream(self):
+        # For use with a StreamingHttpResponse, each row is returned as it is written
+        writer = csv.writer(Echo(), quoting=csv.QUOTE_ALL)
+        for row in self.rows():
+            yield writer.writerow(row)
+
+
+pdf_storage = PrivateStorage()
+
+
+def pdf_meta(submission):
+    return [
+        submission.stage,
+        submission.page,
+        submission.round,
+        f"Lead: { submission.lead }",
+    ]
+
+
+def pdf_path(submission):
+    # Addressed by the content, a new revision or a change to the details on
+    # the title page is stored as a new file rather than replacing the old one
+    meta = '\n'.join(str(value) for value in [submission.title, *pdf_meta(submission)])
+    digest = hashlib.sha1(meta.encode()).hexdigest()[:12]
+    return os.path.join('submission', str(submission.id), 'pdf', f'{submission.live_revision_id}-{digest}.pdf')
+
+
+def render_key(submission):
+    """Held while the render of the PDF is queued, so it is only queued once"""
+    return 'render_' + pdf_path(submission)
+
+
+def cached_pdf(submission):
+    """The stored PDF for the submission, None if it has not been rendered"""
+    path = pdf_path(submission)
+    if pdf_storage.exists(path):
+        return pdf_storage.open(path)
+    return None
+
+
+def store_pdf(submission):
+    """The stored PDF for the submission, rendering it first if it is missing"""
+    path = pdf_path(submission)
+    if not pdf_storage.exists(path):
+        pdf = make_pdf(
+            title=submission.title,
+            meta=pdf_meta(submission),
+            content=submission.output_text_answers(),
+        )
+        path = pdf_storage.save(path, File(pdf))
+    return pdf_storage.open(path)
+
+
+class ZipStream:
+    """Unseekable file like object which hands back what has been written since it was last read"""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, value):
+        self.chunks.append(bytes(value))
+        return len(value)
+
+    def flush(self):
+        pass
+
+    def read(self):
+        value = b''.join(self.chunks)
+        self.chunks = []
+        return value
+
+
+class SubmissionPDFArchive:
+    """
+    A ZIP of the PDFs of the submissions, streamed one submission at a time.
+
+    Only the stored PDFs are archived, the missing ones are rendered in the
+    background before the archive is streamed.
+    """
+    def __init__(self, queryset):
+        self.queryset = queryset.select_related('round', 'page', 'lead').order_by('id')
+
+    def missing(self):
+        """The submissions which have no stored PDF"""
+        return [
+            submission for submission in self.queryset.iterator()
+            if not pdf_storage.exists(pdf_path(submission))
+        ]
+
+    def filename(self, submission):
+        return get_valid_filename(f'{submission.id} {submission.title}.pdf')
+
+    def stream(self):
+        output = ZipStream()
+        with zipfile.ZipFile(output, 'w') as archive:
+            for submission in self.queryset.iterator():
+                with cached_pdf(submission) as pdf:
+                    archive.writestr(self.filename(submission), pdf.read())
+                yield output.read()
+        # The directory is written as the archive is closed
+        yield output.read()
@@ -0,0 +1,124 @@
+from itertools import chain
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from wagtail.core.models import Page
+
+from opentech.apply.users.groups import STAFF_GROUP_NAME
+from opentech.apply.utils.cache import invalidate_on_change, invalidate_on_commit
+
+from .models import ApplicationSubmission, AssignedReviewers, Round, ScreeningStatus
+from .models.submissions import reviewers_assigned
+
+User = get_user_model()
+
+FILTER_CHOICES_TIMEOUT = 60 * 60 * 24
+
+
+def used_rounds():
+    return Round.objects.filter(submissions__isnull=False).distinct()
+
+
+def used_funds():
+    # Use page to pick up on both Labs and Funds
+    return Page.objects.filter(applicationsubmission__isnull=False).distinct()
+
+
+def round_leads():
+    return User.objects.filter(submission_lead__isnull=False).distinct()
+
+
+def reviewers():
+    """ All assigned reviewers, staff or admin """
+    return User.objects.filter(Q(submissions_reviewer__isnull=False) | Q(groups__name=STAFF_GROUP_NAME) | Q(is_superuser=True)).distinct()
+
+
+def screening_statuses():
+    return ScreeningStatus.objects.filter(
+        id__in=ApplicationSubmission.objects.all().values('screening_status__id').distinct('screening_status__id'))
+
+
+class FilterChoices:
+    """
+    The options of a submission filter, cached as (id, label) pairs until one
+    of the models in invalidated_by changes.
+    """
+    def __init__(self, name, get_queryset, invalidated_by, staff_only=False):
+        self.name = name
+        self.get_queryset = get_queryset
+        self.invalidated_by = invalidated_by
+        self.staff_only = staff_only
+
+    @property
+    def cache_key(self):
+        return f'submission_filter_choices_{self.name}'
+
+    @property
+    def model(self):
+        return self.get_queryset().model
+
+    def queryset(self):
+        # Only evaluated to check the selected values when filtering
+        return self.get_queryset()
+
+    def cached(self):
+        return cache.get(self.cache_key)
+
+    def choices(self):
+        choices = self.cached()
+        if choices is None:
+            choices = [(obj.pk, str(obj)) for obj in self.get_queryset()]
+            cache.set(self.cache_key, choices, FILTER_CHOICES_TIMEOUT)
+        return choices
+
+    def selected(self, values):
+        ids = [value for value in values if str(value).isdigit()]
+        if not ids:
+            return []
+        return [(obj.pk, str(obj)) for obj in self.model.objects.filter(pk__in=ids)]
+
+    def available_to(self, user):
+        return user.is_apply_staff or not self.staff_only
+
+
+FILTER_CHOICES = {
+    choices.name: choices
+    for choices in [
+        FilterChoices('rounds', used_rounds, (ApplicationSubmission, Page)),
+        FilterChoices('funds', used_funds, (ApplicationSubmission, Page)),
+        FilterChoices('leads', round_leads, (ApplicationSubmission, User), staff_only=True),
+        FilterChoices('reviewers', reviewers, (AssignedReviewers, User), staff_only=True),
+        FilterChoices('screening_statuses', screening_statuses, (ApplicationSubmission, ScreeningStatus), staff_only=True),
+    ]
+}
+
+
+def invalidated_choices(instance):
+    return [
+        choices.cache_key for choices in FILTER_CHOICES.values()
+        if isinstance(instance, choices.invalidated_by)
+    ]
+
+
+# The choices are cheap to build again so are deleted rather than versioned
+invalidate_on_change(
+    chain.from_iterable(choices.invalidated_by for choices in FILTER_CHOICES.values()),
+    invalidated_choices,
+    invalidate=cache.delete_many,
+)
+
+
+@receiver(reviewers_assigned)
+def invalidate_choices_for_assignments(sender, **kwargs):
+    invalidate_on_commit([FILTER_CHOICES['reviewers'].cache_key], cache.delete_many)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_reviewer_choices(sender, action, **kwargs):
+    # Staff are always included in the reviewers
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        invalidate_on_commit([FILTER_CHOICES['reviewers'].cache_key], cache.delete_many)
@@ -82,7 +82,7 @@ class BatchProgressSubmissionForm(forms.Form):
     def clean_submissions(self):
         value = self.cleaned_data['submissions']
         submission_ids = [int(submission) for submission in value.split(',')]
-        return ApplicationSubmission.objects.filter(id__in=submission_ids)
+        return ApplicationSubmission.objects.filter(id__in=submission_ids).with_specific_parents()
 
     def clean_action(self):
         value = self.cleaned_data['action']
@@ -134,7 +134,7 @@ class BatchUpdateSubmissionLeadForm(forms.Form):
     def clean_submissions(self):
         value = self.cleaned_data['submissions']
         submission_ids = [int(submission) for submission in value.split(',')]
-        return ApplicationSubmission.objects.filter(id__in=submission_ids)
+        return ApplicationSubmission.objects.filter(id__in=submission_ids).with_specific_parents()
 
     def save(self):
         new_lead = self.cleaned_data['lead']
@@ -278,7 +278,7 @@ class BatchUpdateReviewersForm(forms.Form):
     def clean_submissions(self):
         value = self.cleaned_data['submissions']
         submission_ids = [int(submission) for submission in value.split(',')]
-        return ApplicationSubmission.objects.filter(id__in=submission_ids)
+        return ApplicationSubmission.objects.filter(id__in=submission_ids).with_specific_parents()
 
     def clean(self):
         cleaned_data = super().clean()
@@ -304,8 +304,7 @@ class BatchUpdateReviewersForm(forms.Form):
             if reviewer:
                 AssignedReviewers.objects.update_role(role, reviewer, *submissions)
             else:
-                for submission in submissions:
-                    AssignedReviewers.objects.filter(role=role, submission=submission).delete()
+                AssignedReviewers.objects.filter(role=role, submission__in=submissions).delete()
 
         return None
 
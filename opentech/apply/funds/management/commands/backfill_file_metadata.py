@@ -0,0 +1,82 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from more_itertools import chunked
+
+from opentech.apply.funds.models import ApplicationRevision, ApplicationSubmission
+from opentech.apply.projects.models import Project
+from opentech.apply.stream_forms.blocks import UploadableMediaBlock
+
+
+def files_without_metadata(instance):
+    files = []
+    for field in instance.form_fields or []:
+        if isinstance(field.block, UploadableMediaBlock):
+            value = instance.form_data.get(field.id) or []
+            for file in value if isinstance(value, list) else [value]:
+                if file.checksum is None:
+                    files.append((field.id, file))
+    return files
+
+
+def load_metadata(file):
+    try:
+        file.load_metadata()
+    except Exception:
+        # Missing or unreadable in the storage, which raises its own errors,
+        # it is tried again on the next run
+        return False
+    finally:
+        file.close()
+    return True
+
+
+def store_metadata(model, id, files):
+    """
+    Add the metadata of the files to the form data as it is now, the object
+    may have been edited since the batch was read.
+    """
+    with transaction.atomic():
+        form_data = model.objects.select_for_update().values_list('form_data', flat=True).get(id=id)
+        for field_id, file in files:
+            value = form_data.get(field_id) or []
+            for stored in value if isinstance(value, list) else [value]:
+                # Files saved before #507 keep the name of the file in the storage as the path
+                if isinstance(stored, dict) and stored.get('path', stored.get('name')) == file.name:
+                    stored.update(file.metadata)
+        model.objects.filter(id=id).update(form_data=form_data)
+
+
+class Command(BaseCommand):
+    help = "Store the size, content type and checksum of the uploaded files in the form data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Number of objects to update per batch')
+        parser.add_argument('--workers', type=int, default=8, help='Number of files read from the storage at once')
+
+    def handle(self, *args, **options):
+        querysets = [
+            ApplicationSubmission.objects.all(),
+            ApplicationRevision.objects.select_related('submission'),
+            Project.objects.all(),
+        ]
+        total = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for queryset in querysets:
+                for batch in chunked(queryset.order_by('id').iterator(), options['batch_size']):
+                    files = [
+                        (instance.id, field_id, file)
+                        for instance in batch
+                        for field_id, file in files_without_metadata(instance)
+                    ]
+                    loaded = defaultdict(list)
+                    for (id, field_id, file), success in zip(files, executor.map(load_metadata, [file for *_, file in files])):
+                        if success:
+                            loaded[id].append((field_id, file))
+                            total += 1
+                    for id, instance_files in loaded.items():
+                        store_metadata(queryset.model, id, instance_files)
+
+        self.stdout.write(f'Stored the metadata of {total} files.')
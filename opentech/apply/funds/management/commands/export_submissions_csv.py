@@ -1,26 +1,34 @@
-import csv
-
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
+from opentech.apply.funds.exports import DEFAULT_COLUMNS, SubmissionExport
 from opentech.apply.funds.models import ApplicationSubmission
 
 
 class Command(BaseCommand):
     help = "Export submission stats to a csv file."
 
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='export_submissions.csv', help='File to write to, use - for stdout')
+        parser.add_argument(
+            '--columns',
+            default=','.join(DEFAULT_COLUMNS),
+            help='Comma separated columns to export from: {}'.format(', '.join(SubmissionExport.available_columns())),
+        )
+        parser.add_argument('--chunk-size', type=int, default=SubmissionExport.chunk_size, help='Number of submissions to load per query')
+
     def handle(self, *args, **options):
-        with open('export_submissions.csv', 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
-            writer.writerow(['Submission title', 'Submission author', 'Submission e-mail', 'Submission value', 'Submission duration', 'Submission stage', 'Submission phase', 'Submission screening', 'Submission date', 'Round/Lab/Fellowship'])
-            for submission in ApplicationSubmission.objects.all():
-                if submission.round:
-                    submission_type = submission.round
-                else:
-                    submission_type = submission.page
+        try:
+            export = SubmissionExport(
+                ApplicationSubmission.objects.all(),
+                columns=[column.strip() for column in options['columns'].split(',') if column.strip()],
+                chunk_size=options['chunk_size'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
 
-                try:
-                    value = submission.value
-                except KeyError:
-                    value = 0
+        if options['output'] == '-':
+            export.write(self.stdout)
+            return
 
-                writer.writerow([submission.title, submission.full_name, submission.email, value, submission.duration, submission.stage, submission.phase, submission.screening_status, submission.submit_time.strftime('%Y-%m-%d'), submission_type])
+        with open(options['output'], 'w', newline='') as csvfile:
+            export.write(csvfile)
@@ -0,0 +1,27 @@
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from more_itertools import chunked
+
+from opentech.apply.funds.models import ApplicationSubmission
+from opentech.apply.funds.models.submissions import search_vector
+
+
+class Command(BaseCommand):
+    help = "Build the full text search document of submissions from their stored search data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of submissions to update per query')
+        parser.add_argument('--missing', action='store_true', help='Only update submissions without a search document')
+
+    def handle(self, *args, **options):
+        submissions = ApplicationSubmission.objects.order_by('id')
+        if options['missing']:
+            submissions = submissions.filter(search_document__isnull=True)
+
+        document = search_vector(KeyTextTransform('title', 'form_data'), F('search_data'))
+        total = 0
+        for batch in chunked(submissions.values_list('id', flat=True).iterator(), options['batch_size']):
+            total += ApplicationSubmission.objects.filter(id__in=batch).update(search_document=document)
+
+        self.stdout.write(f'Updated the search document for {total} submissions.')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from more_itertools import chunked
+
+from opentech.apply.funds.models import ApplicationSubmission, SubmissionStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalised submission stats used by the submission tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of submissions to rebuild per query')
+
+    def handle(self, *args, **options):
+        submission_ids = ApplicationSubmission.objects.order_by('id').values_list('id', flat=True)
+        total = 0
+        for batch in chunked(submission_ids.iterator(), options['batch_size']):
+            with transaction.atomic():
+                SubmissionStats.objects.rebuild(batch)
+            total += len(batch)
+
+        self.stdout.write(f'Rebuilt stats for {total} submissions.')
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from opentech.apply.funds.models import RoundProgress
+
+
+class Command(BaseCommand):
+    help = "Recount the submissions of every round and lab used to show their progress."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            before = {
+                progress.page_id: (progress.total_submissions, progress.closed_submissions)
+                for progress in RoundProgress.objects.all()
+            }
+            RoundProgress.objects.rebuild()
+            after = {
+                progress.page_id: (progress.total_submissions, progress.closed_submissions)
+                for progress in RoundProgress.objects.all()
+            }
+
+        changed = [page for page in before.keys() | after.keys() if before.get(page, (0, 0)) != after.get(page, (0, 0))]
+        self.stdout.write(f'Repaired the progress of {len(changed)} rounds and labs.')
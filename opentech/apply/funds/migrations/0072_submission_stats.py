@@ -0,0 +1,35 @@
+# Generated by Django 2.2.10 on 2026-10-18 05:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('funds', '0071_update_field_reviewer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionStats',
+            fields=[
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='funds.ApplicationSubmission')),
+                ('last_update', models.DateTimeField(null=True)),
+                ('last_user_update', models.CharField(max_length=255, null=True)),
+                ('comments_applicant', models.PositiveIntegerField(default=0)),
+                ('comments_team', models.PositiveIntegerField(default=0)),
+                ('comments_reviewers', models.PositiveIntegerField(default=0)),
+                ('comments_partners', models.PositiveIntegerField(default=0)),
+                ('comments_all', models.PositiveIntegerField(default=0)),
+                ('opinion_disagree', models.IntegerField(null=True)),
+                ('review_staff_count', models.IntegerField(null=True)),
+                ('review_count', models.IntegerField(null=True)),
+                ('review_submitted_count', models.IntegerField(null=True)),
+                ('review_recommendation', models.IntegerField(null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'submission stats',
+            },
+        ),
+    ]
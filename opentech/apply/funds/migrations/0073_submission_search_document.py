@@ -0,0 +1,42 @@
+# Generated by Django 2.2.10 on 2026-10-18 07:35
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F
+
+# Copied from opentech.apply.funds.models.submissions at time of migration to
+# avoid importing and creating a future dependency
+SEARCH_CONFIG = 'english'
+
+
+def build_search_document(apps, schema_editor):
+    ApplicationSubmission = apps.get_model('funds', 'ApplicationSubmission')
+    ApplicationSubmission.objects.update(
+        search_document=(
+            SearchVector(KeyTextTransform('title', 'form_data'), weight='A', config=SEARCH_CONFIG) +
+            SearchVector(F('search_data'), weight='B', config=SEARCH_CONFIG)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('funds', '0072_submission_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='search_document',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(build_search_document, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='funds_appli_search__43a072_gin'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.10 on 2026-10-18 09:44
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Q
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+# Copied from opentech.apply.funds.workflow at time of migration to avoid
+# importing and creating a future dependency
+CLOSED = Q(status__contains='accepted') | Q(status__contains='rejected') | Q(status__contains='invited')
+
+
+def count_submissions(apps, schema_editor):
+    ApplicationSubmission = apps.get_model('funds', 'ApplicationSubmission')
+    RoundProgress = apps.get_model('funds', 'RoundProgress')
+    counts = ApplicationSubmission.objects.filter(next__isnull=True).annotate(
+        parent=Coalesce('round', 'page', output_field=IntegerField()),
+    ).order_by().values('parent').annotate(
+        total_submissions=Count('pk'),
+        closed_submissions=Count('pk', filter=CLOSED),
+    )
+    RoundProgress.objects.bulk_create(
+        RoundProgress(page_id=row.pop('parent'), **row)
+        for row in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0041_group_collection_permissions_verbose_name_plural'),
+        ('funds', '0073_submission_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoundProgress',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='submission_counts', serialize=False, to='wagtailcore.Page')),
+                ('total_submissions', models.PositiveIntegerField(default=0)),
+                ('closed_submissions', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'round progress',
+            },
+        ),
+        migrations.RunPython(count_submissions, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,11 @@ from .applications import ApplicationBase, RoundBase, LabBase, RoundsAndLabs  #
 from .forms import ApplicationForm
 from .reviewer_role import ReviewerRole
 from .screening import ScreeningStatus
+from .stats import RoundProgress, SubmissionStats
 from .submissions import ApplicationSubmission, AssignedReviewers, ApplicationRevision
 
 
-__all__ = ['ApplicationSubmission', 'AssignedReviewers', 'ApplicationRevision', 'ApplicationForm', 'ScreeningStatus', 'ReviewerRole']
+__all__ = ['ApplicationSubmission', 'AssignedReviewers', 'ApplicationRevision', 'ApplicationForm', 'ScreeningStatus', 'ReviewerRole', 'RoundProgress', 'SubmissionStats']
 
 
 class FundType(ApplicationBase):
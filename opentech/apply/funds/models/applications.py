@@ -7,10 +7,8 @@ from django.db import models
 from django.db.models import (
     Case,
     CharField,
-    Count,
     F,
     FloatField,
-    IntegerField,
     OuterRef,
     Q,
     Subquery,
@@ -475,24 +473,10 @@ class RoundsAndLabsManager(PageManager):
         )
 
     def with_progress(self):
-        submissions = ApplicationSubmission.objects.filter(Q(round=OuterRef('pk')) | Q(page=OuterRef('pk'))).current()
-        closed_submissions = submissions.inactive()
-
+        # The counts are kept in RoundProgress as the submissions change
         return self.get_queryset(RoundsAndLabsProgressQueryset).annotate(
-            total_submissions=Coalesce(
-                Subquery(
-                    submissions.values('round').annotate(count=Count('pk')).values('count'),
-                    output_field=IntegerField(),
-                ),
-                0,
-            ),
-            closed_submissions=Coalesce(
-                Subquery(
-                    closed_submissions.values('round').annotate(count=Count('pk')).values('count'),
-                    output_field=IntegerField(),
-                ),
-                0,
-            ),
+            total_submissions=Coalesce(F('submission_counts__total_submissions'), 0),
+            closed_submissions=Coalesce(F('submission_counts__closed_submissions'), 0),
         ).annotate(
             progress=Case(
                 When(total_submissions=0, then=None),
@@ -1,12 +1,13 @@
+from functools import partial
+
 from django.utils.safestring import mark_safe
 from django.core.files import File
 
 from opentech.apply.stream_forms.blocks import (
     FileFieldBlock, FormFieldBlock, GroupToggleBlock, ImageFieldBlock, MultiFileFieldBlock
 )
-from opentech.apply.utils.blocks import SingleIncludeMixin
-
 from opentech.apply.stream_forms.blocks import UploadableMediaBlock
+from opentech.apply.stream_forms.models import form_definitions, lazy_form_data
 from opentech.apply.utils.storage import PrivateStorage
 
 from ..files import SubmissionStreamFieldFile
@@ -58,7 +59,15 @@ class AccessFormData:
         if 'path' in file:
             file['filename'] = file['name']
             file['name'] = file['path']
-        return cls.stream_file_class(instance, field, None, name=file['name'], filename=file.get('filename'), storage=cls.storage_class())
+        return cls.stream_file_class(
+            instance, field, None,
+            name=file['name'],
+            filename=file.get('filename'),
+            size=file.get('size'),
+            content_type=file.get('content_type'),
+            checksum=file.get('checksum'),
+            storage=cls.storage_class(),
+        )
 
     @classmethod
     def process_file(cls, instance, field, file):
@@ -96,21 +105,20 @@ class AccessFormData:
 
     @classmethod
     def deserialised_data(cls, instance, data, form_fields):
-        # Converts the file dicts into actual file objects
-        data = data.copy()
-        # PERFORMANCE NOTE:
-        # Do not attempt to iterate over form_fields - that will fully instantiate the form_fields
-        # including any sub queries that they do
-        for i, field_data in enumerate(form_fields.stream_data):
-            block = form_fields.stream_block.child_blocks[field_data['type']]
+        # Converts the file dicts into actual file objects when they are accessed
+        data = lazy_form_data(data)
+        definition = form_definitions.get(form_fields)
+        for field_id, (i, block) in definition.blocks.items():
             if isinstance(block, UploadableMediaBlock):
-                field_id = field_data.get('id')
-                if field_id:
-                    field = form_fields[i]
-                    file = data.get(field_id, [])
-                    data[field_id] = cls.process_file(instance, field, file)
+                if field_id not in data:
+                    data[field_id] = []
+                data.add_decoder(field_id, partial(cls.decode_file, instance, definition, field_id))
         return data
 
+    @classmethod
+    def decode_file(cls, instance, definition, field_id, file):
+        return cls.process_file(instance, definition.raw_fields[field_id], file)
+
     def get_definitive_id(self, id):
         if id in self.named_blocks:
             return self.named_blocks[id]
@@ -126,10 +134,17 @@ class AccessFormData:
     def data(self, id):
         definitive_id = self.get_definitive_id(id)
         try:
-            return self.raw_data[definitive_id]
+            return self.form_data[definitive_id]
         except KeyError:
-            # We have most likely progressed application forms so the data isnt in form_data
-            return None
+            pass
+
+        # Named fields may be stored using their name, see raw_data
+        for field_name, field_id in self.named_blocks.items():
+            if field_id == definitive_id and field_name in self.form_data:
+                return self.form_data[field_name]
+
+        # We have most likely progressed application forms so the data isnt in form_data
+        return None
 
     @property
     def question_field_ids(self):
@@ -166,10 +181,7 @@ class AccessFormData:
     @property
     def raw_fields(self):
         # Field ids to field class mapping - similar to raw_data
-        return {
-            field.id: field
-            for field in self.form_fields
-        }
+        return self.form_definition.raw_fields
 
     @property
     def fields(self):
@@ -182,11 +194,7 @@ class AccessFormData:
 
     @property
     def named_blocks(self):
-        return {
-            field.block.name: field.id
-            for field in self.form_fields
-            if isinstance(field.block, SingleIncludeMixin)
-        }
+        return self.form_definition.named_blocks
 
     @property
     def normal_blocks(self):
@@ -0,0 +1,229 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Count, IntegerField, Q
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from opentech.apply.activity.models import Activity, APPLICANT, TEAM, REVIEWER, PARTNER, ALL
+from opentech.apply.review.models import Review, ReviewOpinion
+
+from ..workflow import active_statuses
+from .submissions import ApplicationSubmission, AssignedReviewers, reviewers_assigned, statuses_updated
+
+
+class SubmissionStatsQueryset(models.QuerySet):
+    def calculate(self, submissions):
+        # Use the same calculations as ApplicationSubmissionQueryset.for_table
+        # so both modes display the same values
+        comment_counts = {
+            field: [visibility]
+            for visibility, field in self.model.COMMENT_COUNT_FIELDS.items()
+        }
+        return ApplicationSubmission.objects.filter(
+            id__in=submissions,
+        ).order_by().with_latest_update().with_comment_counts(
+            **comment_counts,
+        ).with_reviewers_summary().values(
+            'id',
+            *self.model.STATS_FIELDS,
+        )
+
+    def refresh(self, submissions, create=True):
+        # When create is False only existing rows are updated, this stops us
+        # recreating rows for submissions that are in the process of being deleted
+        for stats in self.calculate(submissions):
+            submission_id = stats.pop('id')
+            if create:
+                self.update_or_create(submission_id=submission_id, defaults=stats)
+            else:
+                self.filter(submission_id=submission_id).update(**stats)
+
+    def rebuild(self, submissions):
+        self.filter(submission__in=submissions).delete()
+        self.bulk_create(
+            self.model(submission_id=stats.pop('id'), **stats)
+            for stats in self.calculate(submissions)
+        )
+
+
+class SubmissionStats(models.Model):
+    """
+    Denormalised version of the values displayed in the submission tables.
+
+    Kept up to date by the signals below, use the rebuild_submission_stats
+    command to populate the table or repair it after bulk changes.
+    """
+    COMMENT_COUNT_FIELDS = {
+        APPLICANT: 'comments_applicant',
+        TEAM: 'comments_team',
+        REVIEWER: 'comments_reviewers',
+        PARTNER: 'comments_partners',
+        ALL: 'comments_all',
+    }
+    STATS_FIELDS = [
+        'last_update',
+        'last_user_update',
+        *COMMENT_COUNT_FIELDS.values(),
+        'opinion_disagree',
+        'review_staff_count',
+        'review_count',
+        'review_submitted_count',
+        'review_recommendation',
+    ]
+
+    submission = models.OneToOneField(
+        ApplicationSubmission,
+        related_name='stats',
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    last_update = models.DateTimeField(null=True)
+    last_user_update = models.CharField(max_length=255, null=True)
+
+    comments_applicant = models.PositiveIntegerField(default=0)
+    comments_team = models.PositiveIntegerField(default=0)
+    comments_reviewers = models.PositiveIntegerField(default=0)
+    comments_partners = models.PositiveIntegerField(default=0)
+    comments_all = models.PositiveIntegerField(default=0)
+
+    opinion_disagree = models.IntegerField(null=True)
+    review_staff_count = models.IntegerField(null=True)
+    review_count = models.IntegerField(null=True)
+    review_submitted_count = models.IntegerField(null=True)
+    review_recommendation = models.IntegerField(null=True)
+
+    objects = SubmissionStatsQueryset.as_manager()
+
+    class Meta:
+        verbose_name_plural = 'submission stats'
+
+    def __str__(self):
+        return f'Stats for {self.submission}'
+
+
+class RoundProgressQueryset(models.QuerySet):
+    def calculate(self, pages=None):
+        # Use the same calculations as the progress of RoundsAndLabs, lab
+        # submissions have no round
+        submissions = ApplicationSubmission.objects.current().annotate(
+            parent=Coalesce('round', 'page', output_field=IntegerField()),
+        )
+        if pages is not None:
+            submissions = submissions.filter(parent__in=pages)
+        return submissions.order_by().values('parent').annotate(
+            total_submissions=Count('pk'),
+            closed_submissions=Count('pk', filter=~Q(status__in=active_statuses)),
+        )
+
+    def refresh(self, pages, create=True):
+        # When create is False only existing rows are updated, this stops us
+        # recreating rows for rounds that are in the process of being deleted
+        counts = {row.pop('parent'): row for row in self.calculate(pages)}
+        for page in pages:
+            values = counts.get(page, {'total_submissions': 0, 'closed_submissions': 0})
+            updated = self.filter(page_id=page).update(**values)
+            if not updated and create:
+                self.create(page_id=page, **values)
+
+    def rebuild(self):
+        self.all().delete()
+        self.bulk_create(
+            self.model(page_id=row.pop('parent'), **row)
+            for row in self.calculate()
+        )
+
+
+class RoundProgress(models.Model):
+    """
+    The number of current and closed submissions of each round and lab, used
+    by RoundsAndLabs.with_progress.
+
+    Kept up to date by the signals below, use the reconcile_round_progress
+    command to repair it after bulk changes.
+    """
+    page = models.OneToOneField(
+        'wagtailcore.Page',
+        related_name='submission_counts',
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    total_submissions = models.PositiveIntegerField(default=0)
+    closed_submissions = models.PositiveIntegerField(default=0)
+
+    objects = RoundProgressQueryset.as_manager()
+
+    class Meta:
+        verbose_name_plural = 'round progress'
+
+    def __str__(self):
+        return f'Progress for {self.page}'
+
+
+@receiver(post_save, sender=ApplicationSubmission)
+def update_round_progress(sender, instance, created, update_fields, **kwargs):
+    # Status changes and progressing to the next stage save only those fields
+    if created or {'status', 'next'} & set(update_fields or []):
+        RoundProgress.objects.refresh([instance.round_id or instance.page_id])
+
+
+@receiver(statuses_updated)
+def update_round_progress_for_batch(sender, submissions, **kwargs):
+    RoundProgress.objects.refresh({submission.round_id or submission.page_id for submission in submissions})
+
+
+@receiver(post_delete, sender=ApplicationSubmission)
+def update_round_progress_for_delete(sender, instance, **kwargs):
+    RoundProgress.objects.refresh([instance.round_id or instance.page_id], create=False)
+
+
+@receiver(post_save, sender=ApplicationSubmission)
+def create_submission_stats(sender, instance, created, **kwargs):
+    if created and settings.SUBMISSION_STATS_ENABLED:
+        SubmissionStats.objects.refresh([instance.id])
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def update_stats_for_activity(sender, instance, signal, **kwargs):
+    if not settings.SUBMISSION_STATS_ENABLED:
+        return
+    submission_type = ContentType.objects.get_for_model(ApplicationSubmission)
+    if instance.source_content_type_id == submission_type.id:
+        SubmissionStats.objects.refresh([instance.source_object_id], create=signal is post_save)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=AssignedReviewers)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=AssignedReviewers)
+def update_stats_for_review(sender, instance, signal, **kwargs):
+    if not settings.SUBMISSION_STATS_ENABLED:
+        return
+    SubmissionStats.objects.refresh([instance.submission_id], create=signal is post_save)
+
+
+@receiver(reviewers_assigned)
+def update_stats_for_reviewers(sender, submissions, **kwargs):
+    if not settings.SUBMISSION_STATS_ENABLED:
+        return
+    SubmissionStats.objects.refresh(submissions)
+
+
+@receiver(statuses_updated)
+def update_stats_for_batch(sender, submissions, **kwargs):
+    # Batch actions create the activity of the submissions in bulk too
+    if not settings.SUBMISSION_STATS_ENABLED:
+        return
+    SubmissionStats.objects.rebuild([submission.id for submission in submissions])
+
+
+@receiver(post_save, sender=ReviewOpinion)
+@receiver(post_delete, sender=ReviewOpinion)
+def update_stats_for_opinion(sender, instance, signal, **kwargs):
+    if not settings.SUBMISSION_STATS_ENABLED:
+        return
+    # The review may already have been removed if this is part of a cascade
+    submissions = Review.objects.filter(id=instance.review_id).values('submission')
+    SubmissionStats.objects.refresh(submissions, create=signal is post_save)
@@ -1,12 +1,17 @@
-from functools import partialmethod
+import operator
+import re
+from collections import defaultdict
+from functools import partialmethod, reduce
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
 from django.core.exceptions import PermissionDenied
-from django.db import models
+from django.db import models, transaction
 from django.db.models import (
     Case,
     Count,
@@ -17,11 +22,13 @@ from django.db.models import (
     Q,
     Subquery,
     Sum,
+    Value,
     When,
 )
 from django.db.models.expressions import RawSQL, OrderBy
 from django.db.models.functions import Coalesce
-from django.dispatch import receiver
+from django.db.models.query import ModelIterable
+from django.dispatch import receiver, Signal
 from django.urls import reverse
 from django.utils.text import slugify
 
@@ -29,6 +36,7 @@ from django_fsm import can_proceed, FSMField, transition, RETURN_VALUE
 from django_fsm.signals import post_transition
 
 from wagtail.core.fields import StreamField
+from wagtail.core.models import Page
 from wagtail.contrib.forms.models import AbstractFormSubmission
 
 from opentech.apply.activity.messaging import messenger, MESSAGES
@@ -95,6 +103,58 @@ class JSONOrderable(models.QuerySet):
         return super().order_by(*field_ordering)
 
 
+SEARCH_CONFIG = 'english'
+
+
+def search_vector(title, search_data):
+    """The document searched for a submission, matches in the title rank highest"""
+    return (
+        SearchVector(title, weight='A', config=SEARCH_CONFIG) +
+        SearchVector(search_data, weight='B', config=SEARCH_CONFIG)
+    )
+
+
+class PrefixSearchQuery(SearchQuery):
+    """
+    Matches every word of the query as the parser splits the documents, so
+    emails and host names are kept whole. The last word may be incomplete so
+    is matched as a prefix.
+    """
+    def as_sql(self, compiler, connection):
+        sql, params = super().as_sql(compiler, connection)
+        # Only stop words leave an empty query, with no word to match as a prefix
+        return (
+            f"(CASE WHEN numnode({sql}) = 0 THEN {sql} ELSE ({sql}::text || ':*')::tsquery END)",
+            params * 3,
+        )
+
+
+def search_query(query):
+    """The query for the words searched, None if there are no words"""
+    if not re.search(r'\w', query):
+        return None
+    return PrefixSearchQuery(query, config=SEARCH_CONFIG)
+
+
+class SpecificParentsIterable(ModelIterable):
+    """
+    Load the specific round and lab pages for all of the submissions at
+    once, one query for the page types and one for each type of page.
+    """
+    def __iter__(self):
+        submissions = list(super().__iter__())
+        page_ids = {submission.page_id for submission in submissions}
+        page_ids.update(submission.round_id for submission in submissions if submission.round_id)
+        pages = {page.id: page for page in Page.objects.filter(id__in=page_ids).specific()} if page_ids else {}
+        for submission in submissions:
+            submission.specific_parents.update({
+                page_id: pages[page_id]
+                for page_id in [submission.page_id, submission.round_id]
+                if page_id in pages
+            })
+            yield submission
+
+
 class ApplicationSubmissionQueryset(JSONOrderable):
     json_field = 'form_data'
 
@@ -112,6 +172,19 @@ class ApplicationSubmissionQueryset(JSONOrderable):
     def in_review(self):
         return self.filter(status__in=review_statuses)
 
+    def with_specific_parents(self):
+        clone = self._chain()
+        clone._iterable_class = SpecificParentsIterable
+        return clone
+
+    def search(self, query):
+        query = search_query(query)
+        if query is None:
+            return self
+        return self.filter(search_document=query).annotate(
+            search_rank=SearchRank(F('search_document'), query),
+        ).order_by('-search_rank', '-submit_time')
+
     def in_review_for(self, user, assigned=True):
         user_review_statuses = get_review_active_statuses(user)
         qs = self.prefetch_related('reviews__author__reviewer')
@@ -153,25 +226,13 @@ class ApplicationSubmissionQueryset(JSONOrderable):
             last_update=Subquery(latest_activity.values('timestamp')[:1]),
         )
 
-    def for_table(self, user):
-        activities = self.model.activities.rel.model
-        comments = activities.comments.filter(submission=OuterRef('id')).visible_to(user)
-        roles_for_review = self.model.assigned.field.model.objects.with_roles().filter(
-            submission=OuterRef('id'), reviewer=user)
-
+    def with_reviewers_summary(self):
         review_model = self.model.reviews.field.model
         reviews = review_model.objects.filter(submission=OuterRef('id'))
         opinions = review_model.opinions.field.model.objects.filter(review__submission=OuterRef('id'))
         reviewers = self.model.assigned.field.model.objects.filter(submission=OuterRef('id'))
 
-        return self.with_latest_update().annotate(
-            comment_count=Coalesce(
-                Subquery(
-                    comments.values('submission').order_by().annotate(count=Count('pk')).values('count'),
-                    output_field=IntegerField(),
-                ),
-                0,
-            ),
+        return self.annotate(
             opinion_disagree=Subquery(
                 opinions.filter(opinion=DISAGREE).values(
                     'review__submission'
@@ -201,6 +262,61 @@ class ApplicationSubmissionQueryset(JSONOrderable):
                     output_field=IntegerField(),
                 )
             ),
+        )
+
+    def with_comment_counts(self, **counts):
+        # Annotates a count of the comments for each of the given visibilities
+        activities = self.model.activities.rel.model
+        comments = activities.comments.filter(submission=OuterRef('id'))
+        return self.annotate(**{
+            name: Coalesce(
+                Subquery(
+                    comments.filter(visibility__in=visibility).values('submission').order_by().annotate(
+                        count=Count('pk')
+                    ).values('count'),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+            for name, visibility in counts.items()
+        })
+
+    def with_stats(self, user):
+        # Reads the denormalised values from SubmissionStats rather than
+        # calculating them per row, see SubmissionStatsQueryset.refresh
+        activities = self.model.activities.rel.model
+        stats_model = self.model.stats.related.related_model
+        comment_counts = [
+            F(f'stats__{stats_model.COMMENT_COUNT_FIELDS[visibility]}')
+            for visibility in activities.visibility_for(user)
+        ]
+        return self.annotate(
+            last_user_update=F('stats__last_user_update'),
+            last_update=F('stats__last_update'),
+            comment_count=Coalesce(reduce(operator.add, comment_counts), 0),
+            opinion_disagree=F('stats__opinion_disagree'),
+            review_staff_count=F('stats__review_staff_count'),
+            review_count=F('stats__review_count'),
+            review_submitted_count=F('stats__review_submitted_count'),
+            review_recommendation=F('stats__review_recommendation'),
+        )
+
+    def for_table(self, user, use_stats=None):
+        if use_stats is None:
+            use_stats = settings.SUBMISSION_STATS_ENABLED
+
+        roles_for_review = self.model.assigned.field.model.objects.with_roles().filter(
+            submission=OuterRef('id'), reviewer=user)
+
+        if use_stats:
+            qs = self.with_stats(user)
+        else:
+            activities = self.model.activities.rel.model
+            qs = self.with_latest_update().with_comment_counts(
+                comment_count=activities.visibility_for(user),
+            ).with_reviewers_summary()
+
+        return qs.annotate(
             role_icon=Subquery(roles_for_review[:1].values('role__icon')),
         ).prefetch_related(
             Prefetch(
@@ -214,7 +330,7 @@ class ApplicationSubmissionQueryset(JSONOrderable):
             ),
             Prefetch(
                 'assigned',
-                queryset=AssignedReviewers.objects.not_reviewed().staff(),
+                queryset=AssignedReviewers.objects.not_reviewed().staff().select_related('reviewer'),
                 to_attr='hasnt_reviewed'
             )
         ).select_related(
@@ -419,6 +535,7 @@ class ApplicationSubmission(
     )
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     search_data = models.TextField()
+    search_document = SearchVectorField(null=True, editable=False)
 
     # Workflow inherited from WorkflowHelpers
     status = FSMField(default=INITIAL_STATE, protected=True)
@@ -453,6 +570,11 @@ class ApplicationSubmission(
 
     objects = ApplicationSubmissionQueryset.as_manager()
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_document']),
+        ]
+
     def not_progressed(self):
         return not self.next
 
@@ -511,13 +633,68 @@ class ApplicationSubmission(
                     defaults={'full_name': full_name}
                 )
 
-    def get_from_parent(self, attribute):
+    @property
+    def specific_parents(self):
+        # The specific round and lab pages, keyed by their id so that changing
+        # the round or page never returns the old one
+        return self.__dict__.setdefault('_specific_parents', {})
+
+    def get_specific_parent(self, field):
+        page_id = getattr(self, f'{field}_id')
+        if page_id is None:
+            return None
         try:
+            return self.specific_parents[page_id]
+        except KeyError:
+            parent = self.specific_parents[page_id] = getattr(self, field).specific
+            return parent
 
-            return getattr(self.round.specific, attribute)
+    def get_from_parent(self, attribute):
+        try:
+            return getattr(self.get_specific_parent('round'), attribute)
         except AttributeError:
             # We are a lab submission
-            return getattr(self.page.specific, attribute)
+            return getattr(self.get_specific_parent('page'), attribute)
+
+    @classmethod
+    def perform_batch_transition(cls, transitions, user, request=None, **kwargs):
+        """
+        Perform the {submission: action} transitions together, every transition
+        is checked before any is made and the statuses are saved in bulk.
+
+        Transitions which run a method or may lead to a new stage are performed
+        one at a time with perform_transition.
+        """
+        for submission, action in transitions.items():
+            transition = submission.get_transition(action)
+            if not transition:
+                raise PermissionDenied(f'Invalid "{ action }" transition')
+            if not can_proceed(transition):
+                action = submission.phase.transitions[action]
+                raise PermissionDenied(f'You do not have permission to "{ action }"')
+
+        by_status = defaultdict(list)
+        with transaction.atomic():
+            for submission, action in transitions.items():
+                new_phase = submission.workflow[action]
+                if (
+                    submission.phase.transitions[action].get('method') or
+                    action in STAGE_CHANGE_ACTIONS or
+                    STAGE_CHANGE_ACTIONS & set(new_phase.transitions)
+                ):
+                    submission.perform_transition(action, user, request=request, **kwargs)
+                else:
+                    # Only changes the status in memory, which is saved below
+                    submission.get_transition(action)(by=user, request=request, **kwargs)
+                    by_status[action].append(submission)
+
+            for status, submissions in by_status.items():
+                cls.objects.filter(id__in=[submission.id for submission in submissions]).update(status=status)
+
+        # Sent for the transitions performed on their own too, the activity of
+        # the batch is created in bulk for all of them
+        if transitions:
+            statuses_updated.send(sender=cls, submissions=list(transitions))
 
     def progress_application(self, **kwargs):
         target = None
@@ -544,7 +721,7 @@ class ApplicationSubmission(
         self.meta_terms.set(prev_meta_terms)
 
         submission_in_db.next = self
-        submission_in_db.save()
+        submission_in_db.save(update_fields=['next'])
 
     def new_data(self, data):
         self.is_draft = False
@@ -574,7 +751,7 @@ class ApplicationSubmission(
                 self.form_data = current_submission.form_data
             else:
                 self.live_revision = revision
-                self.search_data = ' '.join(self.prepare_search_values())
+                self.update_search_data()
 
             self.draft_revision = revision
             self.save(skip_custom=True)
@@ -616,17 +793,13 @@ class ApplicationSubmission(
         self.clean_submission()
 
         # add a denormed version of the answer for searching
-        self.search_data = ' '.join(self.prepare_search_values())
+        self.update_search_data()
 
         super().save(*args, **kwargs)
 
         if creating:
             self.process_file_data(files)
-            for reviewer in self.get_from_parent('reviewers').all():
-                AssignedReviewers.objects.get_or_create_for_user(
-                    reviewer=reviewer,
-                    submission=self
-                )
+            AssignedReviewers.objects.bulk_assign([self], self.get_from_parent('reviewers').all())
             first_revision = ApplicationRevision.objects.create(
                 submission=self,
                 form_data=self.form_data,
@@ -682,6 +855,14 @@ class ApplicationSubmission(
 
         return self.has_permission_to_review(user)
 
+    def update_search_data(self):
+        self.search_data = ' '.join(self.prepare_search_values())
+        # Built by the database in the same query as the save
+        self.search_document = search_vector(
+            Value(self.title, output_field=models.TextField()),
+            Value(self.search_data, output_field=models.TextField()),
+        )
+
     def prepare_search_values(self):
         for field_id in self.question_field_ids:
             field = self.field(field_id)
@@ -715,7 +896,7 @@ class ApplicationSubmission(
     def in_final_stage(self):
         stages = self.workflow.stages
 
-        stage_index = stages.index(self.stage)
+        stage_index = self.workflow.stage_index(self.stage)
 
         # adjust the index since list.index() is zero-based
         adjusted_index = stage_index + 1
@@ -809,6 +990,28 @@ class ApplicationRevision(BaseStreamForm, AccessFormData, models.Model):
         })
 
 
+# Sent after reviewers are assigned in bulk, which skips the model signals
+reviewers_assigned = Signal(providing_args=['submissions'])
+
+# Sent after the statuses of a batch of submissions are saved in bulk
+statuses_updated = Signal(providing_args=['submissions'])
+
+
+def review_group_name(reviewer):
+    groups = set(reviewer.roles) & set(REVIEW_GROUPS)
+    if len(groups) > 1:
+        if COMMUNITY_REVIEWER_GROUP_NAME in groups:
+            return COMMUNITY_REVIEWER_GROUP_NAME
+        elif reviewer.is_apply_staff:
+            return STAFF_GROUP_NAME
+        return REVIEWER_GROUP_NAME
+    elif not groups:
+        if reviewer.is_staff or reviewer.is_superuser:
+            return STAFF_GROUP_NAME
+        return REVIEWER_GROUP_NAME
+    return groups.pop()
+
+
 class AssignedReviewersQuerySet(models.QuerySet):
     def review_order(self):
         review_order = [
@@ -880,21 +1083,7 @@ class AssignedReviewersQuerySet(models.QuerySet):
         return self.filter(type__name=STAFF_GROUP_NAME)
 
     def get_or_create_for_user(self, submission, reviewer):
-        groups = set(reviewer.groups.values_list('name', flat=True)) & set(REVIEW_GROUPS)
-        if len(groups) > 1:
-            if COMMUNITY_REVIEWER_GROUP_NAME in groups:
-                groups = {COMMUNITY_REVIEWER_GROUP_NAME}
-            elif reviewer.is_apply_staff:
-                groups = {STAFF_GROUP_NAME}
-            else:
-                groups = {REVIEWER_GROUP_NAME}
-        elif not groups:
-            if reviewer.is_staff or reviewer.is_superuser:
-                groups = {STAFF_GROUP_NAME}
-            else:
-                groups = {REVIEWER_GROUP_NAME}
-
-        group = Group.objects.get(name=groups.pop())
+        group = Group.objects.get(name=review_group_name(reviewer))
 
         return self.get_or_create(
             submission=submission,
@@ -909,30 +1098,57 @@ class AssignedReviewersQuerySet(models.QuerySet):
             type=Group.objects.get(name=STAFF_GROUP_NAME),
         )
 
+    def _bulk_assign(self, assignments, submissions):
+        if not assignments:
+            return
+        # Existing assignments are left as they are
+        self.bulk_create(assignments, batch_size=1000, ignore_conflicts=True)
+        reviewers_assigned.send(sender=self.model, submissions=[submission.id for submission in submissions])
+
+    def bulk_assign(self, submissions, reviewers):
+        """
+        Assign each reviewer to each of the submissions, as the review type
+        their groups give them. The groups of all the reviewers are loaded
+        in a single query.
+        """
+        submissions = list(submissions)
+        if not isinstance(reviewers, models.QuerySet):
+            reviewers = [reviewer.id for reviewer in reviewers]
+        User = get_user_model()
+        reviewers = User.objects.filter(id__in=reviewers).with_roles()
+        groups = {group.name: group for group in Group.objects.filter(name__in=REVIEW_GROUPS)}
+        types = {reviewer: groups[review_group_name(reviewer)] for reviewer in reviewers}
+
+        self._bulk_assign([
+            self.model(submission=submission, reviewer=reviewer, type=group)
+            for submission in submissions
+            for reviewer, group in types.items()
+        ], submissions)
+
     def bulk_create_reviewers(self, reviewers, submission):
         group = Group.objects.get(name=REVIEWER_GROUP_NAME)
-        self.bulk_create(
+        self._bulk_assign([
             self.model(
                 submission=submission,
                 role=None,
                 reviewer=reviewer,
                 type=group,
             ) for reviewer in reviewers
-        )
+        ], [submission])
 
     def update_role(self, role, reviewer, *submissions):
         # Remove role who didn't review
         self.filter(submission__in=submissions, role=role).never_tried_to_review().delete()
         # Anyone else we remove their role
         self.filter(submission__in=submissions, role=role).update(role=None)
-        # Create/update the new role reviewers
+        # Update the existing reviewers and create the new role reviewers
         group = Group.objects.get(name=STAFF_GROUP_NAME)
-        for submission in submissions:
-            self.update_or_create(
-                submission=submission,
-                reviewer=reviewer,
-                defaults={'role': role, 'type': group},
-            )
+        self.filter(submission__in=submissions, reviewer=reviewer).update(role=role, type=group)
+        # The signal also covers the roles changed by the updates
+        self._bulk_assign([
+            self.model(submission=submission, reviewer=reviewer, role=role, type=group)
+            for submission in submissions
+        ], submissions)
 
 
 class AssignedReviewers(models.Model):
@@ -1,6 +1,13 @@
+import json
+
 from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import F, Q, QuerySet
+from django.db.models.expressions import OrderBy
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.utils.translation import gettext as _
 
+from django_tables2.rows import BoundRows
+
 # https://django-tables2.readthedocs.io/en/latest/pages/api-reference.html#django_tables2.paginators.LazyPaginator
 
 # REMOVE IN django_tables2 2.0
@@ -111,3 +118,251 @@ class LazyPaginator(Paginator):
         raise NotImplementedError
 
     page_range = property(_get_page_range)
+
+
+def encode_cursor(data):
+    cursor = json.dumps(data, default=lambda value: value.isoformat())
+    return urlsafe_base64_encode(cursor.encode())
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(urlsafe_base64_decode(cursor).decode())
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise PageNotAnInteger(_("That page cursor is not valid"))
+
+
+class KeysetColumn:
+    def __init__(self, name, descending=False, nulls_last=None):
+        self.name = name
+        self.descending = descending
+        # Match the postgres default of NULL being larger than any other value
+        self.nulls_last = (not descending) if nulls_last is None else nulls_last
+
+    def __str__(self):
+        return ('-' if self.descending else '') + self.name
+
+    def reverse(self):
+        return KeysetColumn(self.name, not self.descending, not self.nulls_last)
+
+    def order_by(self):
+        # Only state the NULL ordering if it differs from the default so the
+        # query can make use of the standard indexes
+        if self.nulls_last == (not self.descending):
+            nulls = {}
+        elif self.nulls_last:
+            nulls = {'nulls_last': True}
+        else:
+            nulls = {'nulls_first': True}
+        return OrderBy(F(self.name), descending=self.descending, **nulls)
+
+    def equal(self, value):
+        if value is None:
+            return Q(**{f'{self.name}__isnull': True})
+        return Q(**{self.name: value})
+
+    def after(self, value):
+        if value is None:
+            if self.nulls_last:
+                return Q(pk__in=[])
+            return Q(**{f'{self.name}__isnull': False})
+
+        lookup = 'lt' if self.descending else 'gt'
+        after = Q(**{f'{self.name}__{lookup}': value})
+        if self.nulls_last:
+            after |= Q(**{f'{self.name}__isnull': True})
+        return after
+
+
+class KeysetOrdering:
+    """
+    The ordering of a queryset expressed as columns which can be used to
+    filter for the rows which follow a given row.
+
+    Always ends with the id so that every row has a unique position.
+    """
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def from_queryset(cls, queryset, fields):
+        """
+        Returns None when the queryset is ordered by anything other than the
+        given fields as these can't be paginated by keyset.
+        """
+        query = queryset.query
+        ordering = query.order_by or (query.default_ordering and queryset.model._meta.ordering) or []
+
+        columns = []
+        for item in ordering:
+            if isinstance(item, str):
+                column = KeysetColumn(item.lstrip('-'), descending=item.startswith('-'))
+            elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+                nulls_last = True if item.nulls_last else False if item.nulls_first else None
+                column = KeysetColumn(item.expression.name, descending=item.descending, nulls_last=nulls_last)
+            elif isinstance(item, F):
+                column = KeysetColumn(item.name)
+            else:
+                return None
+
+            if column.name == 'pk':
+                column.name = 'id'
+
+            if column.name not in fields:
+                return None
+
+            if column.name not in [existing.name for existing in columns]:
+                columns.append(column)
+
+            if column.name == 'id':
+                break
+        else:
+            columns.append(KeysetColumn('id'))
+
+        return cls(columns)
+
+    @property
+    def key(self):
+        return ','.join(str(column) for column in self.columns)
+
+    def reverse(self):
+        return KeysetOrdering([column.reverse() for column in self.columns])
+
+    def order(self, queryset):
+        return queryset.order_by(*[column.order_by() for column in self.columns])
+
+    def values(self, obj):
+        return [getattr(obj, column.name) for column in self.columns]
+
+    def filter_after(self, queryset, values):
+        # (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+        after = Q(pk__in=[])
+        equal = Q()
+        for column, value in zip(self.columns, values):
+            after |= equal & column.after(value)
+            equal &= column.equal(value)
+        return queryset.filter(after)
+
+
+class KeysetPage(Page):
+    def __init__(self, object_list, number, paginator, next_cursor=None, previous_cursor=None):
+        super().__init__(object_list, number, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return bool(self.next_cursor)
+
+    def has_previous(self):
+        return bool(self.previous_cursor)
+
+    def next_page_number(self):
+        return self.next_cursor
+
+    def previous_page_number(self):
+        return self.previous_cursor
+
+
+class KeysetPaginator(LazyPaginator):
+    """
+    Paginate by filtering for the rows after the last row of the previous
+    page, rather than using an OFFSET. Each page costs the same to load
+    however deep into the results it is.
+
+    Pages are identified by an opaque cursor, the page number is ignored.
+    If the data is ordered by something other than ``keyset_fields`` this
+    falls back to the LazyPaginator behaviour.
+
+    Usage with `~.SingleTableView`::
+
+        def get_table_pagination(self, table):
+            return {
+                'klass': KeysetPaginator,
+                'cursor': self.request.GET.get(table.prefixed_page_field),
+            }
+    """
+
+    keyset_fields = ('submit_time', 'last_update', 'id')
+
+    def __init__(self, object_list, per_page, cursor=None, keyset_fields=None, **kwargs):
+        self.cursor = cursor
+        if keyset_fields is not None:
+            self.keyset_fields = keyset_fields
+
+        super().__init__(object_list, per_page, **kwargs)
+
+        self.ordering = None
+        if isinstance(self.queryset, QuerySet):
+            self.ordering = KeysetOrdering.from_queryset(self.queryset, self.keyset_fields)
+
+    @property
+    def queryset(self):
+        # django_tables2 provides the BoundRows for the table
+        if isinstance(self.object_list, BoundRows):
+            return self.object_list.data.data
+        return self.object_list
+
+    def page(self, number):
+        if not self.ordering:
+            return super().page(number)
+
+        try:
+            position = decode_cursor(self.cursor) if self.cursor else {}
+        except PageNotAnInteger:
+            position = {}
+
+        if position.get('ordering') != self.ordering.key:
+            # The ordering has changed since the cursor was created
+            position = {}
+
+        objects, number, next_cursor, previous_cursor = self.keyset_page(position)
+        if not objects and position:
+            # The rows around the cursor have gone, start again from the top
+            objects, number, next_cursor, previous_cursor = self.keyset_page({})
+
+        self._num_pages = number + 1 if next_cursor else number
+
+        if isinstance(self.object_list, BoundRows):
+            objects = BoundRows(objects, self.object_list.table, self.object_list.pinned_data)
+
+        return KeysetPage(objects, number, self, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+    def keyset_page(self, position):
+        number = position.get('number', 1)
+        reverse = position.get('reverse', False)
+        ordering = self.ordering.reverse() if reverse else self.ordering
+
+        queryset = ordering.order(self.queryset)
+        if 'values' in position:
+            queryset = ordering.filter_after(queryset, position['values'])
+
+        # Retrieve one more object to check if there is another page
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+
+        if reverse:
+            objects.reverse()
+            has_next = True
+            has_previous = has_more
+        else:
+            has_next = has_more
+            has_previous = number > 1
+
+        next_cursor = None
+        if has_next and objects:
+            next_cursor = self.make_cursor(objects[-1], number + 1)
+
+        previous_cursor = None
+        if has_previous and objects:
+            previous_cursor = self.make_cursor(objects[0], number - 1, reverse=True)
+
+        return objects, number, next_cursor, previous_cursor
+
+    def make_cursor(self, obj, number, reverse=False):
+        return encode_cursor({
+            'ordering': self.ordering.key,
+            'number': number,
+            'reverse': reverse,
+            'values': self.ordering.values(obj),
+        })
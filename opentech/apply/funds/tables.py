@@ -2,8 +2,7 @@ import json
 import textwrap
 
 from django import forms
-from django.contrib.auth import get_user_model
-from django.db.models import F, Q
+from django.db.models import F
 from django.utils.html import format_html
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
@@ -13,15 +12,13 @@ import django_filters as filters
 import django_tables2 as tables
 from django_tables2.utils import A
 
-from wagtail.core.models import Page
-
-from opentech.apply.funds.models import ApplicationSubmission, Round, ScreeningStatus
+from opentech.apply.funds.models import ApplicationSubmission
 from opentech.apply.funds.workflow import STATUSES, get_review_active_statuses
-from opentech.apply.users.groups import STAFF_GROUP_NAME
 from opentech.apply.utils.image import generate_image_tag
 from opentech.images.models import CustomImage
 
-from .widgets import Select2MultiCheckboxesWidget
+from .filter_choices import FILTER_CHOICES
+from .widgets import CachedChoicesSelect2Widget, Select2MultiCheckboxesWidget
 
 
 def review_filter_for_user(user):
@@ -164,28 +161,23 @@ class SummarySubmissionsTableWithRole(BaseAdminSubmissionsTable):
 
 
 def get_used_rounds(request):
-    return Round.objects.filter(submissions__isnull=False).distinct()
+    return FILTER_CHOICES['rounds'].queryset()
 
 
 def get_used_funds(request):
-    # Use page to pick up on both Labs and Funds
-    return Page.objects.filter(applicationsubmission__isnull=False).distinct()
+    return FILTER_CHOICES['funds'].queryset()
 
 
 def get_round_leads(request):
-    User = get_user_model()
-    return User.objects.filter(submission_lead__isnull=False).distinct()
+    return FILTER_CHOICES['leads'].queryset()
 
 
 def get_reviewers(request):
-    """ All assigned reviewers, staff or admin """
-    User = get_user_model()
-    return User.objects.filter(Q(submissions_reviewer__isnull=False) | Q(groups__name=STAFF_GROUP_NAME) | Q(is_superuser=True)).distinct()
+    return FILTER_CHOICES['reviewers'].queryset()
 
 
 def get_screening_statuses(request):
-    return ScreeningStatus.objects.filter(
-        id__in=ApplicationSubmission.objects.all().values('screening_status__id').distinct('screening_status__id'))
+    return FILTER_CHOICES['screening_statuses'].queryset()
 
 
 class Select2CheckboxWidgetMixin(filters.Filter):
@@ -203,6 +195,18 @@ class Select2ModelMultipleChoiceFilter(Select2MultipleChoiceFilter, filters.Mode
     pass
 
 
+class CachedChoicesFilter(Select2ModelMultipleChoiceFilter):
+    """Select from the cached choices of FILTER_CHOICES"""
+    def __init__(self, choices, *args, **kwargs):
+        filter_choices = FILTER_CHOICES[choices]
+        kwargs['queryset'] = lambda request: filter_choices.queryset()
+        kwargs.setdefault('widget', CachedChoicesSelect2Widget(
+            filter_choices=filter_choices,
+            attrs={'data-placeholder': kwargs.get('label')},
+        ))
+        super().__init__(*args, **kwargs)
+
+
 class StatusMultipleChoiceFilter(Select2MultipleChoiceFilter):
     def __init__(self, limit_to, *args, **kwargs):
         choices = [
@@ -230,11 +234,11 @@ class StatusMultipleChoiceFilter(Select2MultipleChoiceFilter):
 
 
 class SubmissionFilter(filters.FilterSet):
-    round = Select2ModelMultipleChoiceFilter(queryset=get_used_rounds, label='Rounds')
-    fund = Select2ModelMultipleChoiceFilter(field_name='page', queryset=get_used_funds, label='Funds')
-    lead = Select2ModelMultipleChoiceFilter(queryset=get_round_leads, label='Leads')
-    reviewers = Select2ModelMultipleChoiceFilter(queryset=get_reviewers, label='Reviewers')
-    screening_status = Select2ModelMultipleChoiceFilter(queryset=get_screening_statuses, label='Screening')
+    round = CachedChoicesFilter('rounds', label='Rounds')
+    fund = CachedChoicesFilter('funds', field_name='page', label='Funds')
+    lead = CachedChoicesFilter('leads', label='Leads')
+    reviewers = CachedChoicesFilter('reviewers', label='Reviewers')
+    screening_status = CachedChoicesFilter('screening_statuses', label='Screening')
 
     class Meta:
         model = ApplicationSubmission
@@ -252,13 +256,21 @@ class SubmissionFilter(filters.FilterSet):
         }
 
 
+class SearchFilter(filters.CharFilter):
+    """Full text search of the submissions, ordered by how well they match"""
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return qs.search(value)
+
+
 class SubmissionFilterAndSearch(SubmissionFilter):
-    query = filters.CharFilter(field_name='search_data', lookup_expr="icontains", widget=forms.HiddenInput)
+    query = SearchFilter(widget=forms.HiddenInput)
 
 
 class SubmissionDashboardFilter(filters.FilterSet):
-    round = Select2ModelMultipleChoiceFilter(queryset=get_used_rounds, label='Rounds')
-    fund = Select2ModelMultipleChoiceFilter(field_name='page', queryset=get_used_funds, label='Funds')
+    round = CachedChoicesFilter('rounds', label='Rounds')
+    fund = CachedChoicesFilter('funds', field_name='page', label='Funds')
 
     class Meta:
         model = ApplicationSubmission
@@ -275,12 +287,12 @@ class SubmissionDashboardFilter(filters.FilterSet):
 
 
 class SubmissionReviewerFilterAndSearch(SubmissionDashboardFilter):
-    query = filters.CharFilter(field_name='search_data', lookup_expr="icontains", widget=forms.HiddenInput)
+    query = SearchFilter(widget=forms.HiddenInput)
 
 
 class RoundsTable(tables.Table):
     title = tables.LinkColumn('funds:rounds:detail', args=[A('pk')], orderable=True, text=lambda record: record.title)
-    fund = tables.Column(accessor=A('specific.fund'))
+    fund = tables.Column()
     lead = tables.Column()
     start_date = tables.Column()
     end_date = tables.Column()
@@ -351,7 +363,7 @@ class OpenRoundFilter(Select2MultipleChoiceFilter):
 
 
 class RoundsFilter(filters.FilterSet):
-    fund = Select2ModelMultipleChoiceFilter(queryset=get_used_funds, label='Funds')
-    lead = Select2ModelMultipleChoiceFilter(queryset=get_round_leads, label='Leads')
+    fund = CachedChoicesFilter('funds', label='Funds')
+    lead = CachedChoicesFilter('leads', label='Leads')
     active = ActiveRoundFilter(label='Active')
     round_state = OpenRoundFilter(label='Open')
@@ -0,0 +1,16 @@
+from django.core.cache import cache
+
+from opentech.apply.activity.tasks import app
+
+
+@app.task
+def render_submission_pdf(submission_id):
+    from .exports import render_key, store_pdf
+    from .models import ApplicationSubmission
+    submission = ApplicationSubmission.objects.select_related('round', 'page', 'lead').get(id=submission_id)
+    try:
+        store_pdf(submission).close()
+    except Exception:
+        # Let the next download queue the render again
+        cache.delete(render_key(submission))
+        raise
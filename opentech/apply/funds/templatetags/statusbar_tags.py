@@ -1,13 +1,14 @@
 from django import template
+from django.template.loader import render_to_string
 
 register = template.Library()
 
+# The rendered status bars by workflow, phase and role
+STATUS_BARS = {}
 
-@register.inclusion_tag('funds/includes/status_bar.html')
-def status_bar(workflow, current_phase, user, author=False, css_class='', same_stage=False):
 
+def status_bar_context(workflow, current_phase, user, is_applicant, public, css_class='', same_stage=False):
     phases = workflow.phases_for(user)
-    is_applicant = user == author if author else user.is_applicant
 
     if same_stage and not is_applicant:
         phases = [
@@ -33,10 +34,29 @@ def status_bar(workflow, current_phase, user, author=False, css_class='', same_s
         'phases': phases,
         'current_phase': current_phase,
         'class': css_class,
-        'public': user.is_applicant or user.is_partner,
+        'public': public,
     }
 
 
+@register.simple_tag()
+def status_bar(workflow, current_phase, user, author=False, css_class='', same_stage=False):
+    is_applicant = user == author if author else user.is_applicant
+    public = user.is_applicant or user.is_partner
+
+    # Workflows are fixed, the bar is the same for every user who passes the
+    # same view permissions
+    key = (
+        workflow.admin_name, current_phase.name, workflow.lookup.role(user),
+        is_applicant, public, css_class, same_stage,
+    )
+    try:
+        return STATUS_BARS[key]
+    except KeyError:
+        context = status_bar_context(workflow, current_phase, user, is_applicant, public, css_class, same_stage)
+        STATUS_BARS[key] = render_to_string('funds/includes/status_bar.html', context)
+        return STATUS_BARS[key]
+
+
 @register.simple_tag()
 def status_display(current_phase, phase, public):
     if phase.step == current_phase.step:
@@ -1,10 +1,15 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-from opentech.apply.funds.models import RoundsAndLabs
+from opentech.apply.funds.models import RoundProgress, RoundsAndLabs
+from opentech.apply.users.tests.factories import StaffFactory
 
 from opentech.apply.funds.tests.factories import (
     ApplicationSubmissionFactory,
     FundTypeFactory,
+    InvitedToProposalFactory,
     LabFactory,
     LabSubmissionFactory,
     RoundFactory,
@@ -148,3 +153,45 @@ class TestRoundsAndLabsManager(TestCase):
 
         self.assertEqual(fetched_round.progress, 0)
         self.assertEqual(fetched_lab.progress, 50)
+
+
+class TestRoundProgress(TestCase):
+    def progress(self, page):
+        return RoundsAndLabs.objects.with_progress().get(pk=page.pk)
+
+    def test_counts_without_submission_subqueries(self):
+        query = str(RoundsAndLabs.objects.with_progress().query)
+        self.assertNotIn('funds_applicationsubmission', query)
+
+    def test_status_change_updates_counts(self):
+        submission = ApplicationSubmissionFactory()
+        submission.perform_transition('rejected', StaffFactory())
+        fetched = self.progress(submission.round)
+        self.assertEqual(fetched.total_submissions, 1)
+        self.assertEqual(fetched.closed_submissions, 1)
+
+    def test_delete_updates_counts(self):
+        first, second = ApplicationSubmissionFactory.create_batch(2, round=RoundFactory())
+        first.delete()
+        self.assertEqual(self.progress(second.round).total_submissions, 1)
+
+    def test_progressed_submission_counted_once(self):
+        proposal = InvitedToProposalFactory()
+        fetched = self.progress(proposal.round)
+        self.assertEqual(fetched.total_submissions, 1)
+        self.assertEqual(fetched.closed_submissions, 0)
+
+    def test_reconcile_repairs_drift(self):
+        lab = LabFactory()
+        LabSubmissionFactory(page=lab, rejected=True)
+        round = RoundFactory()
+        ApplicationSubmissionFactory.create_batch(2, round=round)
+        RoundProgress.objects.filter(page=lab).update(closed_submissions=0)
+        RoundProgress.objects.filter(page=round).delete()
+
+        out = StringIO()
+        call_command('reconcile_round_progress', stdout=out)
+
+        self.assertIn('Repaired the progress of 2 rounds and labs.', out.getvalue())
+        self.assertEqual(self.progress(lab).progress, 100)
+        self.assertEqual(self.progress(round).total_submissions, 2)
@@ -0,0 +1,81 @@
+from difflib import SequenceMatcher
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from opentech.apply.funds.differ import compare
+
+
+def long_answer(paragraphs=2000):
+    return ''.join(
+        '<p>Paragraph {} of a very long answer &amp; some more words.</p>'.format(i)
+        for i in range(paragraphs)
+    )
+
+
+class TestCompare(SimpleTestCase):
+    def test_unchanged(self):
+        from_display, to_display = compare('<p>Same answer</p>', '<p>Same answer</p>')
+        self.assertEqual(from_display, 'Same answer')
+        self.assertEqual(to_display, 'Same answer')
+        self.assertNotIn('diff__', from_display)
+
+    def test_word_changed(self):
+        from_display, to_display = compare('The quick fox', 'The slow fox')
+        self.assertEqual(from_display, 'The <span class="diff diff__deleted">quick</span> fox')
+        self.assertEqual(to_display, 'The <span class="diff diff__added">slow</span> fox')
+
+    def test_words_added_and_removed(self):
+        from_display, to_display = compare('one two three', 'one three', should_bleach=False)
+        self.assertEqual(from_display, 'one <span class="diff diff__deleted">two </span>three')
+        self.assertEqual(to_display, 'one three')
+
+        from_display, to_display = compare('one three', 'one three four', should_bleach=False)
+        self.assertEqual(from_display, 'one three')
+        self.assertEqual(to_display, 'one three<span class="diff diff__added"> four</span>')
+
+    def test_entities_not_split(self):
+        from_display, to_display = compare('this &amp; that', 'this &lt; that', should_bleach=False)
+        self.assertIn('<span class="diff diff__deleted">&amp;</span>', from_display)
+        self.assertIn('<span class="diff diff__added">&lt;</span>', to_display)
+
+
+class TestCompareLargeAnswers(SimpleTestCase):
+    """
+    Work done diffing long rich text answers, measured as the number of
+    tokens given to the matcher rather than by timing.
+    """
+    def compare_counting(self, answer_a, answer_b):
+        sizes = []
+
+        def matcher(isjunk, a, b, **kwargs):
+            sizes.append(len(a) + len(b))
+            return SequenceMatcher(isjunk, a, b, **kwargs)
+
+        with patch('opentech.apply.funds.differ.SequenceMatcher', side_effect=matcher):
+            result = compare(answer_a, answer_b)
+        return result, sizes
+
+    def test_unchanged_answer_not_diffed(self):
+        answer = long_answer()
+        (from_display, to_display), sizes = self.compare_counting(answer, answer)
+        self.assertEqual(sizes, [])
+        self.assertEqual(from_display, to_display)
+
+    def test_small_edit_only_diffs_the_change(self):
+        answer = long_answer()
+        edited = answer.replace('Paragraph 1000 of', 'Paragraph 1000 from', 1)
+        (from_display, to_display), sizes = self.compare_counting(answer, edited)
+        self.assertEqual(sizes, [2])
+        self.assertEqual(from_display.count('diff__deleted'), 1)
+        self.assertIn('<span class="diff diff__deleted">of</span>', from_display)
+        self.assertIn('<span class="diff diff__added">from</span>', to_display)
+
+    def test_scattered_edits_diff_tokens(self):
+        answer = long_answer(500)
+        edited = answer.replace('Paragraph 0 ', 'Section 0 ').replace('Paragraph 499 ', 'Section 499 ')
+        (from_display, to_display), sizes = self.compare_counting(answer, edited)
+        # Far fewer tokens than characters are compared
+        self.assertLess(sizes[0], len(answer))
+        self.assertEqual(from_display.count('diff__deleted'), 2)
+        self.assertEqual(to_display.count('diff__added'), 2)
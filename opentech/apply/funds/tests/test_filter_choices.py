@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from opentech.apply.users.tests.factories import ApplicantFactory, ReviewerFactory, StaffFactory
+from opentech.apply.utils.testing.tests import BaseViewTestCase
+
+from ..filter_choices import FILTER_CHOICES
+from ..models import ApplicationSubmission
+from ..tables import SubmissionFilter
+from .factories import ApplicationSubmissionFactory, AssignedReviewersFactory, RoundFactory, ScreeningStatusFactory
+
+
+@patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+class TestFilterChoices(TestCase):
+    def test_choices_cached(self, on_commit):
+        submission = ApplicationSubmissionFactory()
+        rounds = FILTER_CHOICES['rounds']
+        self.assertEqual(rounds.choices(), [(submission.round.id, submission.round.title)])
+        with self.assertNumQueries(1):
+            self.assertEqual(rounds.choices(), [(submission.round.id, submission.round.title)])
+
+    def test_new_submission_invalidates(self, on_commit):
+        first = ApplicationSubmissionFactory()
+        FILTER_CHOICES['rounds'].choices()
+        second = ApplicationSubmissionFactory()
+        self.assertEqual(
+            {pk for pk, _ in FILTER_CHOICES['rounds'].choices()},
+            {first.round.id, second.round.id},
+        )
+
+    def test_renamed_round_invalidates(self, on_commit):
+        submission = ApplicationSubmissionFactory()
+        FILTER_CHOICES['rounds'].choices()
+        round = submission.round
+        round.title = 'Renamed round'
+        round.save()
+        self.assertEqual(FILTER_CHOICES['rounds'].choices(), [(round.id, 'Renamed round')])
+
+    def test_screening_status_invalidates(self, on_commit):
+        submission = ApplicationSubmissionFactory()
+        FILTER_CHOICES['screening_statuses'].choices()
+        status = ScreeningStatusFactory()
+        submission.screening_status = status
+        submission.save()
+        self.assertIn((status.id, status.title), FILTER_CHOICES['screening_statuses'].choices())
+
+    def test_assignment_invalidates_reviewers(self, on_commit):
+        submission = ApplicationSubmissionFactory()
+        FILTER_CHOICES['reviewers'].choices()
+        reviewer = ReviewerFactory()
+        AssignedReviewersFactory(submission=submission, reviewer=reviewer)
+        self.assertIn((reviewer.id, str(reviewer)), FILTER_CHOICES['reviewers'].choices())
+
+    def test_new_staff_invalidates_reviewers(self, on_commit):
+        FILTER_CHOICES['reviewers'].choices()
+        staff = StaffFactory()
+        self.assertIn((staff.id, str(staff)), FILTER_CHOICES['reviewers'].choices())
+
+    def test_change_not_committed_keeps_choices(self, on_commit):
+        ApplicationSubmissionFactory()
+        choices = FILTER_CHOICES['rounds'].choices()
+        on_commit.side_effect = None
+        ApplicationSubmissionFactory()
+        self.assertEqual(FILTER_CHOICES['rounds'].choices(), choices)
+
+
+@override_settings(ROOT_URLCONF='opentech.apply.urls')
+class TestSubmissionFilterChoices(TestCase):
+    def render(self, data=None):
+        filterset = SubmissionFilter(data, queryset=ApplicationSubmission.objects.all())
+        return str(filterset.form['round']), filterset
+
+    def test_cached_choices_rendered(self):
+        submission = ApplicationSubmissionFactory()
+        FILTER_CHOICES['rounds'].choices()
+        with self.assertNumQueries(1):
+            html, _ = self.render()
+        self.assertIn(submission.round.title, html)
+        self.assertNotIn('data-choices-url', html)
+
+    def test_uncached_choices_loaded_later(self):
+        selected, other = ApplicationSubmissionFactory.create_batch(2)
+        html, _ = self.render({'round': [selected.round.id]})
+        self.assertIn(selected.round.title, html)
+        self.assertNotIn(other.round.title, html)
+        self.assertIn('data-choices-url="/apply/submissions/all/filters/rounds/"', html)
+
+    def test_filters_by_choice(self):
+        selected, other = ApplicationSubmissionFactory.create_batch(2)
+        _, filterset = self.render({'round': [selected.round.id]})
+        self.assertEqual(list(filterset.qs), [selected])
+
+    def test_unused_round_not_valid(self):
+        ApplicationSubmissionFactory()
+        _, filterset = self.render({'round': [RoundFactory().id]})
+        self.assertFalse(filterset.is_valid())
+
+
+class TestSubmissionFilterChoicesView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'filter_choices'
+    user_factory = StaffFactory
+
+    def get_kwargs(self, instance):
+        return {'name': instance}
+
+    def test_choices(self):
+        submission = ApplicationSubmissionFactory()
+        response = self.client.get(self.url('leads'), secure=True)
+        self.assertEqual(response.json(), {
+            'results': [{'id': submission.lead.id, 'text': str(submission.lead)}],
+        })
+
+    def test_unknown_choices(self):
+        response = self.client.get(self.url('secret'), secure=True)
+        self.assertEqual(response.status_code, 404)
+
+
+class TestApplicantSubmissionFilterChoicesView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'filter_choices'
+    user_factory = ApplicantFactory
+
+    def get_kwargs(self, instance):
+        return {'name': instance}
+
+    def test_staff_choices_hidden(self):
+        ApplicationSubmissionFactory()
+        response = self.client.get(self.url('rounds'), secure=True)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url('leads'), secure=True)
+        self.assertEqual(response.status_code, 403)
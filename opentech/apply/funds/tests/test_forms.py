@@ -65,17 +65,15 @@ class TestReviewerFormQueries(TestCase):
         self.assertTrue(form.is_valid())
 
         # 1 - Submission
-        # 24 - 12 per role =
+        # 16 - 8 per role =
         #    1 - delete role no review
         #    1 - select review
         #    2 - cascades
         #    1 - update role with review
         #    1 - auth group
-        #    2 - savepoint
-        #    1 - get
-        #    1 - update
-        #    2 - release savepoint
-        with self.assertNumQueries(25):
+        #    1 - update existing
+        #    1 - insert new
+        with self.assertNumQueries(17):
             form.save()
 
     def test_queries_reviewers_swap(self):
@@ -1,22 +1,36 @@
+import csv
 from datetime import date, timedelta
+from io import StringIO
 import itertools
 import os
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.conf import settings
 from django.core import mail
-from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from opentech.apply.funds.models import ApplicationSubmission
+from opentech.apply.activity.models import ALL, COMMENT, Activity
+from opentech.apply.activity.tests.factories import CommentFactory
+from opentech.apply.funds.models import ApplicationSubmission, AssignedReviewers, RoundsAndLabs, SubmissionStats
 from opentech.apply.funds.blocks import EmailBlock, FullNameBlock
-from opentech.apply.funds.workflow import Request
+from opentech.apply.funds.files import SubmissionStreamFieldFile
+from opentech.apply.funds.management.commands.backfill_file_metadata import files_without_metadata
+from opentech.apply.funds.workflow import ConceptProposal, Request
 from opentech.apply.review.tests.factories import ReviewFactory, ReviewOpinionFactory
 from opentech.apply.review.options import NO, MAYBE
+from opentech.apply.stream_forms.blocks import UploadableMediaBlock
+from opentech.apply.stream_forms.models import form_definitions
 from opentech.apply.utils.testing import make_request
-from opentech.apply.users.tests.factories import StaffFactory
+from opentech.apply.users.groups import REVIEWER_GROUP_NAME, STAFF_GROUP_NAME
+from opentech.apply.users.tests.factories import GroupFactory, ReviewerFactory, StaffFactory
 
 from .factories import (
     ApplicationSubmissionFactory,
@@ -25,7 +39,9 @@ from .factories import (
     FundTypeFactory,
     InvitedToProposalFactory,
     LabFactory,
+    LabSubmissionFactory,
     RequestForPartnersFactory,
+    ReviewerRoleFactory,
     RoundFactory,
     TodayRoundFactory,
 )
@@ -655,3 +671,432 @@ class TestForTableQueryset(TestCase):
         self.assertEqual(submission.review_count, 1)
         self.assertEqual(submission.review_submitted_count, 1)
         self.assertEqual(submission.review_recommendation, NO)
+
+
+@override_settings(SUBMISSION_STATS_ENABLED=True)
+class TestForTableQuerysetWithStats(TestForTableQueryset):
+    pass
+
+
+@override_settings(SUBMISSION_STATS_ENABLED=True)
+class TestSubmissionStats(TestCase):
+    def test_stats_created_with_submission(self):
+        submission = ApplicationSubmissionFactory()
+        self.assertTrue(SubmissionStats.objects.filter(submission=submission).exists())
+
+    def test_comment_counts_respect_visibility(self):
+        staff = StaffFactory()
+        submission = ApplicationSubmissionFactory()
+        CommentFactory(source=submission, internal=True)
+        CommentFactory(source=submission, visibility=ALL)
+
+        staff_submission = ApplicationSubmission.objects.for_table(staff, use_stats=True).get()
+        self.assertEqual(staff_submission.comment_count, 2)
+
+        applicant_submission = ApplicationSubmission.objects.for_table(submission.user, use_stats=True).get()
+        self.assertEqual(applicant_submission.comment_count, 1)
+
+    def test_review_delete_updates_stats(self):
+        submission = ApplicationSubmissionFactory()
+        review = ReviewFactory(submission=submission)
+        review.delete()
+        stats = SubmissionStats.objects.get(submission=submission)
+        self.assertEqual(stats.review_submitted_count, None)
+        self.assertEqual(stats.review_count, 1)
+
+    def test_rebuild_command_matches_subqueries(self):
+        staff = StaffFactory()
+        submission = ApplicationSubmissionFactory()
+        review = ReviewFactory(submission=submission)
+        ReviewOpinionFactory(opinion_disagree=True, review=review)
+        SubmissionStats.objects.all().delete()
+
+        call_command('rebuild_submission_stats', stdout=StringIO())
+
+        expected = ApplicationSubmission.objects.for_table(staff, use_stats=False).get()
+        actual = ApplicationSubmission.objects.for_table(staff, use_stats=True).get()
+        for field in ['last_update', 'comment_count', 'opinion_disagree', 'review_count', 'review_submitted_count', 'review_recommendation']:
+            self.assertEqual(getattr(expected, field), getattr(actual, field))
+
+
+class TestFormDataLoading(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.submission = ApplicationSubmissionFactory()
+
+    def get_file_field_id(self, submission):
+        return next(
+            field.id for field in submission.form_fields
+            if isinstance(field.block, UploadableMediaBlock)
+        )
+
+    def test_definition_shared_between_loads(self):
+        first, second = [ApplicationSubmission.objects.get(id=self.submission.id) for _ in range(2)]
+        self.assertIs(first.form_definition, second.form_definition)
+        self.assertIs(first.named_blocks, second.named_blocks)
+
+    def test_definition_follows_form_fields(self):
+        submission = ApplicationSubmission.objects.get(id=self.submission.id)
+        definition = submission.form_definition
+        submission.form_fields = ApplicationSubmissionFactory().form_fields
+        self.assertIsNot(submission.form_definition, definition)
+
+    def test_files_decoded_on_access(self):
+        submission = ApplicationSubmission.objects.get(id=self.submission.id)
+        field_id = self.get_file_field_id(submission)
+        self.assertIsInstance(dict.__getitem__(submission.form_data, field_id), dict)
+        self.assertIsInstance(submission.data(field_id), SubmissionStreamFieldFile)
+        self.assertIsInstance(dict.__getitem__(submission.form_data, field_id), SubmissionStreamFieldFile)
+
+    def test_decoded_data_matches(self):
+        submission = ApplicationSubmission.objects.get(id=self.submission.id)
+        self.assertEqual(dict(submission.form_data.items()), submission.form_data)
+        self.assertEqual(submission.raw_data[self.get_file_field_id(submission)], submission.data(self.get_file_field_id(submission)))
+        self.assertEqual(submission.data('title'), self.submission.title)
+
+    def test_loading_many_submissions(self):
+        # Micro benchmark replaying the row as if 1,000 submissions were loaded
+        field_names = [field.attname for field in ApplicationSubmission._meta.concrete_fields]
+        values = ApplicationSubmission.objects.filter(id=self.submission.id).values_list(*field_names).get()
+        form_definitions.definitions.clear()
+
+        with self.assertNumQueries(0):
+            submissions = [ApplicationSubmission.from_db('default', field_names, values) for _ in range(1000)]
+            for submission in submissions:
+                submission.named_blocks
+
+        self.assertEqual(len(form_definitions.definitions), 1)
+        # Nothing has been decoded yet
+        self.assertTrue(all(submission.form_data.decoders for submission in submissions))
+
+
+class TestFileMetadata(TestCase):
+    def get_file_field_id(self, submission):
+        return next(
+            field.id for field in submission.form_fields
+            if isinstance(field.block, UploadableMediaBlock)
+        )
+
+    def stored_files(self, submission):
+        value = ApplicationSubmission.objects.values_list('form_data', flat=True).get(id=submission.id)[
+            self.get_file_field_id(submission)
+        ]
+        return value if isinstance(value, list) else [value]
+
+    def test_metadata_stored_on_upload(self):
+        submission = ApplicationSubmissionFactory()
+        for stored in self.stored_files(submission):
+            self.assertIn('size', stored)
+            self.assertIn('content_type', stored)
+            self.assertEqual(len(stored['checksum']), 64)
+
+    def test_size_not_read_from_storage(self):
+        submission = ApplicationSubmissionFactory()
+        submission = ApplicationSubmission.objects.get(id=submission.id)
+        file = submission.data(self.get_file_field_id(submission))
+        if isinstance(file, list):
+            file = file[0]
+        with patch.object(file.storage, 'size') as size, patch.object(file.storage, 'open') as open_file:
+            self.assertEqual(file.size, self.stored_files(submission)[0]['size'])
+        size.assert_not_called()
+        open_file.assert_not_called()
+
+    def remove_metadata(self, submission):
+        form_data = ApplicationSubmission.objects.values_list('form_data', flat=True).get(id=submission.id)
+        value = form_data[self.get_file_field_id(submission)]
+        for stored in value if isinstance(value, list) else [value]:
+            for key in ['size', 'content_type', 'checksum']:
+                del stored[key]
+        ApplicationSubmission.objects.filter(id=submission.id).update(form_data=form_data)
+
+    def test_backfill_command(self):
+        submission = ApplicationSubmissionFactory()
+        expected = self.stored_files(submission)
+        self.remove_metadata(submission)
+
+        out = StringIO()
+        call_command('backfill_file_metadata', '--workers', '2', stdout=out)
+
+        for stored, before in zip(self.stored_files(submission), expected):
+            self.assertEqual(stored['size'], before['size'])
+            self.assertEqual(stored['checksum'], before['checksum'])
+            # Guessed from the file name, the browser isn't there to ask
+            self.assertEqual(stored['content_type'], 'application/pdf')
+        self.assertIn(f'Stored the metadata of {len(expected)} files.', out.getvalue())
+
+    def test_backfill_keeps_changes_made_meanwhile(self):
+        submission = ApplicationSubmissionFactory()
+        self.remove_metadata(submission)
+
+        def edit_submission(instance):
+            if instance != submission:
+                return files_without_metadata(instance)
+            # Edited after the batch was read from the database
+            form_data = ApplicationSubmission.objects.values_list('form_data', flat=True).get(id=submission.id)
+            form_data['edited'] = True
+            ApplicationSubmission.objects.filter(id=submission.id).update(form_data=form_data)
+            return files_without_metadata(instance)
+
+        with patch('opentech.apply.funds.management.commands.backfill_file_metadata.files_without_metadata', side_effect=edit_submission):
+            call_command('backfill_file_metadata', stdout=StringIO())
+
+        form_data = ApplicationSubmission.objects.values_list('form_data', flat=True).get(id=submission.id)
+        self.assertTrue(form_data['edited'])
+        for stored in self.stored_files(submission):
+            self.assertEqual(len(stored['checksum']), 64)
+
+
+class TestBatchTransition(TestCase):
+    def transition(self, submissions, action, user=None):
+        ApplicationSubmission.perform_batch_transition(
+            {submission: action for submission in submissions},
+            user or StaffFactory(),
+        )
+
+    def test_statuses_saved(self):
+        submissions = ApplicationSubmissionFactory.create_batch(3)
+        self.transition(submissions, 'rejected')
+        self.assertEqual(
+            set(ApplicationSubmission.objects.values_list('status', flat=True)),
+            {'rejected'},
+        )
+
+    def test_round_progress_updated(self):
+        round = RoundFactory()
+        submissions = ApplicationSubmissionFactory.create_batch(2, round=round)
+        self.transition(submissions, 'rejected')
+        progress = RoundsAndLabs.objects.with_progress().get(pk=round.pk)
+        self.assertEqual(progress.closed_submissions, 2)
+
+    def test_invalid_transition_changes_nothing(self):
+        submission = ApplicationSubmissionFactory()
+        determined = ApplicationSubmissionFactory(status='rejected')
+        transitions = {submission: 'rejected', determined: 'accepted'}
+        with self.assertRaises(PermissionDenied):
+            ApplicationSubmission.perform_batch_transition(transitions, StaffFactory())
+        self.assertEqual(self.refresh(submission).status, submission.status)
+
+    @override_settings(SUBMISSION_STATS_ENABLED=True)
+    @patch.dict(
+        ConceptProposal['concept_review_discussion'].transitions['concept_review_more_info'],
+        {'method': 'create_revision'},
+    )
+    def test_stats_rebuilt_for_transitions_performed_alone(self):
+        # Performed with perform_transition as if the transition ran a method,
+        # the comments are made in bulk beforehand as for batch determinations
+        user = StaffFactory()
+        submissions = ApplicationSubmissionFactory.create_batch(2, workflow_stages=2, status='concept_review_discussion')
+        Activity.objects.bulk_create(
+            Activity(type=COMMENT, message='More info', timestamp=timezone.now(), user=user, source=submission)
+            for submission in submissions
+        )
+        ApplicationSubmission.perform_batch_transition(
+            {submission: 'concept_review_more_info' for submission in submissions},
+            user,
+            notify=False,
+        )
+        for submission in submissions:
+            self.assertEqual(self.refresh(submission).status, 'concept_review_more_info')
+            self.assertEqual(SubmissionStats.objects.get(submission=submission).comments_applicant, 1)
+
+    def test_queries_fixed_for_many_submissions(self):
+        round = RoundFactory()
+        user = StaffFactory()
+
+        def count_queries(number):
+            submissions = ApplicationSubmissionFactory.create_batch(number, round=round)
+            with CaptureQueriesContext(connection) as queries:
+                self.transition(submissions, 'rejected', user)
+            return len(queries)
+
+        self.assertEqual(count_queries(2), count_queries(10))
+
+    def refresh(self, submission):
+        return ApplicationSubmission.objects.get(id=submission.id)
+
+
+class TestExportSubmissionsCommand(TestCase):
+    def export(self, *args):
+        out = StringIO()
+        call_command('export_submissions_csv', '--output', '-', *args, stdout=out)
+        return list(csv.reader(StringIO(out.getvalue())))
+
+    def test_default_columns(self):
+        submission = ApplicationSubmissionFactory()
+        header, row = self.export()
+        self.assertEqual(header[0], 'Submission title')
+        self.assertEqual(row[0], submission.title)
+        self.assertEqual(row[-1], str(submission.round))
+
+    def test_named_block_column(self):
+        submission = ApplicationSubmissionFactory()
+        header, row = self.export('--columns', 'id,address')
+        self.assertEqual(header, ['Submission ID', 'Address'])
+        self.assertEqual(row, [str(submission.id), str(submission.data('address'))])
+
+    def test_queries_chunked(self):
+        ApplicationSubmissionFactory.create_batch(5)
+        # Chunks are fetched from a single server side cursor
+        with self.assertNumQueries(1):
+            rows = self.export('--chunk-size', '2')
+        self.assertEqual(len(rows), 6)
+
+
+class TestSubmissionSearch(TestCase):
+    def search(self, query):
+        return list(ApplicationSubmission.objects.search(query))
+
+    def test_search_document_saved(self):
+        submission = ApplicationSubmissionFactory(form_data__title='Encrypted messaging')
+        self.assertEqual(self.search('messaging'), [submission])
+        self.assertEqual(self.search('gardening'), [])
+
+    def test_words_stemmed(self):
+        submission = ApplicationSubmissionFactory(form_data__title='Encrypted messaging')
+        self.assertEqual(self.search('messages'), [submission])
+
+    def test_last_word_matches_prefix(self):
+        submission = ApplicationSubmissionFactory(form_data__title='Encrypted messaging')
+        self.assertEqual(self.search('encrypted mess'), [submission])
+        self.assertEqual(self.search('enc messaging'), [])
+
+    def test_title_ranked_above_other_fields(self):
+        in_name = ApplicationSubmissionFactory(form_data__title='Something', user__full_name='Tor Ranker')
+        in_title = ApplicationSubmissionFactory(form_data__title='Tor relays', user__full_name='Someone')
+        self.assertEqual(self.search('tor'), [in_title, in_name])
+
+    def test_punctuation_ignored(self):
+        submission = ApplicationSubmissionFactory(form_data__title='Encrypted messaging')
+        self.assertEqual(self.search("messaging & ! | 'encrypted':*"), [submission])
+        self.assertEqual(len(self.search('&!')), 1)
+
+    def test_email_matched_whole(self):
+        # The email of the submission is the email of the applicant
+        submission = ApplicationSubmissionFactory(user__email='grants@example.com')
+        self.assertEqual(self.search('grants@example.com'), [submission])
+
+    def test_url_host_matched(self):
+        submission = ApplicationSubmissionFactory(form_data__title='Mirrors at https://example.org/mirrors')
+        self.assertEqual(self.search('example.org'), [submission])
+        self.assertEqual(self.search('example.or'), [submission])
+
+    def test_only_stop_words(self):
+        ApplicationSubmissionFactory(form_data__title='Encrypted messaging')
+        self.assertEqual(self.search('the'), [])
+
+    def test_updated_with_revision(self):
+        # Faker text can contain common words, so use a made up one
+        submission = ApplicationSubmissionFactory(form_data__title='Encrypted qwzxmessenger')
+        submission.form_data['title'] = 'Mesh networks'
+        submission.create_revision()
+        self.assertEqual(self.search('mesh'), [submission])
+        self.assertEqual(self.search('qwzxmessenger'), [])
+
+    def test_rebuild_command(self):
+        submissions = ApplicationSubmissionFactory.create_batch(3, form_data__title='Mesh networks')
+        ApplicationSubmission.objects.update(search_document=None)
+        self.assertEqual(self.search('mesh'), [])
+
+        call_command('rebuild_submission_search', '--batch-size', '2', '--missing', stdout=StringIO())
+
+        self.assertCountEqual(self.search('mesh'), submissions)
+
+
+class TestSpecificParents(TestCase):
+    def test_specific_parent_cached(self):
+        submission = ApplicationSubmission.objects.get(id=ApplicationSubmissionFactory().id)
+        with self.assertNumQueries(2):
+            self.assertEqual(submission.get_from_parent('workflow_name'), submission.workflow_name)
+        with self.assertNumQueries(0):
+            submission.get_from_parent('workflow_name')
+            submission.get_from_parent('review_forms')
+
+    def test_lab_parent(self):
+        submission = LabSubmissionFactory()
+        self.assertIsNone(submission.get_specific_parent('round'))
+        self.assertEqual(submission.get_from_parent('workflow_name'), submission.page.specific.workflow_name)
+
+    def test_changed_round_not_cached(self):
+        submission = ApplicationSubmissionFactory()
+        submission.get_from_parent('workflow_name')
+        new_round = RoundFactory(workflow_name='double')
+        submission.round = new_round
+        self.assertEqual(submission.get_specific_parent('round'), new_round)
+        self.assertEqual(submission.get_from_parent('workflow_name'), 'double')
+
+    def test_prefetch_fixed_queries(self):
+        for _ in range(3):
+            round = RoundFactory()
+            ApplicationSubmissionFactory.create_batch(2, round=round)
+        LabSubmissionFactory.create_batch(2)
+
+        # Submissions, the page types, then the rounds, funds and labs
+        with self.assertNumQueries(5):
+            submissions = list(ApplicationSubmission.objects.with_specific_parents())
+            for submission in submissions:
+                submission.get_from_parent('workflow_name')
+                submission.get_from_parent('review_forms')
+
+        self.assertEqual(len(submissions), 8)
+        self.assertEqual(
+            {type(submission.get_specific_parent('page')).__name__ for submission in submissions},
+            {'FundType', 'LabType'},
+        )
+
+
+class TestBulkAssignReviewers(TestCase):
+    def copies(self, submission, count):
+        copies = []
+        for _ in range(count):
+            copy = ApplicationSubmission.objects.get(id=submission.id)
+            copy.pk = None
+            copy.live_revision = copy.draft_revision = None
+            copies.append(copy)
+        return ApplicationSubmission.objects.bulk_create(copies)
+
+    def test_types_match_single_assignment(self):
+        submission, other = ApplicationSubmissionFactory.create_batch(2)
+        staff_reviewer = StaffFactory()
+        staff_reviewer.groups.add(GroupFactory(name=REVIEWER_GROUP_NAME))
+        reviewers = [StaffFactory(), ReviewerFactory(), staff_reviewer]
+        AssignedReviewers.objects.bulk_assign([submission], reviewers)
+        for reviewer in reviewers:
+            expected, _ = AssignedReviewers.objects.get_or_create_for_user(other, reviewer)
+            self.assertEqual(submission.assigned.get(reviewer=reviewer).type, expected.type)
+
+    def test_existing_assignments_kept(self):
+        staff = StaffFactory()
+        assigned = AssignedReviewersFactory(reviewer=staff)
+        AssignedReviewers.objects.bulk_assign([assigned.submission], [staff, ReviewerFactory()])
+        self.assertEqual(assigned.submission.assigned.count(), 2)
+        self.assertEqual(assigned.submission.assigned.get(reviewer=staff).type.name, REVIEWER_GROUP_NAME)
+
+    def test_update_role(self):
+        role = ReviewerRoleFactory()
+        old, new = StaffFactory.create_batch(2)
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        AssignedReviewersFactory(submission=submissions[0], reviewer=old, role=role)
+        AssignedReviewersFactory(submission=submissions[1], reviewer=new)
+
+        AssignedReviewers.objects.update_role(role, new, *submissions)
+
+        self.assertFalse(AssignedReviewers.objects.filter(reviewer=old).exists())
+        for submission in submissions:
+            assigned = submission.assigned.get(role=role)
+            self.assertEqual(assigned.reviewer, new)
+            self.assertEqual(assigned.type.name, STAFF_GROUP_NAME)
+
+    @override_settings(SUBMISSION_STATS_ENABLED=True)
+    def test_stats_refreshed(self):
+        submission = ApplicationSubmissionFactory()
+        ReviewFactory(submission=submission)
+        AssignedReviewers.objects.bulk_assign([submission], ReviewerFactory.create_batch(2))
+        self.assertEqual(SubmissionStats.objects.get(submission=submission).review_count, 3)
+
+    def test_queries_fixed_for_many_submissions(self):
+        # 20 reviewers on 500 submissions is 10000 assignments, 10 batches
+        submissions = self.copies(ApplicationSubmissionFactory(), 500)
+        reviewers = ReviewerFactory.create_batch(10) + StaffFactory.create_batch(10)
+        with self.assertNumQueries(12):
+            AssignedReviewers.objects.bulk_assign(submissions, reviewers)
+        self.assertEqual(AssignedReviewers.objects.count(), 10000)
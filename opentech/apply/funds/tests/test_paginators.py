@@ -0,0 +1,90 @@
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from opentech.apply.funds.models import ApplicationSubmission
+from opentech.apply.funds.paginators import KeysetPaginator
+from opentech.apply.users.tests.factories import StaffFactory
+
+from .factories import ApplicationSubmissionFactory
+
+
+class TestKeysetPaginator(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = StaffFactory()
+        cls.submissions = ApplicationSubmissionFactory.create_batch(7)
+
+    def all_pages(self, queryset, per_page=2):
+        pages = []
+        cursor = None
+        while True:
+            page = KeysetPaginator(queryset, per_page, cursor=cursor).page(1)
+            pages.append(page)
+            if not page.has_next():
+                return pages
+            cursor = page.next_page_number()
+
+    def test_pages_cover_all_submissions_in_order(self):
+        queryset = ApplicationSubmission.objects.order_by('-submit_time')
+        pages = self.all_pages(queryset)
+        ids = [submission.id for page in pages for submission in page.object_list]
+        self.assertEqual(ids, list(queryset.values_list('id', flat=True)))
+        self.assertEqual([page.number for page in pages], [1, 2, 3, 4])
+
+    def test_ties_broken_by_id(self):
+        ApplicationSubmission.objects.update(submit_time=self.submissions[0].submit_time)
+        queryset = ApplicationSubmission.objects.order_by('submit_time')
+        pages = self.all_pages(queryset, per_page=3)
+        ids = [submission.id for page in pages for submission in page.object_list]
+        self.assertEqual(ids, sorted(submission.id for submission in self.submissions))
+
+    def test_nulls_last_ordering(self):
+        ordering = F('last_update').desc(nulls_last=True)
+        queryset = ApplicationSubmission.objects.with_latest_update().order_by(ordering, 'submit_time')
+        pages = self.all_pages(queryset, per_page=3)
+        ids = [submission.id for page in pages for submission in page.object_list]
+        self.assertEqual(ids, list(queryset.values_list('id', flat=True)))
+
+    def test_previous_page(self):
+        queryset = ApplicationSubmission.objects.order_by('-submit_time')
+        pages = self.all_pages(queryset)
+        previous = KeysetPaginator(queryset, 2, cursor=pages[2].previous_page_number()).page(1)
+        self.assertEqual(previous.number, 2)
+        self.assertEqual(list(previous.object_list), list(pages[1].object_list))
+        self.assertTrue(previous.has_next())
+
+    def test_invalid_cursor_shows_first_page(self):
+        queryset = ApplicationSubmission.objects.order_by('-submit_time')
+        page = KeysetPaginator(queryset, 2, cursor='not-a-cursor').page(1)
+        self.assertEqual(page.number, 1)
+        self.assertEqual(list(page.object_list), list(queryset[:2]))
+
+    def test_changed_ordering_ignores_cursor(self):
+        queryset = ApplicationSubmission.objects.order_by('-submit_time')
+        cursor = self.all_pages(queryset)[1].previous_page_number()
+        page = KeysetPaginator(queryset.order_by('id'), 2, cursor=cursor).page(1)
+        self.assertEqual(page.number, 1)
+
+    def test_unsupported_ordering_uses_offset(self):
+        queryset = ApplicationSubmission.objects.order_by('status')
+        paginator = KeysetPaginator(queryset, 2)
+        self.assertIsNone(paginator.ordering)
+        self.assertEqual(paginator.page(2).number, 2)
+
+    def test_deep_pages_do_not_offset(self):
+        # Every page runs the same query regardless of depth, so takes the same time
+        queryset = ApplicationSubmission.objects.for_table(self.staff).order_by('-submit_time')
+        cursor = None
+        query_counts = set()
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                page = KeysetPaginator(queryset, 2, cursor=cursor).page(1)
+            query_counts.add(len(queries))
+            for query in queries.captured_queries:
+                self.assertNotIn('OFFSET', query['sql'])
+            if not page.has_next():
+                break
+            cursor = page.next_page_number()
+        self.assertEqual(len(query_counts), 1)
@@ -1,7 +1,13 @@
+from unittest.mock import patch
+
 from django.template import Context, Template
-from django.test import override_settings, TestCase
+from django.test import override_settings, SimpleTestCase, TestCase
 
+from opentech.apply.funds.templatetags.statusbar_tags import STATUS_BARS, status_bar_context
 from opentech.apply.funds.tests.factories import ApplicationSubmissionFactory
+from opentech.apply.funds.workflow import ConceptProposal, Proposal, Request
+from opentech.apply.users.groups import STAFF_GROUP_NAME
+from opentech.apply.users.tests.factories import ApplicantFactory, StaffFactory
 
 
 @override_settings(ROOT_URLCONF='opentech.apply.urls')
@@ -18,3 +24,45 @@ class TestTemplateTags(TestCase):
         context = Context({'content': f'Lorem ipsum dolor #{submission.id} sit amet.'})
         output = template.render(context)
         self.assertEqual(output, f'Lorem ipsum dolor <a href="{submission.get_absolute_url()}">{submission.title} <span class="mid-grey-text">#{submission.id}</span></a> sit amet.')
+
+
+class TestStatusBar(TestCase):
+    template = Template(
+        '{% load statusbar_tags %}'
+        '{% for phase in phases %}{% status_bar workflow phase user css_class="status-bar--small" %}{% endfor %}'
+    )
+
+    def setUp(self):
+        STATUS_BARS.clear()
+        self.addCleanup(STATUS_BARS.clear)
+
+    def render(self, user, phases):
+        return self.template.render(Context({'workflow': ConceptProposal, 'phases': phases, 'user': user}))
+
+    def test_bar_rendered_once_per_phase_and_role(self):
+        # Fifty rows of the submissions table spread over five phases
+        phases = list(ConceptProposal.values())[:5] * 10
+        with patch('opentech.apply.funds.templatetags.statusbar_tags.status_bar_context', wraps=status_bar_context) as context:
+            self.render(StaffFactory(), phases)
+            self.render(StaffFactory(), phases)
+        self.assertEqual(context.call_count, 5)
+
+    def test_bar_differs_by_role(self):
+        phase = ConceptProposal['concept_internal_review']
+        staff_bar = self.render(StaffFactory(), [phase])
+        applicant_bar = self.render(ApplicantFactory(), [phase])
+        self.assertNotEqual(staff_bar, applicant_bar)
+        self.assertIn(phase.display_name, staff_bar)
+        self.assertNotIn(phase.display_name, applicant_bar)
+
+
+class TestWorkflowLookup(SimpleTestCase):
+    def test_stage_index(self):
+        self.assertEqual(ConceptProposal.stage_index(Proposal), 1)
+        with self.assertRaises(ValueError):
+            Request.stage_index(Proposal)
+
+    def test_phases_for_role_shared(self):
+        staff, other_staff = StaffFactory.build(), StaffFactory.build()
+        staff.roles = other_staff.roles = {STAFF_GROUP_NAME}
+        self.assertIs(ConceptProposal.phases_for(staff), ConceptProposal.phases_for(other_staff))
@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..exports import cached_pdf, render_key
+from ..tasks import render_submission_pdf
+
+from .factories import ApplicationSubmissionFactory
+
+
+class TestRenderSubmissionPDF(TestCase):
+    def test_pdf_stored(self):
+        submission = ApplicationSubmissionFactory()
+        self.assertIsNone(cached_pdf(submission))
+
+        render_submission_pdf(submission.id)
+
+        with cached_pdf(submission) as pdf:
+            self.assertTrue(pdf.read().startswith(b'%PDF'))
+
+    @patch('opentech.apply.funds.exports.make_pdf', side_effect=ValueError)
+    def test_failed_render_can_be_queued_again(self, make_pdf):
+        submission = ApplicationSubmissionFactory()
+        cache.add(render_key(submission), True)
+
+        with self.assertRaises(ValueError):
+            render_submission_pdf(submission.id)
+
+        self.assertIsNone(cache.get(render_key(submission)))
@@ -1,4 +1,8 @@
+import csv
+import io
+import zipfile
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import PermissionDenied
@@ -511,6 +515,20 @@ class TestRevisionCompare(BaseSubmissionViewTestCase):
         response = self.get_page(submission)
         self.assertEqual(response.status_code, 200)
 
+    def test_comparison_is_cached(self):
+        submission = ApplicationSubmissionFactory()
+        new_data = ApplicationSubmissionFactory(round=submission.round, form_fields=submission.form_fields).form_data
+        submission.form_data = new_data
+        submission.create_revision()
+
+        first = self.get_page(submission)
+        with patch('opentech.apply.funds.views.compare') as compare:
+            second = self.get_page(submission)
+
+        compare.assert_not_called()
+        self.assertEqual(first.context['stream_fields'], second.context['stream_fields'])
+        self.assertEqual(first.context['required_fields'], second.context['required_fields'])
+
 
 class TestRevisionList(BaseSubmissionViewTestCase):
     base_view_name = 'revisions:list'
@@ -735,3 +753,189 @@ class TestAnonSubmissionFileView(BaseSubmissionFileViewTestCase):
         self.assertEqual(len(response.redirect_chain), 2)
         for path, _ in response.redirect_chain:
             self.assertIn(reverse('users_public:login'), path)
+
+
+class TestSubmissionListSearch(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'list'
+    user_factory = StaffFactory
+
+    def search(self, query, **data):
+        response = self.client.get(self.url(None), {'query': query, **data}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return [row.record for row in response.context['table'].rows]
+
+    def test_results_ranked(self):
+        in_name = ApplicationSubmissionFactory(form_data__title='Something', user__full_name='Tor Ranker')
+        in_title = ApplicationSubmissionFactory(form_data__title='Tor relays', user__full_name='Someone')
+        ApplicationSubmissionFactory(form_data__title='Mesh networks', user__full_name='Someone Else')
+        self.assertEqual(self.search('tor'), [in_title, in_name])
+
+    def test_sort_overrides_rank(self):
+        in_name = ApplicationSubmissionFactory(form_data__title='Something', user__full_name='Tor Ranker')
+        in_title = ApplicationSubmissionFactory(form_data__title='Tor relays', user__full_name='Someone')
+        self.assertEqual(self.search('tor', sort='title'), [in_name, in_title])
+
+
+class TestSubmissionExportView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'export'
+    user_factory = StaffFactory
+
+    def export(self, **data):
+        response = self.client.get(self.url(None), data, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_exports_submissions(self):
+        submissions = ApplicationSubmissionFactory.create_batch(3)
+        rows = self.export()
+        self.assertEqual(rows[0][0], 'Submission title')
+        self.assertEqual([row[0] for row in rows[1:]], [submission.title for submission in submissions])
+
+    def test_filters_applied(self):
+        submission, other = ApplicationSubmissionFactory.create_batch(2)
+        rows = self.export(round=submission.round.id)
+        self.assertEqual([row[0] for row in rows[1:]], [submission.title])
+
+    def test_selected_columns(self):
+        submission = ApplicationSubmissionFactory()
+        rows = self.export(column=['id', 'email'])
+        self.assertEqual(rows, [['Submission ID', 'Submission e-mail'], [str(submission.id), submission.email]])
+
+    def test_unknown_column(self):
+        response = self.client.get(self.url(None), {'column': 'secret'}, secure=True)
+        self.assertEqual(response.status_code, 404)
+
+    def test_query_count_constant(self):
+        ApplicationSubmissionFactory.create_batch(2)
+        with self.assertNumQueries(6):
+            self.export()
+        ApplicationSubmissionFactory.create_batch(3)
+        with self.assertNumQueries(6):
+            self.export()
+
+
+class TestApplicantSubmissionExportView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'export'
+    user_factory = ApplicantFactory
+
+    def test_cant_export(self):
+        ApplicationSubmissionFactory(user=self.user)
+        response = self.client.get(self.url(None), secure=True)
+        self.assertEqual(response.status_code, 403)
+
+
+def fake_pdf(title, meta, content):
+    return io.BytesIO(f'%PDF {title}'.encode())
+
+
+class TestSubmissionDetailPDFView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'download'
+    user_factory = StaffFactory
+
+    def get_kwargs(self, instance):
+        return {'pk': instance.id}
+
+    def setUp(self):
+        super().setUp()
+        self.submission = ApplicationSubmissionFactory(form_data__title='First title')
+        ProjectFactory(submission=self.submission)
+        patcher = patch('opentech.apply.funds.exports.make_pdf', side_effect=fake_pdf)
+        self.make_pdf = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def download(self):
+        response = self.client.get(self.url(self.submission), secure=True)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_stored_pdf_reused(self):
+        self.assertEqual(self.download(), b'%PDF First title')
+        self.assertEqual(self.download(), b'%PDF First title')
+        self.assertEqual(self.make_pdf.call_count, 1)
+
+    def test_new_revision_rendered(self):
+        self.download()
+        self.submission.form_data['title'] = 'Second title'
+        self.submission.create_revision()
+        self.assertEqual(self.download(), b'%PDF Second title')
+        self.assertEqual(self.make_pdf.call_count, 2)
+
+    def test_new_lead_rendered(self):
+        self.download()
+        self.submission.lead = StaffFactory()
+        self.submission.save()
+        self.download()
+        self.assertEqual(self.make_pdf.call_count, 2)
+
+    def test_pending_while_rendering(self):
+        with patch('opentech.apply.funds.views.render_submission_pdf') as task:
+            for _ in range(2):
+                response = self.client.get(self.url(self.submission), secure=True)
+                self.assertEqual(response.status_code, 202)
+        task.delay.assert_called_once_with(self.submission.id)
+        self.make_pdf.assert_not_called()
+
+
+class TestSubmissionPDFArchiveView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'pdf_archive'
+    user_factory = StaffFactory
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch('opentech.apply.funds.exports.make_pdf', side_effect=fake_pdf)
+        self.make_pdf = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def archive(self, submissions):
+        ids = ','.join(str(submission.id) for submission in submissions)
+        response = self.client.get(self.url(None), {'submissions': ids}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_selected_submissions_archived(self):
+        first = ApplicationSubmissionFactory(form_data__title='First')
+        second = ApplicationSubmissionFactory(form_data__title='Second')
+        ApplicationSubmissionFactory(form_data__title='Other')
+        archive = self.archive([second, first])
+        self.assertEqual(archive.namelist(), [f'{first.id}_First.pdf', f'{second.id}_Second.pdf'])
+        self.assertEqual(archive.read(f'{second.id}_Second.pdf'), b'%PDF Second')
+
+    def test_stored_pdfs_reused(self):
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        self.archive(submissions)
+        self.archive(submissions)
+        self.assertEqual(self.make_pdf.call_count, 2)
+
+    def test_pending_while_rendering(self):
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        ids = ','.join(str(submission.id) for submission in submissions)
+        with patch('opentech.apply.funds.views.render_submission_pdf') as task:
+            for _ in range(2):
+                response = self.client.get(self.url(None), {'submissions': ids}, secure=True)
+                self.assertEqual(response.status_code, 202)
+        self.assertCountEqual(
+            task.delay.call_args_list,
+            [((submission.id,),) for submission in submissions],
+        )
+        self.make_pdf.assert_not_called()
+
+    def test_invalid_ids(self):
+        response = self.client.get(self.url(None), {'submissions': '1,two'}, secure=True)
+        self.assertEqual(response.status_code, 404)
+
+
+class TestApplicantSubmissionPDFArchiveView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'pdf_archive'
+    user_factory = ApplicantFactory
+
+    def test_cant_archive(self):
+        submission = ApplicationSubmissionFactory(user=self.user)
+        response = self.client.get(self.url(None), {'submissions': str(submission.id)}, secure=True)
+        self.assertEqual(response.status_code, 403)
@@ -10,6 +10,9 @@ from .views import (
     SubmissionsByStatus,
     SubmissionDetailView,
     SubmissionEditView,
+    SubmissionExportView,
+    SubmissionFilterChoicesView,
+    SubmissionPDFArchiveView,
     SubmissionListView,
     SubmissionOverviewView,
     SubmissionSealedView,
@@ -33,6 +36,9 @@ app_name = 'funds'
 submission_urls = ([
     path('', SubmissionOverviewView.as_view(), name="overview"),
     path('all/', SubmissionListView.as_view(), name="list"),
+    path('all/export/', SubmissionExportView.as_view(), name="export"),
+    path('all/pdfs/', SubmissionPDFArchiveView.as_view(), name="pdf_archive"),
+    path('all/filters/<str:name>/', SubmissionFilterChoicesView.as_view(), name="filter_choices"),
     path('flagged/', include([
         path('', SubmissionUserFlaggedView.as_view(), name="flagged"),
         path('staff/', SubmissionStaffFlaggedView.as_view(), name="staff_flagged"),
@@ -3,10 +3,12 @@ from copy import copy
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.db.models import Count, F, Q
-from django.http import FileResponse, HttpResponseRedirect, Http404
+from django.http import FileResponse, HttpResponseRedirect, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.utils.safestring import mark_safe
@@ -15,7 +17,7 @@ from django.views import View
 from django.views.generic import CreateView, DetailView, FormView, ListView, UpdateView, DeleteView
 from django.views.generic.detail import SingleObjectMixin
 
-from django_filters.views import FilterView
+from django_filters.views import FilterMixin, FilterView
 from django_tables2.views import SingleTableMixin
 
 from wagtail.core.models import Page
@@ -31,12 +33,13 @@ from opentech.apply.projects.forms import CreateProjectForm
 from opentech.apply.projects.models import Project
 from opentech.apply.review.views import ReviewContextMixin
 from opentech.apply.users.decorators import staff_required
-from opentech.apply.utils.pdfs import make_pdf
 from opentech.apply.utils.storage import PrivateMediaView
 from opentech.apply.utils.views import DelegateableListView, DelegateableView, ViewDispatcher
 
 from .differ import compare
+from .exports import SubmissionExport, SubmissionPDFArchive, cached_pdf, render_key
 from .files import generate_submission_file_path
+from .filter_choices import FILTER_CHOICES
 from .forms import (
     BatchUpdateSubmissionLeadForm,
     BatchUpdateReviewersForm,
@@ -55,7 +58,7 @@ from .models import (
     RoundBase,
     LabBase
 )
-from .paginators import LazyPaginator
+from .paginators import KeysetPaginator
 from .permissions import is_user_has_access_to_view_submission
 from .tables import (
     AdminSubmissionsTable,
@@ -66,6 +69,7 @@ from .tables import (
     SubmissionReviewerFilterAndSearch,
     SummarySubmissionsTable,
 )
+from .tasks import render_submission_pdf
 from .workflow import INITIAL_STATE, STAGE_CHANGE_ACTIONS, PHASES_MAPPING, review_statuses
 
 
@@ -73,7 +77,7 @@ class BaseAdminSubmissionsTable(SingleTableMixin, FilterView):
     table_class = AdminSubmissionsTable
     filterset_class = SubmissionFilterAndSearch
     filter_action = ''
-    table_pagination = {'klass': LazyPaginator}
+    table_pagination = {'klass': KeysetPaginator}
 
     excluded_fields = []
 
@@ -84,8 +88,20 @@ class BaseAdminSubmissionsTable(SingleTableMixin, FilterView):
         }
 
     def get_table_kwargs(self, **kwargs):
+        if self.request.GET.get('query'):
+            # Keep the search results in order of relevance unless sorted
+            kwargs.setdefault('order_by', ())
         return {**self.excluded, **kwargs}
 
+    def get_table_pagination(self, table):
+        pagination = super().get_table_pagination(table)
+        if pagination:
+            pagination = {
+                **pagination,
+                'cursor': self.request.GET.get(table.prefixed_page_field),
+            }
+        return pagination
+
     def get_filterset_kwargs(self, filterset_class, **kwargs):
         new_kwargs = super().get_filterset_kwargs(filterset_class)
         new_kwargs.update(self.excluded)
@@ -300,6 +316,47 @@ class SubmissionAdminListView(BaseAdminSubmissionsTable, DelegateableListView):
     ]
 
 
+@method_decorator(staff_required, name='dispatch')
+class SubmissionExportView(FilterMixin, View):
+    filterset_class = SubmissionFilterAndSearch
+
+    def get_queryset(self):
+        return self.filterset_class._meta.model.objects.current()
+
+    def get(self, request, *args, **kwargs):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_bound or filterset.is_valid() or not self.get_strict():
+            queryset = filterset.qs
+        else:
+            queryset = filterset.queryset.none()
+
+        columns = request.GET.getlist('column')
+        try:
+            export = SubmissionExport(queryset, columns=columns)
+        except ValueError as e:
+            raise Http404(str(e))
+
+        response = StreamingHttpResponse(export.stream(), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="submissions.csv"'
+        return response
+
+
+@method_decorator(login_required, name='dispatch')
+class SubmissionFilterChoicesView(View):
+    """The choices for a submission filter, for the browser to load after the page"""
+    def get(self, request, *args, name, **kwargs):
+        try:
+            filter_choices = FILTER_CHOICES[name]
+        except KeyError:
+            raise Http404
+        if not filter_choices.available_to(request.user):
+            raise PermissionDenied
+
+        return JsonResponse({
+            'results': [{'id': pk, 'text': label} for pk, label in filter_choices.choices()],
+        })
+
+
 class SubmissionReviewerListView(BaseReviewerSubmissionsTable):
     template_name = 'funds/submissions.html'
 
@@ -879,11 +936,16 @@ class RevisionListView(ListView):
         )
 
 
+def revision_compare_cache_key(from_id, to_id):
+    return f'revision_compare_{from_id}_{to_id}'
+
+
 @method_decorator(staff_required, name='dispatch')
 class RevisionCompareView(DetailView):
     model = ApplicationSubmission
     template_name = 'funds/revisions_compare.html'
     pk_url_kwarg = 'submission_pk'
+    cache_timeout = 60 * 60 * 24
 
     def compare_revisions(self, from_data, to_data):
         self.object.form_data = from_data.form_data
@@ -915,7 +977,15 @@ class RevisionCompareView(DetailView):
     def get_context_data(self, **kwargs):
         from_revision = self.object.revisions.get(id=self.kwargs['from'])
         to_revision = self.object.revisions.get(id=self.kwargs['to'])
-        required_fields, stream_fields = self.compare_revisions(from_revision, to_revision)
+
+        # Revisions never change once created so the comparison can be reused
+        cache_key = revision_compare_cache_key(from_revision.id, to_revision.id)
+        compared = cache.get(cache_key)
+        if compared is None:
+            compared = self.compare_revisions(from_revision, to_revision)
+            cache.set(cache_key, compared, self.cache_timeout)
+        required_fields, stream_fields = compared
+
         timestamps = (from_revision.timestamp, to_revision.timestamp)
         return super().get_context_data(
             timestamps=timestamps,
@@ -985,6 +1055,12 @@ class SubmissionDetailSimplifiedView(DetailView):
         return obj
 
 
+def queue_pdf_render(submission):
+    # Only queue one render for each version while the first is waiting
+    if cache.add(render_key(submission), True, 60 * 10):
+        render_submission_pdf.delay(submission.id)
+
+
 @method_decorator(staff_required, name='dispatch')
 class SubmissionDetailPDFView(SingleObjectMixin, View):
     model = ApplicationSubmission
@@ -999,18 +1075,50 @@ class SubmissionDetailPDFView(SingleObjectMixin, View):
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
-        pdf = make_pdf(
-            title=self.object.title,
-            meta=[
-                self.object.stage,
-                self.object.page,
-                self.object.round,
-                f"Lead: { self.object.lead }",
-            ],
-            content=self.object.output_text_answers()
-        )
+        pdf = cached_pdf(self.object)
+        if pdf is None:
+            queue_pdf_render(self.object)
+            # The task has already run if the tasks are eager
+            pdf = cached_pdf(self.object)
+
+        if pdf is None:
+            return TemplateResponse(
+                request,
+                'funds/submission_pdf_pending.html',
+                {'object': self.object},
+                status=202,
+            )
+
         return FileResponse(
             pdf,
             as_attachment=True,
             filename=self.object.title + '.pdf',
         )
+
+
+@method_decorator(staff_required, name='dispatch')
+class SubmissionPDFArchiveView(View):
+    def get(self, request, *args, **kwargs):
+        try:
+            ids = [int(pk) for pk in request.GET.get('submissions', '').split(',')]
+        except ValueError:
+            raise Http404
+        archive = SubmissionPDFArchive(ApplicationSubmission.objects.filter(id__in=ids))
+        missing = archive.missing()
+        if missing:
+            for submission in missing:
+                queue_pdf_render(submission)
+            # The tasks have already run if the tasks are eager
+            missing = archive.missing()
+
+        if missing:
+            return TemplateResponse(
+                request,
+                'funds/submission_pdf_archive_pending.html',
+                {'missing': missing},
+                status=202,
+            )
+
+        response = StreamingHttpResponse(archive.stream(), content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="submissions.zip"'
+        return response
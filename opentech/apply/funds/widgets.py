@@ -1,4 +1,5 @@
 from django.contrib.staticfiles.templatetags.staticfiles import static
+from django.urls import reverse
 
 from django_select2.forms import Select2MultipleWidget
 
@@ -22,6 +23,31 @@ class Select2MultiCheckboxesWidget(Select2MultipleWidget):
         return attrs
 
 
+class CachedChoicesSelect2Widget(Select2MultiCheckboxesWidget):
+    """
+    Renders the cached choices of the filter, when they are not cached only
+    the selected choices are rendered and the rest are loaded by the browser.
+    """
+    def __init__(self, *args, filter_choices, **kwargs):
+        self.filter_choices = filter_choices
+        super().__init__(*args, **kwargs)
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.filter_choices.cached()
+        self.choices_url = None
+        if choices is None:
+            choices = self.filter_choices.selected(value)
+            self.choices_url = reverse('apply:submissions:filter_choices', kwargs={'name': self.filter_choices.name})
+        self.choices = choices
+        return super().optgroups(name, value, attrs)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        if self.choices_url:
+            context['widget']['attrs']['data-choices-url'] = self.choices_url
+        return context
+
+
 class MetaTermSelect2Widget(Select2MultipleWidget):
 
     def create_option(self, name, value, label, selected, index, subindex=None, attrs=None):
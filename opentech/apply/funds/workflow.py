@@ -1,6 +1,7 @@
 from collections import defaultdict
 from enum import Enum
 import itertools
+from types import MappingProxyType
 
 from django.conf import settings
 from django.utils.text import slugify
@@ -25,36 +26,79 @@ class UserPermissions(Enum):
     APPLICANT = 4
 
 
+class WorkflowLookup:
+    """
+    The stages and phases of a workflow arranged for lookups, workflows are
+    fixed once defined so these are built once.
+    """
+    __slots__ = ('stages', 'stage_index', 'stepped_phases', 'display_phases', 'view_checks', 'visible_phases')
+
+    def __init__(self, phases):
+        phases = list(phases)
+        stages = []
+        stepped_phases = defaultdict(list)
+        for phase in phases:
+            if phase.stage not in stages:
+                stages.append(phase.stage)
+            stepped_phases[phase.step].append(phase)
+
+        self.stages = tuple(stages)
+        self.stage_index = {stage: index for index, stage in enumerate(self.stages)}
+        self.stepped_phases = MappingProxyType({
+            step: tuple(step_phases) for step, step_phases in stepped_phases.items()
+        })
+        # The first phase of each step is the one displayed
+        self.display_phases = tuple(phase for phase, *_ in self.stepped_phases.values())
+        self.view_checks = tuple({
+            check: None
+            for phase in phases
+            for check in phase.permissions.permissions.get('view', list())
+        })
+        # The visible phases for each combination of passed view checks
+        self.visible_phases = {}
+
+    def role(self, user):
+        return tuple(check(user) for check in self.view_checks)
+
+    def phases_for(self, user):
+        role = self.role(user)
+        try:
+            return self.visible_phases[role]
+        except KeyError:
+            phases = tuple(phase for phase in self.display_phases if phase.permissions.can_view(user))
+            self.visible_phases[role] = phases
+            return phases
+
+
 class Workflow(dict):
     def __init__(self, name, admin_name, **data):
         self.name = name
         self.admin_name = admin_name
         super().__init__(**data)
+        self.lookup = WorkflowLookup(self.values())
 
     def __str__(self):
         return self.name
 
     @property
     def stages(self):
-        stages = []
-        for phase in self.values():
-            if phase.stage not in stages:
-                stages.append(phase.stage)
-        return stages
+        return self.lookup.stages
+
+    def stage_index(self, stage):
+        try:
+            return self.lookup.stage_index[stage]
+        except KeyError:
+            raise ValueError(f'{stage!r} is not a stage of {self}')
 
     @property
     def stepped_phases(self):
-        phases = defaultdict(list)
-        for phase in list(self.values()):
-            phases[phase.step].append(phase)
-        return phases
+        return self.lookup.stepped_phases
 
     def phases_for(self, user=None):
         # Grab the first phase for each step - visible only, the display phase
-        return [
-            phase for phase, *_ in self.stepped_phases.values()
-            if not user or phase.permissions.can_view(user)
-        ]
+        if not user:
+            return self.lookup.display_phases
+        return self.lookup.phases_for(user)
 
     def previous_visible(self, current, user):
         """Find the latest phase that the user has view permissions for"""
@@ -74,6 +74,8 @@ class ReportListFilter(filters.FilterSet):
         after, before = value.start, value.stop
         q = {}
         if after:
+            # A window can't be filtered on, work the start out for the filter
+            queryset = queryset.with_start()
             q['start__gte'] = after
         if before:
             q['end_date__lte'] = before
@@ -8,7 +8,7 @@ from django.utils import timezone
 from django.urls import set_urlconf
 from opentech.apply.activity.messaging import MESSAGES, messenger
 from opentech.apply.home.models import ApplyHomePage
-from opentech.apply.projects.models import Project
+from opentech.apply.projects.models import Project, Report, ReportConfig
 
 
 class Command(BaseCommand):
@@ -16,8 +16,10 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('days_before', type=int)
+        parser.add_argument('--dry-run', action='store_true', help='Show the projects which would be notified without changing anything')
 
     def handle(self, *args, **options):
+        dry_run = options['dry_run']
         site = ApplyHomePage.objects.first().get_site()
         set_urlconf('opentech.apply.urls')
 
@@ -32,24 +34,37 @@ class Command(BaseCommand):
 
         today = timezone.now().date()
         due_date = today + relativedelta(days=options['days_before'])
-        for project in Project.objects.in_progress():
-            next_report = project.report_config.current_due_report()
-            due_soon = next_report.end_date == due_date
-            not_notified_today = (
-                not next_report.notified or
-                next_report.notified.date() != today
+
+        configs = ReportConfig.objects.filter(project__in=Project.objects.in_progress())
+        reports = configs.current_due_reports(save=not dry_run)
+
+        to_notify = [
+            report for report in reports.values()
+            if report.end_date == due_date and (
+                not report.notified or
+                report.notified.date() != today
+            )
+        ]
+
+        if dry_run:
+            new_reports = [report for report in reports.values() if not report.pk]
+            self.stdout.write(f'Would create {len(new_reports)} reports.')
+            for report in to_notify:
+                self.stdout.write(f'Would notify project: {report.project_id}')
+            return
+
+        if to_notify:
+            messenger(
+                MESSAGES.BATCH_REPORT_NOTIFY,
+                request=request,
+                user=None,
+                sources=Project.objects.filter(id__in=[report.project_id for report in to_notify]).select_related('user'),
+                related={report.project_id: report for report in to_notify},
+            )
+            # Notify about the due report
+            Report.objects.filter(id__in=[report.id for report in to_notify]).update(notified=timezone.now())
+
+        for report in to_notify:
+            self.stdout.write(
+                self.style.SUCCESS(f'Notified project: {report.project_id}')
             )
-            if due_soon and not_notified_today:
-                messenger(
-                    MESSAGES.REPORT_NOTIFY,
-                    request=request,
-                    user=None,
-                    source=project,
-                    related=next_report,
-                )
-                # Notify about the due report
-                next_report.notified = timezone.now()
-                next_report.save()
-                self.stdout.write(
-                    self.style.SUCCESS(f'Notified project: {project.id}')
-                )
@@ -19,13 +19,15 @@ from django.db.models import (
     ExpressionWrapper,
     Max,
     OuterRef,
+    Prefetch,
     Q,
     Subquery,
     Sum,
     Value as V,
     When,
+    Window,
 )
-from django.db.models.functions import Cast, Coalesce
+from django.db.models.functions import Cast, Coalesce, Lag
 from django.db.models.signals import post_delete
 from django.dispatch.dispatcher import receiver
 from django.urls import reverse
@@ -334,8 +336,19 @@ class ProjectQuerySet(models.QuerySet):
             )
         )
 
+    def with_unsubmitted_reports(self):
+        # The reporting status of all the projects from a single query, the
+        # date is checked when the status is shown, see ReportConfig
+        return self.prefetch_related(
+            Prefetch(
+                'reports',
+                queryset=Report.objects.filter(current__isnull=True, skipped=False).order_by('end_date'),
+                to_attr='unsubmitted_reports',
+            ),
+        )
+
     def for_table(self):
-        return self.with_amount_paid().with_last_payment().select_related(
+        return self.with_amount_paid().with_last_payment().with_unsubmitted_reports().select_related(
             'report_config',
             'submission__page',
             'lead',
@@ -435,12 +448,23 @@ class Project(BaseStreamForm, AccessFormData, models.Model):
     @property
     def start_date(self):
         # Assume project starts when OTF are happy with the first signed contract
-        first_approved_contract = self.contracts.approved().order_by('approved_at').first()
+        if hasattr(self, 'approved_contracts'):
+            first_approved_contract = next(iter(self.approved_contracts), None)
+        else:
+            first_approved_contract = self.contracts.approved().order_by('approved_at').first()
         if not first_approved_contract:
             return None
 
         return first_approved_contract.approved_at.date()
 
+    @cached_property
+    def report_last_end_dates(self):
+        # The end of the previous report by report id, only known when the
+        # periods were prefetched, see ReportQueryset.for_table
+        if not hasattr(self, 'report_periods'):
+            return {}
+        return {report.pk: report.last_end_date for report in self.report_periods}
+
     @property
     def end_date(self):
         # Aiming for the proposed end date as the last day of the project
@@ -595,6 +619,66 @@ class ProjectApprovalForm(BaseStreamForm, models.Model):
         return self.name
 
 
+class ReportConfigQuerySet(models.QuerySet):
+    def with_schedule_dates(self):
+        today = timezone.now().date()
+        return self.annotate(
+            project_start=Subquery(
+                Project.objects.filter(
+                    pk=OuterRef('project_id'),
+                ).with_start_date().values('start')[:1]
+            ),
+            last_report_end=Subquery(
+                Report.objects.filter(
+                    Q(end_date__lt=today) | Q(current__isnull=False),
+                    project=OuterRef('project_id'),
+                ).order_by('-end_date').values('end_date')[:1]
+            ),
+        )
+
+    def current_due_reports(self, save=True):
+        """
+        The report currently due for each project which has started, keyed by
+        project id. Matches ReportConfig.current_due_report but the dates for
+        all the projects are loaded together and the reports are created or
+        moved in bulk. When save is False nothing is written, new reports
+        are left without a pk.
+        """
+        today = timezone.now().date()
+        configs = [
+            config for config in self.select_related('project').with_schedule_dates()
+            if config.project_start
+        ]
+        due_reports = {
+            report.project_id: report
+            for report in Report.objects.filter(
+                project__in=[config.project_id for config in configs],
+                end_date__gte=today,
+                current__isnull=True,
+            )
+        }
+
+        reports = {}
+        new_reports = []
+        moved_reports = []
+        for config in configs:
+            next_due_date = config.next_due_date(config.last_report_end, config.project_start, today)
+            report = due_reports.get(config.project_id)
+            if not report:
+                report = Report(project=config.project, end_date=next_due_date)
+                new_reports.append(report)
+            elif report.end_date != next_due_date:
+                report.end_date = next_due_date
+                moved_reports.append(report)
+            report.project = config.project
+            reports[config.project_id] = report
+
+        if save:
+            Report.objects.bulk_create(new_reports)
+            Report.objects.bulk_update(moved_reports, ['end_date'])
+        return reports
+
+
 class ReportConfig(models.Model):
     """Persists configuration about the reporting schedule etc"""
 
@@ -610,6 +694,8 @@ class ReportConfig(models.Model):
     occurrence = models.PositiveSmallIntegerField(default=1)
     frequency = models.CharField(choices=FREQUENCY_CHOICES, default=MONTH, max_length=5)
 
+    objects = ReportConfigQuerySet.as_manager()
+
     def get_frequency_display(self):
         next_report = self.current_due_report()
 
@@ -628,14 +714,23 @@ class ReportConfig(models.Model):
             return f"Every week on { weekday }"
         return f"Every {self.occurrence} weeks on { weekday }"
 
+    def to_do_reports(self):
+        if not hasattr(self.project, 'unsubmitted_reports'):
+            return self.project.reports.to_do()
+
+        # Loaded with the other projects of the table
+        today = timezone.now().date()
+        return [report for report in self.project.unsubmitted_reports if report.end_date < today]
+
     def is_up_to_date(self):
-        return len(self.project.reports.to_do()) == 0
+        return len(self.to_do_reports()) == 0
 
     def outstanding_reports(self):
-        return len(self.project.reports.to_do())
+        return len(self.to_do_reports())
 
     def has_very_late_reports(self):
-        return self.project.reports.any_very_late()
+        two_weeks_ago = timezone.now().date() - relativedelta(weeks=2)
+        return any(report.end_date <= two_weeks_ago for report in self.to_do_reports())
 
     def past_due_reports(self):
         return self.project.reports.to_do()
@@ -648,22 +743,34 @@ class ReportConfig(models.Model):
 
     def current_due_report(self):
         # Project not started - no reporting required
-        if not self.project.start_date:
+        start_date = self.project.start_date
+        if not start_date:
             return None
 
         today = timezone.now().date()
 
         last_report = self.last_report()
+        last_report_end = last_report.end_date if last_report else None
+        next_due_date = self.next_due_date(last_report_end, start_date, today)
 
-        schedule_date = self.schedule_start or self.project.start_date
+        report, _ = self.project.reports.update_or_create(
+            project=self.project,
+            end_date__gte=today,
+            current__isnull=True,
+            defaults={'end_date': next_due_date}
+        )
+        return report
 
-        if last_report:
-            if last_report.end_date < schedule_date:
+    def next_due_date(self, last_report_end, start_date, today):
+        schedule_date = self.schedule_start or start_date
+
+        if last_report_end:
+            if last_report_end < schedule_date:
                 # reporting schedule changed schedule_start is now the next report date
                 next_due_date = schedule_date
             else:
                 # we've had a report since the schedule date so base next deadline from the report
-                next_due_date = self.next_date(last_report.end_date)
+                next_due_date = self.next_date(last_report_end)
         else:
             # first report required
             if self.schedule_start and self.schedule_start >= today:
@@ -676,14 +783,7 @@ class ReportConfig(models.Model):
                     self.next_date(schedule_date - relativedelta(days=1)),
                     today,
                 )
-
-        report, _ = self.project.reports.update_or_create(
-            project=self.project,
-            end_date__gte=today,
-            current__isnull=True,
-            defaults={'end_date': next_due_date}
-        )
-        return report
+        return next_due_date
 
     def next_date(self, last_date):
         delta_frequency = self.frequency + 's'
@@ -713,7 +813,18 @@ class ReportQueryset(models.QuerySet):
     def submitted(self):
         return self.filter(current__isnull=False)
 
-    def for_table(self):
+    def with_last_end_date(self):
+        # The end of the previous report of the same project, the window only
+        # sees the reports left by the filters so filter by project alone
+        return self.annotate(
+            last_end_date=Window(
+                expression=Lag('end_date'),
+                partition_by=[F('project_id')],
+                order_by=F('end_date').asc(),
+            ),
+        )
+
+    def with_start(self):
         return self.annotate(
             last_end_date=Subquery(
                 Report.objects.filter(
@@ -744,6 +855,22 @@ class ReportQueryset(models.QuerySet):
             )
         )
 
+    def for_table(self):
+        # The periods of all the reports of the listed projects are loaded
+        # together, see Report.start_date
+        return self.select_related('project__lead').prefetch_related(
+            Prefetch(
+                'project__reports',
+                queryset=Report.objects.with_last_end_date(),
+                to_attr='report_periods',
+            ),
+            Prefetch(
+                'project__contracts',
+                queryset=Contract.objects.approved().order_by('approved_at'),
+                to_attr='approved_contracts',
+            ),
+        )
+
 
 class Report(models.Model):
     skipped = models.BooleanField(default=False)
@@ -794,9 +921,14 @@ class Report(models.Model):
 
     @cached_property
     def start_date(self):
-        last_report = self.project.reports.filter(end_date__lt=self.end_date).first()
-        if last_report:
-            return last_report.end_date + relativedelta(days=1)
+        if self.pk in self.project.report_last_end_dates:
+            last_end_date = self.project.report_last_end_dates[self.pk]
+        else:
+            last_report = self.project.reports.filter(end_date__lt=self.end_date).first()
+            last_end_date = last_report and last_report.end_date
+
+        if last_end_date:
+            return last_end_date + relativedelta(days=1)
 
         return self.project.start_date
 
@@ -166,4 +166,4 @@ class ReportListTable(tables.Table):
         attrs = {'class': 'responsive-table'}
 
     def render_report_period(self, record):
-        return f"{record.start} to {record.end_date}"
+        return f"{record.start_date} to {record.end_date}"
@@ -6,7 +6,9 @@ from django.core.management import call_command
 from django.test import override_settings, TestCase
 from django.utils import timezone
 
+from opentech.apply.activity.models import Event, Message
 from opentech.apply.home.models import ApplyHomePage
+from opentech.apply.projects.models import Report
 
 from .factories import (
     ProjectFactory,
@@ -61,3 +63,30 @@ class TestNotifyReportDue(TestCase):
         out = StringIO()
         call_command('notify_report_due', 7, stdout=out)
         self.assertNotIn('Notified project', out.getvalue())
+
+    def test_notify_projects_in_one_batch(self):
+        in_a_week = timezone.now() + relativedelta(days=7)
+        configs = ReportConfigFactory.create_batch(3, schedule_start=in_a_week, project__in_progress=True)
+        ReportConfigFactory(project__in_progress=True)
+        out = StringIO()
+
+        with self.settings(ALLOWED_HOSTS=[ApplyHomePage.objects.first().get_site().hostname]):
+            call_command('notify_report_due', 7, stdout=out)
+
+        for config in configs:
+            self.assertIn(f'Notified project: {config.project.id}', out.getvalue())
+        self.assertEqual(Event.objects.filter(type='BATCH_REPORT_NOTIFY').count(), 3)
+        self.assertEqual(Message.objects.filter(type='Email').count(), 3)
+        self.assertEqual(Report.objects.filter(notified__isnull=False).count(), 3)
+
+    def test_dry_run_changes_nothing(self):
+        in_a_week = timezone.now() + relativedelta(days=7)
+        config = ReportConfigFactory(schedule_start=in_a_week, project__in_progress=True)
+        out = StringIO()
+
+        call_command('notify_report_due', 7, dry_run=True, stdout=out)
+
+        self.assertIn('Would create 1 reports.', out.getvalue())
+        self.assertIn(f'Would notify project: {config.project.id}', out.getvalue())
+        self.assertFalse(Report.objects.exists())
+        self.assertFalse(Event.objects.exists())
@@ -289,6 +289,53 @@ class TestReportConfig(TestCase):
         config = report.project.report_config
         self.assertQuerysetEqual(config.past_due_reports(), [], transform=lambda x: x)
 
+    def test_current_due_reports_match_current_due_report(self):
+        configs = [
+            ReportConfigFactory(),
+            ReportConfigFactory(schedule_start=self.today - relativedelta(months=3)),
+            ReportConfigFactory(schedule_start=self.today + relativedelta(days=2), frequency=ReportConfig.WEEK),
+            ReportConfigFactory(schedule_start=self.today - relativedelta(days=2)),
+        ]
+        ReportFactory(project=configs[0].project)
+        ReportFactory(project=configs[3].project, end_date=self.today - relativedelta(days=1))
+        ReportFactory(project=configs[3].project, end_date=self.today + relativedelta(days=5))
+
+        with self.assertNumQueries(4):
+            reports = ReportConfig.objects.current_due_reports()
+
+        report_count = Report.objects.count()
+        for config in configs:
+            self.assertEqual(reports[config.project_id], config.current_due_report())
+            self.assertEqual(reports[config.project_id].end_date, config.current_due_report().end_date)
+        self.assertEqual(Report.objects.count(), report_count)
+
+    def test_reporting_status_for_table(self):
+        configs = ReportConfigFactory.create_batch(3)
+        ReportFactory(project=configs[0].project, end_date=self.today - relativedelta(weeks=3))
+        ReportFactory(project=configs[0].project, end_date=self.today - relativedelta(days=1))
+        ReportFactory(project=configs[1].project, end_date=self.today - relativedelta(days=1), is_submitted=True)
+        ReportFactory(project=configs[2].project, end_date=self.today + relativedelta(days=1))
+
+        def status(config):
+            return config.is_up_to_date(), config.outstanding_reports(), config.has_very_late_reports()
+
+        expected = [(False, 2, True), (True, 0, False), (True, 0, False)]
+        self.assertEqual([status(config) for config in configs], expected)
+        with self.assertNumQueries(2):
+            projects = Project.objects.for_table().order_by('id')
+            self.assertEqual([status(project.report_config) for project in projects], expected)
+
+    def test_current_due_reports_not_started(self):
+        config = ReportConfigFactory()
+        config.project.contracts.all().delete()
+        self.assertEqual(ReportConfig.objects.current_due_reports(), {})
+
+    def test_current_due_reports_without_save(self):
+        config = ReportConfigFactory()
+        reports = ReportConfig.objects.current_due_reports(save=False)
+        self.assertIsNone(reports[config.project_id].pk)
+        self.assertFalse(Report.objects.exists())
+
 
 class TestReport(TestCase):
     @property
@@ -325,6 +372,28 @@ class TestReport(TestCase):
         report = ReportFactory(end_date=self.from_today(1), is_submitted=True)
         self.assertEqual(report.start_date, self.today)
 
+    def test_start_date_for_table(self):
+        first_report = ReportFactory(end_date=self.from_today(-30))
+        report = ReportFactory(project=first_report.project, end_date=self.from_today(-10), is_submitted=True)
+        other_report = ReportFactory(end_date=self.from_today(-5), is_submitted=True)
+
+        with self.assertNumQueries(3):
+            start_dates = {report.pk: report.start_date for report in Report.objects.submitted().for_table()}
+
+        self.assertEqual(start_dates, {
+            report.pk: self.from_today(-29),
+            other_report.pk: other_report.project.start_date,
+        })
+        for report in Report.objects.with_start():
+            self.assertEqual(report.start, report.start_date)
+
+    def test_start_date_for_table_report_not_prefetched(self):
+        first_report = ReportFactory(end_date=self.from_today(-30), is_submitted=True)
+        project = Report.objects.submitted().for_table().get().project
+        report = ReportFactory(project=project, end_date=self.from_today(-10))
+        report.project = project
+        self.assertEqual(report.start_date, first_report.end_date + relativedelta(days=1))
+
     def test_queryset_done_includes_submitted(self):
         report = ReportFactory(is_submitted=True)
         self.assertQuerysetEqual(Report.objects.done(), [report], transform=lambda x: x)
@@ -1,10 +1,13 @@
 from decimal import Decimal
 from io import BytesIO
+from unittest.mock import patch
 from dateutil.relativedelta import relativedelta
 
 from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import PermissionDenied
+from django.db import connection
 from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -1130,6 +1133,84 @@ class TestStaffPaymentRequestInvoicePrivateMedia(BaseViewTestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class TestPrivateMediaDelivery(BaseViewTestCase):
+    base_view_name = 'invoice'
+    url_name = 'funds:projects:payments:{}'
+    user_factory = StaffFactory
+
+    def setUp(self):
+        super().setUp()
+        self.content = b'0123456789'
+        self.payment_request = PaymentRequestFactory(invoice__data=self.content)
+
+    def get_kwargs(self, instance):
+        return {
+            'pk': instance.pk,
+        }
+
+    def get(self, **headers):
+        return self.client.get(self.url(self.payment_request), secure=True, **headers)
+
+    def test_validators_sent(self):
+        response = self.get()
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], str(len(self.content)))
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_not_modified(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_range(self):
+        response = self.get(HTTP_RANGE='bytes=1-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[1:4])
+        self.assertEqual(response['Content-Range'], f'bytes 1-3/{len(self.content)}')
+
+    def test_suffix_range(self):
+        response = self.get(HTTP_RANGE='bytes=-2')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-2:])
+
+    def test_range_not_satisfiable(self):
+        response = self.get(HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_range_of_changed_file_sends_everything(self):
+        response = self.get(HTTP_RANGE='bytes=1-3', HTTP_IF_RANGE='"changed"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    @override_settings(PRIVATE_MEDIA_DELIVERY='x-accel-redirect', PRIVATE_MEDIA_ACCEL_PREFIX='/private-media/')
+    def test_accel_redirect(self):
+        response = self.get()
+        self.assertEqual(response['X-Accel-Redirect'], '/private-media/' + self.payment_request.invoice.name)
+        self.assertEqual(response.content, b'')
+
+    @override_settings(PRIVATE_MEDIA_DELIVERY='x-sendfile')
+    def test_sendfile(self):
+        response = self.get()
+        self.assertEqual(response['X-Sendfile'], self.payment_request.invoice.path)
+
+    @override_settings(PRIVATE_MEDIA_DELIVERY='redirect', PRIVATE_MEDIA_URL_EXPIRY=30)
+    def test_signed_url_redirect(self):
+        with patch.object(self.payment_request.invoice.storage.__class__, 'url', return_value='https://bucket.example/invoice?sig=1') as url:
+            response = self.get()
+        url.assert_called_once_with(self.payment_request.invoice.name, expire=30)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://bucket.example/invoice?sig=1')
+
+    @override_settings(PRIVATE_MEDIA_DELIVERY='x-sendfile')
+    def test_permission_checked_before_delivery(self):
+        self.client.force_login(ApplicantFactory())
+        response = self.get()
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('X-Sendfile', response)
+
+
 class TestApplicantPaymentRequestInvoicePrivateMedia(BaseViewTestCase):
     base_view_name = 'invoice'
     url_name = 'funds:projects:payments:{}'
@@ -1214,6 +1295,44 @@ class TestProjectListView(TestCase):
         response = self.client.get(url, follow=True)
         self.assertEqual(response.status_code, 403)
 
+    def test_queries_fixed_for_number_of_projects(self):
+        self.client.force_login(StaffFactory())
+        url = reverse('apply:projects:all')
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url, follow=True)
+            return len(queries)
+
+        # The funds are listed in the filters, the first request fills the caches
+        fund_round = ReportFactory(past_due=True).project.submission.round.specific
+        count_queries()
+        queries = count_queries()
+        ReportFactory.create_batch(5, past_due=True, project__submission__round=fund_round)
+        self.assertEqual(count_queries(), queries)
+
+
+@override_settings(ROOT_URLCONF='opentech.apply.urls')
+class TestReportListView(TestCase):
+    def test_queries_fixed_for_number_of_reports(self):
+        self.client.force_login(StaffFactory())
+        url = reverse('apply:projects:reports:all')
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, follow=True)
+            return response, len(queries)
+
+        report = ReportFactory(is_submitted=True)
+        report.refresh_from_db()
+        count_queries()
+        response, queries = count_queries()
+        self.assertContains(response, f'{report.start_date} to {report.end_date}')
+
+        fund_round = report.project.submission.round.specific
+        ReportFactory.create_batch(5, is_submitted=True, project__submission__round=fund_round)
+        self.assertEqual(count_queries()[1], queries)
+
 
 @override_settings(ROOT_URLCONF='opentech.apply.urls')
 class TestProjectOverviewView(TestCase):
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 
 class ReviewConfig(AppConfig):
-    name = 'review'
+    name = 'opentech.apply.review'
+
+    def ready(self):
+        from . import caches  # NOQA
@@ -0,0 +1,35 @@
+from django.dispatch import receiver
+
+from opentech.apply.funds.models import AssignedReviewers
+from opentech.apply.funds.models.submissions import reviewers_assigned
+from opentech.apply.utils.cache import invalidate_on_change, invalidate_on_commit
+
+from .models import Review, ReviewOpinion
+
+
+def review_list_version_key(submission_id):
+    return f'review_list_version_{submission_id}'
+
+
+def submission_versions(instance):
+    return [review_list_version_key(instance.submission_id)]
+
+
+invalidate_on_change([Review, AssignedReviewers], submission_versions)
+
+
+def opinion_versions(opinion):
+    # The review may already have been removed if this is part of a cascade
+    return [
+        review_list_version_key(submission_id)
+        for submission_id in Review.objects.filter(id=opinion.review_id).values_list('submission_id', flat=True)
+    ]
+
+
+invalidate_on_change([ReviewOpinion], opinion_versions)
+
+
+@receiver(reviewers_assigned)
+def invalidate_review_list_for_assignments(sender, submissions, **kwargs):
+    # The comparison of the reviews shows the role and order of the reviewers
+    invalidate_on_commit([review_list_version_key(submission_id) for submission_id in submissions])
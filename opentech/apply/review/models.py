@@ -102,22 +102,36 @@ class ReviewQuerySet(models.QuerySet):
         return self.exclude(score=NA).aggregate(models.Avg('score'))['score__avg']
 
     def recommendation(self):
-        opinions = self.values_list('opinions__opinion', flat=True)
-
-        if any(opinion == DISAGREE for opinion in opinions):
-            return MAYBE
-
-        recommendations = self.values_list('recommendation', flat=True)
-        try:
-            recommendation = sum(recommendations) / len(recommendations)
-        except ZeroDivisionError:
-            return -1
-
-        if recommendation == YES or recommendation == NO:
+        return self.summary()['recommendation']
+
+    def summary(self):
+        """The count, score, recommendation and disagreement of the reviews in one query"""
+        # Opinions are found with a subquery, joining them would count a
+        # review once for each opinion
+        disagreed = ReviewOpinion.objects.filter(opinion=DISAGREE).values('review')
+        summary = self.aggregate(
+            count=models.Count('pk'),
+            score=models.Avg('score', filter=~models.Q(score=NA)),
+            average_recommendation=models.Avg('recommendation'),
+            disagreements=models.Count('pk', filter=models.Q(pk__in=disagreed)),
+        )
+
+        if not summary['count']:
+            recommendation = -1
+        elif summary['disagreements']:
+            recommendation = MAYBE
+        elif summary['average_recommendation'] in [YES, NO]:
             # If everyone in agreement return Yes/No
-            return recommendation
+            recommendation = int(summary['average_recommendation'])
         else:
-            return MAYBE
+            recommendation = MAYBE
+
+        return {
+            'count': summary['count'],
+            'score': summary['score'],
+            'recommendation': recommendation,
+            'disagreement': bool(summary['disagreements']),
+        }
 
     def opinions(self):
         return ReviewOpinion.objects.filter(review__id__in=self.values_list('id'))
@@ -2,7 +2,7 @@ from django.test import TestCase
 
 from opentech.apply.funds.tests.factories import ApplicationSubmissionFactory
 from .factories import ReviewFactory, ReviewOpinionFactory
-from ..options import MAYBE, NO, YES
+from ..options import DISAGREE, MAYBE, NA, NO, YES
 
 
 class TestReviewQueryset(TestCase):
@@ -77,3 +77,74 @@ class TestReviewQueryset(TestCase):
         ReviewOpinionFactory(review=review, opinion_disagree=True)
         recommendation = submission.reviews.recommendation()
         self.assertEqual(recommendation, MAYBE)
+
+
+def previous_recommendation(reviews):
+    # The recommendation as it was calculated in python before summary()
+    if any(opinion == DISAGREE for opinion in reviews.values_list('opinions__opinion', flat=True)):
+        return MAYBE
+    recommendations = reviews.values_list('recommendation', flat=True)
+    try:
+        recommendation = sum(recommendations) / len(recommendations)
+    except ZeroDivisionError:
+        return -1
+    if recommendation == YES or recommendation == NO:
+        return recommendation
+    return MAYBE
+
+
+class TestReviewSummary(TestCase):
+    def make_submissions(self):
+        # Every combination covered by TestReviewQueryset, plus scores and drafts
+        submissions = ApplicationSubmissionFactory.create_batch(8)
+        no_reviews, yes, no, mixed, disagreed, agreed, draft, scored = submissions
+
+        ReviewFactory.create_batch(2, recommendation_yes=True, submission=yes)
+        ReviewFactory.create_batch(2, submission=no)
+        ReviewFactory(recommendation_yes=True, submission=mixed)
+        ReviewFactory(recommendation_maybe=True, submission=mixed)
+
+        review = ReviewFactory(recommendation_yes=True, submission=disagreed)
+        ReviewOpinionFactory(review=review, opinion_agree=True)
+        ReviewOpinionFactory(review=review, opinion_disagree=True)
+        ReviewFactory(recommendation_yes=True, submission=disagreed)
+
+        review = ReviewFactory(submission=agreed)
+        ReviewOpinionFactory.create_batch(2, review=review, opinion_agree=True)
+
+        ReviewFactory(recommendation_yes=True, submission=draft)
+        ReviewFactory(draft=True, submission=draft)
+
+        ReviewFactory(recommendation_yes=True, submission=scored, score=4)
+        ReviewFactory(recommendation_yes=True, submission=scored, score=NA)
+        ReviewFactory(recommendation_yes=True, submission=scored, score=1)
+        return submissions
+
+    def test_matches_previous_calculation(self):
+        for submission in self.make_submissions():
+            for reviews in [submission.reviews.all(), submission.reviews.submitted(), submission.reviews.by_staff()]:
+                summary = reviews.summary()
+                self.assertEqual(summary['recommendation'], previous_recommendation(reviews))
+                self.assertEqual(summary['score'], reviews.score())
+                self.assertEqual(summary['count'], reviews.count())
+
+    def test_disagreement(self):
+        submissions = self.make_submissions()
+        self.assertEqual(
+            [submission.reviews.summary()['disagreement'] for submission in submissions],
+            [False, False, False, False, True, False, False, False],
+        )
+
+    def test_scores_ignore_na(self):
+        scored = self.make_submissions()[-1]
+        self.assertEqual(scored.reviews.summary()['score'], 2.5)
+
+    def test_summary_one_query(self):
+        submission = self.make_submissions()[4]
+        with self.assertNumQueries(1):
+            self.assertEqual(submission.reviews.summary(), {
+                'count': 2,
+                'score': 0,
+                'recommendation': MAYBE,
+                'disagreement': True,
+            })
@@ -1,12 +1,18 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from opentech.apply.activity.models import Activity
-from opentech.apply.funds.tests.factories.models import ApplicationSubmissionFactory
+from opentech.apply.funds.models import AssignedReviewers
+from opentech.apply.funds.tests.factories.models import ApplicationSubmissionFactory, ReviewerRoleFactory
 from opentech.apply.users.tests.factories import ReviewerFactory, StaffFactory, UserFactory
 from opentech.apply.utils.testing.tests import BaseViewTestCase
 
 from .factories import ReviewFactory, ReviewFormFieldsFactory, ReviewFormFactory, ReviewOpinionFactory
 from ..models import Review, ReviewOpinion
+from ..views import ReviewListView
 from ..options import NA, AGREE, DISAGREE
 
 
@@ -235,6 +241,43 @@ class ReviewListTestCase(BaseViewTestCase):
         self.assertIn("Disagrees", response_opinion)
         self.assertIn(str(staff), response_opinion)
 
+    def test_queries_fixed_for_many_reviews(self):
+        def count_queries(reviews):
+            submission = ApplicationSubmissionFactory()
+            for review in ReviewFactory.create_batch(reviews, submission=submission):
+                ReviewOpinionFactory(review=review, opinion_agree=True)
+            with CaptureQueriesContext(connection) as queries:
+                self.get_page(review)
+            return len(queries)
+
+        # Warm up the caches shared between requests
+        count_queries(1)
+        self.assertEqual(count_queries(2), count_queries(6))
+
+    @patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+    def test_comparison_cached_until_review_changes(self, on_commit):
+        review = ReviewFactory()
+        with patch.object(ReviewListView, 'get_review_data', autospec=True, side_effect=ReviewListView.get_review_data) as get_review_data:
+            self.get_page(review)
+            self.get_page(review)
+            self.assertEqual(get_review_data.call_count, 1)
+
+            ReviewOpinionFactory(review=review, opinion_disagree=True)
+            response = self.get_page(review)
+            self.assertEqual(get_review_data.call_count, 2)
+        self.assertIn('Disagrees', response.context['review_data']['opinions']['answers'][0])
+
+    @patch('opentech.apply.review.views.generate_image_tag', return_value='')
+    @patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+    def test_comparison_invalidated_by_role_update(self, on_commit, image_tag):
+        review = ReviewFactory()
+        with patch.object(ReviewListView, 'get_review_data', autospec=True, side_effect=ReviewListView.get_review_data) as get_review_data:
+            self.get_page(review)
+            # Only changes the existing assignment with update()
+            AssignedReviewers.objects.update_role(ReviewerRoleFactory(), review.author.reviewer, review.submission)
+            self.get_page(review)
+            self.assertEqual(get_review_data.call_count, 2)
+
 
 class StaffReviewOpinionCase(BaseViewTestCase):
     user_factory = StaffFactory
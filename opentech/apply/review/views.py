@@ -1,6 +1,8 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.db.models import Prefetch
 from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.template.loader import get_template
@@ -18,10 +20,12 @@ from opentech.apply.review.forms import ReviewModelForm, ReviewOpinionForm
 from opentech.apply.stream_forms.models import BaseStreamForm
 from opentech.apply.users.decorators import staff_required
 from opentech.apply.users.groups import REVIEWER_GROUP_NAME
+from opentech.apply.utils.cache import get_versions
 from opentech.apply.utils.views import CreateOrUpdateView
 from opentech.apply.utils.image import generate_image_tag
 
-from .models import Review
+from .caches import review_list_version_key
+from .models import Review, ReviewOpinion
 from .options import DISAGREE
 
 
@@ -33,20 +37,20 @@ class ReviewContextMixin:
             assigned_reviewers = assigned_reviewers.staff()
 
         # Calculate the recommendation based on role and staff reviews
-        recommendation = self.object.reviews.by_staff().recommendation()
+        summary = self.object.reviews.by_staff().summary()
 
         return super().get_context_data(
             hidden_types=[REVIEWER_GROUP_NAME],
             staff_reviewers_exist=assigned_reviewers.staff().exists(),
             assigned_reviewers=assigned_reviewers,
-            recommendation=recommendation,
+            recommendation=summary['recommendation'],
             **kwargs,
         )
 
 
 def get_fields_for_stage(submission):
     forms = submission.get_from_parent('review_forms').all()
-    index = submission.workflow.stages.index(submission.stage)
+    index = submission.workflow.stage_index(submission.stage)
     try:
         return forms[index].form.form_fields
     except IndexError:
@@ -332,16 +336,31 @@ class ReviewDetailView(DetailView):
 @method_decorator(staff_required, name='dispatch')
 class ReviewListView(ListView):
     model = Review
+    cache_timeout = 60 * 60 * 24
 
     def get_queryset(self):
         self.submission = get_object_or_404(ApplicationSubmission, id=self.kwargs['submission_pk'])
-        self.queryset = self.model.objects.filter(submission=self.submission, is_draft=False)
+        opinions = ReviewOpinion.objects.select_related('author__reviewer')
+        self.queryset = self.submission.reviews.filter(is_draft=False).select_related(
+            'author__reviewer',
+            'author__role__icon',
+            'revision',
+        ).defer(
+            # Only the revision id is needed to compare with the latest
+            'revision__form_data',
+        ).prefetch_related(Prefetch('opinions', queryset=opinions))
         return super().get_queryset()
 
     def should_display(self, field):
         return not isinstance(field.block, (RecommendationBlock, RecommendationCommentsBlock, RichTextBlock))
 
-    def get_context_data(self, **kwargs):
+    def get_cache_key(self):
+        version_key = review_list_version_key(self.submission.id)
+        version = get_versions([version_key])[version_key]
+        # Reviews of older revisions link to a comparison with the latest
+        return f'review_list_{self.submission.id}_{self.submission.live_revision_id}_{version}'
+
+    def get_review_data(self):
         review_data = {}
 
         # Add the header rows
@@ -352,20 +371,20 @@ class ReviewListView(ListView):
         review_data['revision'] = {'question': 'Revision', 'answers': list()}
         review_data['comments'] = {'question': 'Comments', 'answers': list()}
 
-        responses = self.object_list.count()
+        reviews = {review.author_id: review for review in self.object_list}
+        responses = len(reviews)
         ordered_reviewers = AssignedReviewers.objects.filter(submission=self.submission).reviewed().review_order()
+        opinions_template = get_template('review/includes/review_opinions_list.html')
 
-        reviews = {review.author: review for review in self.object_list}
         for i, reviewer in enumerate(ordered_reviewers):
-            review = reviews[reviewer]
+            review = reviews[reviewer.id]
             author = '<a href="{}"><span>{}</span></a>'.format(review.get_absolute_url(), review.author)
             if review.author.role:
                 author += generate_image_tag(review.author.role.icon, '12x12')
             author = f'<div>{author}</div>'
 
             review_data['title']['answers'].append(author)
-            opinions_template = get_template('review/includes/review_opinions_list.html')
-            opinions_html = opinions_template.render({'opinions': review.opinions.select_related('author').all()})
+            opinions_html = opinions_template.render({'opinions': review.opinions.all()})
             review_data['opinions']['answers'].append(opinions_html)
             review_data['score']['answers'].append(review.get_score_display)
             review_data['recommendation']['answers'].append(review.get_recommendation_display())
@@ -373,6 +392,7 @@ class ReviewListView(ListView):
             if review.for_latest:
                 revision = 'Current'
             else:
+                review.revision.submission = self.submission
                 revision = '<a href="{}">Compare</a>'.format(review.get_compare_url())
             review_data['revision']['answers'].append(revision)
 
@@ -384,6 +404,16 @@ class ReviewListView(ListView):
                     review_data.setdefault(field.id, {'question': question, 'answers': [''] * responses})
                     review_data[field.id]['answers'][i] = field.block.render(None, {'data': data})
 
+        return review_data
+
+    def get_context_data(self, **kwargs):
+        # The rendered comparison is kept until a review of the submission changes
+        cache_key = self.get_cache_key()
+        review_data = cache.get(cache_key)
+        if review_data is None:
+            review_data = self.get_review_data()
+            cache.set(cache_key, review_data, self.cache_timeout)
+
         return super().get_context_data(
             submission=self.submission,
             review_data=review_data,
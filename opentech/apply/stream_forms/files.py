@@ -1,3 +1,5 @@
+import hashlib
+import mimetypes
 import os
 
 from django.core.files.base import File
@@ -11,6 +13,7 @@ class StreamFieldDataEncoder(DjangoJSONEncoder):
             return {
                 'name': o.name,
                 'filename': o.filename,
+                **o.metadata,
             }
         return super().default(o)
 
@@ -21,7 +24,8 @@ class StreamFieldFile(File):
 
     see django.db.models.fields.files for the inspiration
     """
-    def __init__(self, instance, field, *args, filename=None, storage=default_storage, **kwargs):
+    def __init__(self, instance, field, *args, filename=None, storage=default_storage,
+                 size=None, content_type=None, checksum=None, **kwargs):
         super().__init__(*args, **kwargs)
         # Field is the wagtail field that the file was uploaded to
         self.field = field
@@ -30,6 +34,11 @@ class StreamFieldFile(File):
         self.storage = storage
         self.filename = filename or self.basename
         self._committed = False
+        # Stored in the form data when the file is saved, so the storage
+        # isn't asked again
+        self._size = size
+        self._content_type = content_type
+        self.checksum = checksum
 
     def __str__(self):
         return self.filename
@@ -75,9 +84,42 @@ class StreamFieldFile(File):
 
     @property
     def size(self):
-        if not self._committed:
-            return self.file.size
-        return self.storage.size(self.name)
+        if self._size is None:
+            if not self._committed:
+                self._size = self.file.size
+            else:
+                self._size = self.storage.size(self.name)
+        return self._size
+
+    @property
+    def content_type(self):
+        if self._content_type is None:
+            # Uploaded files have the type sent by the browser
+            content_type = getattr(getattr(self, '_file', None), 'content_type', None)
+            self._content_type = content_type or mimetypes.guess_type(self.filename)[0] or 'application/octet-stream'
+        return self._content_type
+
+    @property
+    def metadata(self):
+        # Only the values already known, never looked up in the storage
+        metadata = {
+            'size': self._size,
+            'content_type': self._content_type,
+            'checksum': self.checksum,
+        }
+        return {key: value for key, value in metadata.items() if value is not None}
+
+    def load_metadata(self):
+        # Read the whole file once for the checksum, which also gives the size
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in self.file.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        self.file.seek(0)
+        self._size = size
+        self._content_type = self.content_type
+        self.checksum = digest.hexdigest()
 
     def serialize(self):
         return {
@@ -99,6 +141,8 @@ class StreamFieldFile(File):
         name = self.generate_filename()
         name = self.storage.generate_filename(name)
         if not self._committed:
+            if self.checksum is None:
+                self.load_metadata()
             self.name = self.storage.save(name, self.file)
         self._committed = True
 
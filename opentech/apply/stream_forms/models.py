@@ -1,12 +1,180 @@
 # Credit to https://github.com/BertrandBordage for initial implementation
+import json
 from collections import OrderedDict
 
+from django.utils.functional import cached_property
 from wagtail.contrib.forms.models import AbstractForm
 
+from opentech.apply.utils.blocks import SingleIncludeMixin
+
 from .blocks import FormFieldBlock, GroupToggleBlock, GroupToggleEndBlock
 from .forms import BlockFieldWrapper, PageStreamBaseForm
 
 
+class FormDefinition:
+    """
+    Lookups for a form_fields definition, shared between all the instances
+    which use an identical definition.
+    """
+    def __init__(self, form_fields):
+        self.form_fields = form_fields
+        # PERFORMANCE NOTE:
+        # Do not attempt to iterate over form_fields - that will fully instantiate the form_fields
+        # including any sub queries that they do
+        self.blocks = OrderedDict()
+        for i, field_data in enumerate(form_fields.stream_data):
+            field_id = field_data.get('id')
+            if field_id:
+                self.blocks[field_id] = (i, form_fields.stream_block.child_blocks[field_data['type']])
+
+    @cached_property
+    def decoders(self):
+        return {
+            field_id: block.decode
+            for field_id, (i, block) in self.blocks.items()
+            if getattr(type(block), 'decode', FormFieldBlock.decode) is not FormFieldBlock.decode
+        }
+
+    @cached_property
+    def raw_fields(self):
+        return {
+            field.id: field
+            for field in self.form_fields
+        }
+
+    @cached_property
+    def named_blocks(self):
+        return {
+            field.block.name: field.id
+            for field in self.form_fields
+            if isinstance(field.block, SingleIncludeMixin)
+        }
+
+
+class FormDefinitionCache:
+    max_size = 256
+
+    def __init__(self):
+        self.definitions = OrderedDict()
+
+    def get(self, form_fields):
+        if not form_fields.is_lazy:
+            # Unsaved definitions can't be identified by their content
+            return FormDefinition(form_fields)
+
+        key = (id(form_fields.stream_block), json.dumps(form_fields.stream_data, sort_keys=True))
+        try:
+            definition = self.definitions[key]
+        except KeyError:
+            definition = self.definitions[key] = FormDefinition(form_fields)
+            if len(self.definitions) > self.max_size:
+                self.definitions.popitem(last=False)
+        return definition
+
+
+form_definitions = FormDefinitionCache()
+
+
+class LazyFormData(dict):
+    """
+    form_data which is only decoded as each field is accessed, the stored
+    value is replaced by the decoded value the first time it is read.
+    """
+    __slots__ = ('decoders',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoders = {}
+
+    def add_decoder(self, key, decoder):
+        previous = self.decoders.get(key)
+        if previous:
+            self.decoders[key] = lambda value: decoder(previous(value))
+        else:
+            self.decoders[key] = decoder
+
+    def decode(self, key):
+        decoder = self.decoders.pop(key, None)
+        if decoder and dict.__contains__(self, key):
+            dict.__setitem__(self, key, decoder(dict.__getitem__(self, key)))
+
+    def decode_all(self):
+        for key in list(self.decoders):
+            self.decode(key)
+
+    def __getitem__(self, key):
+        self.decode(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self.decoders.pop(key, None)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.decoders.pop(key, None)
+        super().__delitem__(key)
+
+    def __iter__(self):
+        # Defining __iter__ stops dict() and ** from copying the stored values directly
+        return super().__iter__()
+
+    def __eq__(self, other):
+        self.decode_all()
+        if isinstance(other, LazyFormData):
+            other.decode_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.decode_all()
+        return super().__repr__()
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def get(self, key, default=None):
+        self.decode(key)
+        return super().get(key, default)
+
+    def pop(self, key, *args):
+        self.decode(key)
+        return super().pop(key, *args)
+
+    def setdefault(self, key, default=None):
+        self.decode(key)
+        return super().setdefault(key, default)
+
+    def popitem(self):
+        self.decode_all()
+        return super().popitem()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def items(self):
+        self.decode_all()
+        return super().items()
+
+    def values(self):
+        self.decode_all()
+        return super().values()
+
+    def copy(self):
+        # Copy the stored values without decoding them
+        data = LazyFormData(super().items())
+        data.decoders = self.decoders.copy()
+        return data
+
+
+def lazy_form_data(form_data):
+    if isinstance(form_data, LazyFormData):
+        return form_data.copy()
+    return LazyFormData(form_data)
+
+
 class BaseStreamForm:
     submission_form_class = PageStreamBaseForm
 
@@ -19,21 +187,22 @@ class BaseStreamForm:
 
     @classmethod
     def deserialize_form_data(cls, instance, form_data, form_fields):
-        data = form_data.copy()
-        # PERFORMANCE NOTE:
-        # Do not attempt to iterate over form_fields - that will fully instantiate the form_fields
-        # including any sub queries that they do
-        for i, field_data in enumerate(form_fields.stream_data):
-            block = form_fields.stream_block.child_blocks[field_data['type']]
-            field_id = field_data.get('id')
-            try:
-                value = data[field_id]
-            except KeyError:
-                pass
-            else:
-                data[field_id] = block.decode(value)
+        # Values are only decoded when they are accessed
+        data = lazy_form_data(form_data)
+        for field_id, decoder in form_definitions.get(form_fields).decoders.items():
+            if field_id in data:
+                data.add_decoder(field_id, decoder)
         return data
 
+    @property
+    def form_definition(self):
+        # The definition is looked up again if form_fields has been replaced
+        form_fields = self.form_fields
+        cached = getattr(self, '_form_definition', None)
+        if cached is None or cached[0] is not form_fields:
+            cached = self._form_definition = (form_fields, form_definitions.get(form_fields))
+        return cached[1]
+
     def get_defined_fields(self):
         return self.form_fields
 
@@ -1,3 +1,5 @@
+from django.utils.functional import SimpleLazyObject
+
 from social_core.exceptions import AuthForbidden
 from social_django.middleware import SocialAuthExceptionMiddleware as _SocialAuthExceptionMiddleware
 
@@ -11,3 +13,24 @@ class SocialAuthExceptionMiddleware(_SocialAuthExceptionMiddleware):
             return 'Your credentials are not recognised.'
 
         super().get_message(request, exception)
+
+
+def load_roles(user):
+    if user.is_authenticated:
+        user.roles
+    return user
+
+
+class UserRolesMiddleware:
+    """
+    Load all the roles of the logged in user, in a single query, when the
+    user is first used in the request. Every role check made against
+    request.user then shares them.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = request.user
+        request.user = SimpleLazyObject(lambda: load_roles(user))
+        return self.get_response(request)
@@ -1,7 +1,10 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.db import models
 from django.db.models import Q
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
@@ -10,6 +13,16 @@ from .groups import (APPLICANT_GROUP_NAME, APPROVER_GROUP_NAME,
                      REVIEWER_GROUP_NAME, STAFF_GROUP_NAME)
 from .utils import send_activation_email
 
+ROLE_PROPERTIES = [
+    'roles',
+    'is_apply_staff',
+    'is_reviewer',
+    'is_partner',
+    'is_community_reviewer',
+    'is_applicant',
+    'is_approver',
+]
+
 
 class UserQuerySet(models.QuerySet):
     def staff(self):
@@ -32,6 +45,9 @@ class UserQuerySet(models.QuerySet):
     def approvers(self):
         return self.filter(groups__name=APPROVER_GROUP_NAME)
 
+    def with_roles(self):
+        return self.annotate(role_names=ArrayAgg('groups__name'))
+
 
 class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     use_in_migrations = True
@@ -112,34 +128,49 @@ class User(AbstractUser):
 
     @cached_property
     def roles(self):
+        # All the role checks share these, loaded once in a single query
+        if hasattr(self, 'role_names'):
+            # Annotated by UserQuerySet.with_roles
+            return [name for name in self.role_names if name]
         return list(self.groups.values_list('name', flat=True))
 
+    def clear_roles(self):
+        for role in ROLE_PROPERTIES:
+            self.__dict__.pop(role, None)
+        self.__dict__.pop('role_names', None)
+
     @cached_property
     def is_apply_staff(self):
-        return self.groups.filter(name=STAFF_GROUP_NAME).exists() or self.is_superuser
+        return STAFF_GROUP_NAME in self.roles or self.is_superuser
 
     @cached_property
     def is_reviewer(self):
-        return self.groups.filter(name=REVIEWER_GROUP_NAME).exists()
+        return REVIEWER_GROUP_NAME in self.roles
 
     @cached_property
     def is_partner(self):
-        return self.groups.filter(name=PARTNER_GROUP_NAME).exists()
+        return PARTNER_GROUP_NAME in self.roles
 
     @cached_property
     def is_community_reviewer(self):
-        return self.groups.filter(name=COMMUNITY_REVIEWER_GROUP_NAME).exists()
+        return COMMUNITY_REVIEWER_GROUP_NAME in self.roles
 
     @cached_property
     def is_applicant(self):
-        return self.groups.filter(name=APPLICANT_GROUP_NAME).exists()
+        return APPLICANT_GROUP_NAME in self.roles
 
     @cached_property
     def is_approver(self):
-        return self.groups.filter(name=APPROVER_GROUP_NAME).exists()
+        return APPROVER_GROUP_NAME in self.roles
 
     class Meta:
         ordering = ('full_name', 'email')
 
     def __repr__(self):
         return f'<{self.__class__.__name__}: {self.full_name} ({self.email})>'
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def clear_roles(sender, instance, action, reverse, **kwargs):
+    if not reverse and action in ['post_add', 'post_remove', 'post_clear']:
+        instance.clear_roles()
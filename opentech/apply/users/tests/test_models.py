@@ -0,0 +1,53 @@
+from django.test import RequestFactory, TestCase
+
+from ..groups import APPROVER_GROUP_NAME
+from ..middleware import UserRolesMiddleware
+from ..models import User
+from .factories import ApplicantFactory, GroupFactory, StaffFactory, UserFactory
+
+
+class TestUserRoles(TestCase):
+    def test_roles_loaded_once(self):
+        user = User.objects.get(id=StaffFactory().id)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.is_apply_staff)
+            self.assertFalse(user.is_reviewer)
+            self.assertFalse(user.is_partner)
+            self.assertFalse(user.is_community_reviewer)
+            self.assertFalse(user.is_applicant)
+            self.assertFalse(user.is_approver)
+
+    def test_superuser_is_staff(self):
+        user = UserFactory(is_superuser=True)
+        self.assertTrue(user.is_apply_staff)
+
+    def test_with_roles(self):
+        StaffFactory()
+        ApplicantFactory()
+        User.objects.create(email='no-roles@email.com')
+        users = list(User.objects.with_roles().order_by('id'))
+        with self.assertNumQueries(0):
+            self.assertEqual([user.is_apply_staff for user in users], [True, False, False])
+            self.assertEqual([user.is_applicant for user in users], [False, True, False])
+            self.assertEqual(users[2].roles, [])
+
+    def test_roles_cleared_when_groups_change(self):
+        user = StaffFactory()
+        self.assertFalse(user.is_approver)
+        user.groups.add(GroupFactory(name=APPROVER_GROUP_NAME))
+        self.assertTrue(user.is_approver)
+
+
+class TestUserRolesMiddleware(TestCase):
+    def test_roles_loaded_with_user(self):
+        user = User.objects.get(id=StaffFactory().id)
+        request = RequestFactory().get('/')
+        request.user = user
+
+        UserRolesMiddleware(lambda request: None)(request)
+
+        with self.assertNumQueries(1):
+            request.user.email
+        with self.assertNumQueries(0):
+            self.assertTrue(request.user.is_apply_staff)
+            self.assertFalse(request.user.is_approver)
@@ -0,0 +1,86 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from opentech.apply.funds.tests.factories import ApplicationSubmissionFactory
+from opentech.apply.users.tests.factories import ApplicantFactory, ReviewerFactory, StaffFactory
+from opentech.apply.utils.testing.tests import BaseViewTestCase
+
+
+class PageQueriesTestCase(BaseViewTestCase):
+    """
+    The queries of the main pages must not grow with the number of
+    submissions, to catch changes which add queries for each row. The roles
+    of the user must only be loaded once.
+    """
+    url_name = '{}'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        ApplicationSubmissionFactory(user=cls.user)
+
+    def create_submissions(self, number):
+        return ApplicationSubmissionFactory.create_batch(
+            number,
+            status='external_review',
+            workflow_stages=2,
+            reviewers=[self.user],
+        )
+
+    def count_queries(self, url):
+        # Counts must not depend on what earlier requests have cached
+        ContentType.objects.clear_cache()
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+
+        role_queries = [
+            query for query in queries.captured_queries
+            if 'FROM "auth_group" INNER JOIN "users_user_groups"' in query['sql']
+        ]
+        self.assertEqual(len(role_queries), 1)
+        return len(queries)
+
+    def assertPageQueriesFixed(self, view_name, detail=False):
+        counts = []
+        for number in [2, 4]:
+            submissions = self.create_submissions(number)
+            kwargs = {'pk': submissions[0].pk} if detail else {}
+            counts.append(self.count_queries(self.url_from_pattern(view_name, kwargs)))
+        self.assertEqual(counts[0], counts[1])
+
+
+class TestStaffPageQueries(PageQueriesTestCase):
+    user_factory = StaffFactory
+
+    def test_dashboard(self):
+        self.assertPageQueriesFixed('dashboard:dashboard')
+
+    def test_submissions_list(self):
+        self.assertPageQueriesFixed('funds:submissions:list')
+
+    def test_submission_detail(self):
+        self.assertPageQueriesFixed('funds:submissions:detail', detail=True)
+
+    def test_rounds(self):
+        self.assertPageQueriesFixed('funds:rounds:list')
+
+
+class TestReviewerPageQueries(PageQueriesTestCase):
+    user_factory = ReviewerFactory
+
+    def test_dashboard(self):
+        self.assertPageQueriesFixed('dashboard:dashboard')
+
+    def test_submission_detail(self):
+        self.assertPageQueriesFixed('funds:submissions:detail', detail=True)
+
+
+class TestApplicantPageQueries(PageQueriesTestCase):
+    user_factory = ApplicantFactory
+
+    def test_dashboard(self):
+        self.assertPageQueriesFixed('dashboard:dashboard')
@@ -0,0 +1,51 @@
+import uuid
+from functools import partial
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+def new_versions(keys):
+    # A new random version orphans every entry cached under the old one, a
+    # version lost from the cache can never bring back stale entries
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+
+def get_versions(keys):
+    """The current version for each key, starting a version for any which are missing"""
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+    return {**versions, **missing}
+
+
+def invalidate_on_commit(keys, invalidate=new_versions):
+    # Wait for the change to be committed, else the old values could be
+    # cached again before it is visible
+    transaction.on_commit(partial(invalidate, list(keys)))
+
+
+def invalidate_on_change(models, keys, invalidate=new_versions):
+    """
+    Invalidate the cache keys when one of the models is saved or deleted.
+
+    keys is either the list of keys or a function of the instance changed
+    which returns them. The keys are given new versions unless another
+    invalidate function is given, such as cache.delete_many.
+    """
+    def invalidate_keys(sender, instance, **kwargs):
+        changed = keys(instance) if callable(keys) else keys
+        if changed:
+            invalidate_on_commit(changed, invalidate)
+
+    # The signals are sent by the model saved, so the subclasses are
+    # connected too. Only called once the models are loaded.
+    models = tuple(models)
+    for model in apps.get_models():
+        if issubclass(model, models):
+            post_save.connect(invalidate_keys, sender=model, weak=False)
+            post_delete.connect(invalidate_keys, sender=model, weak=False)
+    return invalidate_keys
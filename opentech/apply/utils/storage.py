@@ -1,12 +1,63 @@
+import mimetypes
+import os
+import re
+
 from django.conf import settings
 from django.core.files.storage import get_storage_class
-from django.http import FileResponse
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import filepath_to_uri
+from django.utils.http import http_date, quote_etag
 from django.views.generic import View
 
 
 private_file_storage = getattr(settings, 'PRIVATE_FILE_STORAGE', None)
 PrivateStorage = get_storage_class(private_file_storage)
 
+# Headers which hand the file over to the web server in front of Django
+SENDFILE_HEADERS = {
+    'x-accel-redirect': 'X-Accel-Redirect',
+    'x-sendfile': 'X-Sendfile',
+}
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Return the (start, end) bytes of a single range request, None when the
+    whole file should be sent and False when the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        # Multiple ranges aren't supported, send everything
+        return None
+
+    start, end = match.groups()
+    if not start:
+        # The last bytes of the file
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def read_range(filelike, start, end, block_size=FileResponse.block_size):
+    try:
+        filelike.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = filelike.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        filelike.close()
+
 
 class PrivateMediaView(View):
     storage = PrivateStorage()
@@ -15,6 +66,85 @@ class PrivateMediaView(View):
         # Convert the URL request to a path which the storage can use to find the file
         raise NotImplementedError()
 
+    def get_storage_name(self, media):
+        # Field files know their storage, a file opened on the local file
+        # system is named with its full path
+        storage = getattr(media, 'storage', self.storage)
+        name = media.name
+        if os.path.isabs(name):
+            name = os.path.relpath(name, storage.location)
+        return storage, name
+
     def get(self, *args, **kwargs):
         file_to_serve = self.get_media(*args, **kwargs)
-        return FileResponse(file_to_serve)
+        storage, name = self.get_storage_name(file_to_serve)
+
+        delivery = settings.PRIVATE_MEDIA_DELIVERY
+        if delivery == 'redirect':
+            file_to_serve.close()
+            return self.redirect_response(storage, name)
+        if delivery in SENDFILE_HEADERS:
+            file_to_serve.close()
+            return self.sendfile_response(storage, name, SENDFILE_HEADERS[delivery])
+        return self.proxy_response(file_to_serve, storage, name)
+
+    def redirect_response(self, storage, name):
+        # A short lived signed url, only the user who passed the checks has it
+        url = storage.url(name, expire=settings.PRIVATE_MEDIA_URL_EXPIRY)
+        response = HttpResponseRedirect(url)
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
+    def sendfile_response(self, storage, name, header):
+        content_type, _ = mimetypes.guess_type(name)
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        if header == 'X-Accel-Redirect':
+            # An internal location of the web server serving the private media
+            response[header] = settings.PRIVATE_MEDIA_ACCEL_PREFIX + filepath_to_uri(name)
+        else:
+            response[header] = storage.path(name)
+        return response
+
+    def proxy_response(self, media, storage, name):
+        size = media.size
+        last_modified = int(storage.get_modified_time(name).timestamp())
+        etag = quote_etag(f'{size:x}-{last_modified:x}')
+
+        response = get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            media.close()
+            return response
+
+        byte_range = None
+        if 'HTTP_RANGE' in self.request.META and self.if_range_matches(etag, last_modified):
+            byte_range = parse_range(self.request.META['HTTP_RANGE'], size)
+
+        if byte_range is False:
+            media.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            content_type, _ = mimetypes.guess_type(name)
+            response = StreamingHttpResponse(
+                read_range(media, start, end),
+                status=206,
+                content_type=content_type or 'application/octet-stream',
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            response = FileResponse(media)
+            response['Content-Length'] = size
+
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def if_range_matches(self, etag, last_modified):
+        # A range of a file which has since changed would be corrupt
+        if_range = self.request.META.get('HTTP_IF_RANGE')
+        return not if_range or if_range in (etag, http_date(last_modified))
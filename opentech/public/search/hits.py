@@ -0,0 +1,91 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from wagtail.search.models import Query, QueryDailyHits
+
+# Every hit takes the next slot, the slots up to the flushed one have been
+# written to the database. The latest slot seen by a flush tells the next one
+# which missing slots were lost rather than still being written.
+SLOTS_KEY = 'search_hits_slots'
+FLUSHED_KEY = 'search_hits_flushed'
+SEEN_KEY = 'search_hits_seen'
+SLOT_TIMEOUT = 60 * 60 * 24
+
+FLUSH_LOCK_KEY = 'search_hits_flush_lock'
+FLUSH_LOCK_TIMEOUT = 5 * 60
+
+# Flush once this many hits are waiting, besides the periodic flush
+FLUSH_SIZE = 500
+
+
+def slot_key(slot):
+    return f'search_hits_slot_{slot}'
+
+
+def record_hit(query_string):
+    if not settings.SEARCH_HITS_BUFFERED:
+        Query.get(query_string).add_hit()
+        return
+
+    cache.add(SLOTS_KEY, 0, None)
+    slot = cache.incr(SLOTS_KEY)
+    cache.set(slot_key(slot), (query_string, timezone.now().date()), SLOT_TIMEOUT)
+
+    if slot % FLUSH_SIZE == 0:
+        from .tasks import flush_search_hits
+        flush_search_hits.delay()
+
+
+def flush_hits():
+    """
+    Write the buffered hits to the daily hits of each query, returns the
+    number of hits written.
+    """
+    # Another flush is already writing the same slots
+    if not cache.add(FLUSH_LOCK_KEY, True, FLUSH_LOCK_TIMEOUT):
+        return 0
+    try:
+        return write_hits()
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def write_hits():
+    flushed = cache.get(FLUSHED_KEY, 0)
+    seen = cache.get(SEEN_KEY, 0)
+    latest = cache.get(SLOTS_KEY, 0)
+    if latest <= flushed:
+        return 0
+
+    slots = cache.get_many([slot_key(slot) for slot in range(flushed + 1, latest + 1)])
+    read = []
+    for slot in range(flushed + 1, latest + 1):
+        key = slot_key(slot)
+        if key in slots:
+            read.append(key)
+        elif slot > seen:
+            # Taken after the last flush and not written yet, left for the
+            # next one. Slots still missing since the last flush were lost
+            # from the cache and are dropped, the hits are only a statistic.
+            break
+        flushed = slot
+
+    hits = Counter(slots[key] for key in read)
+
+    with transaction.atomic():
+        queries = {
+            query_string: Query.get(query_string)
+            for query_string in {query_string for query_string, _ in hits}
+        }
+        for (query_string, date), count in hits.items():
+            daily_hits, _ = QueryDailyHits.objects.get_or_create(query=queries[query_string], date=date)
+            daily_hits.hits = F('hits') + count
+            daily_hits.save(update_fields=['hits'])
+
+    cache.set_many({FLUSHED_KEY: flushed, SEEN_KEY: latest}, None)
+    cache.delete_many(read)
+    return sum(hits.values())
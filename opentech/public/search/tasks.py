@@ -0,0 +1,7 @@
+from opentech.apply.activity.tasks import app
+
+
+@app.task
+def flush_search_hits():
+    from .hits import flush_hits
+    flush_hits()
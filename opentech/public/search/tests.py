@@ -0,0 +1,125 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.core.models import Page
+from wagtail.search.models import Query, QueryDailyHits
+
+from opentech.public.home.models import HomePage
+
+from .hits import FLUSH_LOCK_KEY, SLOTS_KEY, flush_hits, record_hit, slot_key
+from .views import search_result_ids
+
+
+def hits(query_string):
+    return Query.get(query_string).hits
+
+
+@override_settings(SEARCH_HITS_BUFFERED=True)
+class TestBufferedHits(TestCase):
+    def test_hits_not_written_until_flushed(self):
+        record_hit('grants')
+        self.assertFalse(QueryDailyHits.objects.exists())
+
+    def test_flush_counts_hits_by_query(self):
+        for query_string in ['grants', 'labs', 'grants']:
+            record_hit(query_string)
+        self.assertEqual(flush_hits(), 3)
+        self.assertEqual(hits('grants'), 2)
+        self.assertEqual(hits('labs'), 1)
+
+    def test_flush_adds_to_existing_hits(self):
+        Query.get('grants').add_hit()
+        record_hit('grants')
+        flush_hits()
+        self.assertEqual(hits('grants'), 2)
+
+    def test_hits_only_flushed_once(self):
+        record_hit('grants')
+        flush_hits()
+        self.assertEqual(flush_hits(), 0)
+        record_hit('grants')
+        self.assertEqual(flush_hits(), 1)
+        self.assertEqual(hits('grants'), 2)
+
+    def test_queries_fixed_for_many_hits(self):
+        # The first flush creates the query and its daily hits
+        record_hit('grants')
+        flush_hits()
+
+        def count_queries(number):
+            for _ in range(number):
+                record_hit('grants')
+            with CaptureQueriesContext(connection) as queries:
+                flush_hits()
+            return len(queries)
+
+        self.assertEqual(count_queries(5), count_queries(50))
+
+    def take_slot(self):
+        # A hit that has taken its slot but not written it yet
+        cache.add(SLOTS_KEY, 0, None)
+        return cache.incr(SLOTS_KEY)
+
+    def test_unwritten_slot_left_for_next_flush(self):
+        record_hit('grants')
+        slot = self.take_slot()
+        record_hit('grants')
+        self.assertEqual(flush_hits(), 1)
+        cache.set(slot_key(slot), ('grants', timezone.now().date()))
+        self.assertEqual(flush_hits(), 2)
+        self.assertEqual(hits('grants'), 3)
+
+    def test_lost_slot_dropped_by_next_flush(self):
+        self.take_slot()
+        record_hit('grants')
+        self.assertEqual(flush_hits(), 0)
+        self.assertEqual(flush_hits(), 1)
+        self.assertEqual(flush_hits(), 0)
+
+    def test_flush_skipped_while_another_runs(self):
+        record_hit('grants')
+        cache.add(FLUSH_LOCK_KEY, True)
+        self.assertEqual(flush_hits(), 0)
+        cache.delete(FLUSH_LOCK_KEY)
+        self.assertEqual(flush_hits(), 1)
+
+    @patch('opentech.public.search.hits.FLUSH_SIZE', 2)
+    def test_flushed_when_buffer_full(self):
+        record_hit('grants')
+        record_hit('grants')
+        self.assertEqual(hits('grants'), 2)
+
+    @override_settings(SEARCH_HITS_BUFFERED=False)
+    def test_hit_written_when_not_buffered(self):
+        record_hit('grants')
+        self.assertEqual(hits('grants'), 1)
+
+
+class TestSearchView(TestCase):
+    def setUp(self):
+        self.home = HomePage.objects.first()
+
+    def search(self, query):
+        return self.client.get('/search/', {'query': query}, secure=True)
+
+    def test_results_cached_for_query(self):
+        site = self.home.get_site()
+        self.assertEqual(search_result_ids(site, 'qwzxgrant'), [])
+        with patch.object(Page.objects, 'live') as live:
+            self.assertEqual(search_result_ids(site, 'QWZXgrant '), [])
+        live.assert_not_called()
+
+    @patch('opentech.public.search.views.search_result_ids')
+    def test_cached_results_shown(self, result_ids):
+        result_ids.return_value = [self.home.id]
+        response = self.search('qwzxgrant')
+        self.assertEqual(list(response.context['search_results']), [self.home])
+        self.assertEqual(hits('qwzxgrant'), 1)
+
+    def test_no_query(self):
+        response = self.search('')
+        self.assertEqual(list(response.context['search_results']), [])
@@ -1,14 +1,35 @@
+import hashlib
 import re
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.http import Http404
 from django.shortcuts import render
 from wagtail.core.models import Page
-from wagtail.search.models import Query
+from wagtail.search.utils import normalise_query_string
 
 from opentech.public.home.models import HomePage
 
+from .hits import record_hit
+
+RESULTS_CACHE_TIMEOUT = 60 * 5
+
+
+def search_result_ids(site, search_query):
+    # The same query is often repeated, keep the ranked ids for a short while
+    query_hash = hashlib.md5(normalise_query_string(search_query).encode()).hexdigest()
+    cache_key = f'search_results_{site.id}_{query_hash}'
+    ids = cache.get(cache_key)
+    if ids is None:
+        results = Page.objects.live().descendant_of(
+            site.root_page,
+            inclusive=True,
+        ).search(search_query, operator='and')
+        ids = [page.id for page in results]
+        cache.set(cache_key, ids, RESULTS_CACHE_TIMEOUT)
+    return ids
+
 
 def search(request):
     if request.site != HomePage.objects.first().get_site():
@@ -23,18 +44,12 @@ def search(request):
         words = re.findall('\w+', search_query.strip())
         search_query = ' '.join(words)
 
-        public_site = request.site.root_page
-
-        search_results = Page.objects.live().descendant_of(
-            public_site,
-            inclusive=True,
-        ).specific().search(search_query, operator='and')
-        query = Query.get(search_query)
+        search_results = search_result_ids(request.site, search_query)
 
         # Record hit
-        query.add_hit()
+        record_hit(search_query)
     else:
-        search_results = Page.objects.none()
+        search_results = []
 
     # Pagination
     paginator = Paginator(search_results, settings.DEFAULT_PER_PAGE)
@@ -45,6 +60,10 @@ def search(request):
     except EmptyPage:
         search_results = paginator.page(paginator.num_pages)
 
+    # Only load the pages shown, in the order they were ranked
+    pages = Page.objects.specific().in_bulk(search_results.object_list)
+    search_results.object_list = [pages[id] for id in search_results.object_list if id in pages]
+
     return render(request, 'search/search.html', {
         'search_query': search_query,
         'search_results': search_results,
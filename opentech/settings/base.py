@@ -158,6 +158,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_referrer_policy.middleware.ReferrerPolicyMiddleware',
     'django_otp.middleware.OTPMiddleware',
+    'opentech.apply.users.middleware.UserRolesMiddleware',
 
     'opentech.apply.users.middleware.SocialAuthExceptionMiddleware',
 
@@ -506,6 +507,20 @@ if not SEND_MESSAGES:
 SLACK_DESTINATION_URL = env.get('SLACK_DESTINATION_URL', None)
 SLACK_DESTINATION_ROOM = env.get('SLACK_DESTINATION_ROOM', None)
 
+# Send messages to external services from the celery workers rather than
+# during the request, messages wait in the OutboxMessage table. Failed
+# deliveries are retried by the periodic delivery, see CELERY_BEAT_SCHEDULE.
+MESSAGES_OUTBOX_ENABLED = False
+if env.get('MESSAGES_OUTBOX_ENABLED', 'false').lower().strip() == 'true':
+    MESSAGES_OUTBOX_ENABLED = True
+
+
+# Count the public search hits in the cache and write them to the database
+# in batches from the celery workers, see CELERY_BEAT_SCHEDULE.
+SEARCH_HITS_BUFFERED = False
+if env.get('SEARCH_HITS_BUFFERED', 'false').lower().strip() == 'true':
+    SEARCH_HITS_BUFFERED = True
+
 
 # Celery config
 if 'REDIS_URL' in env:
@@ -513,6 +528,20 @@ if 'REDIS_URL' in env:
 else:
     CELERY_TASK_ALWAYS_EAGER = True
 
+# Modules with tasks for the workers, besides the one defining the app
+CELERY_IMPORTS = ['opentech.apply.funds.tasks', 'opentech.public.search.tasks']
+
+CELERY_BEAT_SCHEDULE = {
+    'deliver-outbox': {
+        'task': 'opentech.apply.activity.tasks.deliver_outbox',
+        'schedule': 60,
+    },
+    'flush-search-hits': {
+        'task': 'opentech.public.search.tasks.flush_search_hits',
+        'schedule': 60 * 5,
+    },
+}
+
 
 # S3 configuration
 
@@ -549,6 +578,15 @@ if 'AWS_STORAGE_BUCKET_NAME' in env:
     )
 
 
+# How private media is sent once the user has passed the permission checks:
+# proxy streams the file through Django, redirect sends a short lived signed
+# url of the S3 bucket, x-accel-redirect and x-sendfile hand a local file to
+# the web server (nginx needs an internal location at the accel prefix).
+PRIVATE_MEDIA_DELIVERY = env.get('PRIVATE_MEDIA_DELIVERY', 'proxy').lower().strip()
+PRIVATE_MEDIA_URL_EXPIRY = int(env.get('PRIVATE_MEDIA_URL_EXPIRY', 60))
+PRIVATE_MEDIA_ACCEL_PREFIX = env.get('PRIVATE_MEDIA_ACCEL_PREFIX', '/private-media/')
+
+
 # Settings to connect to the Bucket from which we are migrating data
 AWS_MIGRATION_BUCKET_NAME = env.get('AWS_MIGRATION_BUCKET_NAME', '')
 AWS_MIGRATION_ACCESS_KEY_ID = env.get('AWS_MIGRATION_ACCESS_KEY_ID', '')
@@ -644,3 +682,11 @@ if env.get('PROJECTS_ENABLED', 'false').lower().strip() == 'true':
 PROJECTS_AUTO_CREATE = False
 if env.get('PROJECTS_AUTO_CREATE', 'false').lower().strip() == 'true':
     PROJECTS_AUTO_CREATE = True
+
+
+# Read the submission table values from the denormalised SubmissionStats,
+# the stats are only kept up to date while this is enabled.
+# Run the rebuild_submission_stats management command after enabling.
+SUBMISSION_STATS_ENABLED = False
+if env.get('SUBMISSION_STATS_ENABLED', 'false').lower().strip() == 'true':
+    SUBMISSION_STATS_ENABLED = True